@@ -0,0 +1,188 @@
+"""
+Structure-of-arrays asteroid storage backed by NumPy.
+"""
+import numpy as np
+import config
+from game_objects import asteroid_sprites
+
+
+class AsteroidField:
+    """Stores every asteroid's state in preallocated parallel arrays.
+    
+    Asteroids live in the first `count` slots. Each has a unique integer ID;
+    IDs are handed out in increasing order and compaction keeps slot order,
+    so `ids` stays sorted and an ID can be turned into a slot with a binary
+    search. Moving, off-screen detection and compaction each run as a single
+    vectorized operation over all asteroids.
+    """
+    
+    def __init__(self, capacity=None):
+        """Initialize an empty field.
+        
+        Args:
+            capacity: Initial number of slots (grows as needed)
+        """
+        self.count = 0
+        self.next_id = 0
+        self._allocate(capacity or config.ASTEROID_FIELD_CAPACITY)
+    
+    def _allocate(self, capacity):
+        """(Re)allocate the arrays, keeping the live asteroids.
+        
+        Args:
+            capacity: Number of slots
+        """
+        n = self.count
+        old = getattr(self, 'ids', None)
+        
+        arrays = {
+            'ids': np.zeros(capacity, dtype=np.int64),
+            'x': np.zeros(capacity, dtype=np.float64),
+            'y': np.zeros(capacity, dtype=np.float64),
+            'radius': np.zeros(capacity, dtype=np.float64),
+            'speed': np.zeros(capacity, dtype=np.float64),
+            'angle': np.zeros(capacity, dtype=np.float64),
+            'spin': np.zeros(capacity, dtype=np.float64),
+            'alive': np.zeros(capacity, dtype=bool),
+        }
+        for name, array in arrays.items():
+            if old is not None:
+                array[:n] = getattr(self, name)[:n]
+            setattr(self, name, array)
+        self.capacity = capacity
+    
+    def __len__(self):
+        return self.count
+    
+    def spawn(self, x, y, radius, speed, spin=0.0):
+        """Add an asteroid.
+        
+        Args:
+            x: X position
+            y: Y position
+            radius: Asteroid radius
+            speed: Falling speed (pixels per frame)
+            spin: Rotation speed (degrees per simulation step)
+        
+        Returns:
+            ID of the new asteroid
+        """
+        if self.count == self.capacity:
+            self._allocate(self.capacity * 2)
+        
+        i = self.count
+        asteroid_id = self.next_id
+        self.ids[i] = asteroid_id
+        self.x[i] = x
+        self.y[i] = y
+        self.radius[i] = radius
+        self.speed[i] = speed
+        self.angle[i] = 0.0
+        self.spin[i] = spin
+        self.alive[i] = True
+        
+        self.count += 1
+        self.next_id += 1
+        return asteroid_id
+    
+    def slots(self, asteroid_ids):
+        """Find the array slots of the given asteroids.
+        
+        Args:
+            asteroid_ids: Sorted or unsorted array of IDs currently in the field
+        
+        Returns:
+            Array of slot indices
+        """
+        return np.searchsorted(self.ids[:self.count], asteroid_ids)
+    
+    def update(self, screen_height):
+        """Move all asteroids down and drop the ones that left the screen.
+        
+        Args:
+            screen_height: Height of the screen
+        
+        Returns:
+            Tuple (removed_ids, missed) where removed_ids is an array of IDs
+            that fell off screen and missed is how many of them were alive
+        """
+        n = self.count
+        y = self.y[:n]
+        y += self.speed[:n]
+        angle = self.angle[:n]
+        angle += self.spin[:n]  # Wrapped into a rotation bucket when drawn
+        
+        off_screen = y - self.radius[:n] > screen_height
+        if not off_screen.any():
+            return self.ids[:0].copy(), 0
+        
+        removed_ids = self.ids[:n][off_screen]
+        missed = int(np.count_nonzero(off_screen & self.alive[:n]))
+        self._compact(~off_screen)
+        return removed_ids, missed
+    
+    def kill(self, asteroid_ids):
+        """Mark asteroids as destroyed and drop them from the field.
+        
+        Args:
+            asteroid_ids: Array of IDs currently in the field
+        """
+        if len(asteroid_ids) == 0:
+            return
+        
+        n = self.count
+        keep = np.ones(n, dtype=bool)
+        keep[self.slots(asteroid_ids)] = False
+        self.alive[:n][~keep] = False
+        self._compact(keep)
+    
+    def _compact(self, keep):
+        """Keep only the flagged asteroids, preserving their order.
+        
+        Args:
+            keep: Boolean mask over the live slots
+        """
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        for array in (self.ids, self.x, self.y, self.radius, self.speed,
+                      self.angle, self.spin, self.alive):
+            array[:kept] = array[:n][keep]
+        self.count = kept
+    
+    def clear(self):
+        """Remove all asteroids and restart IDs."""
+        self.count = 0
+        self.next_id = 0
+    
+    def draw(self, surface, alpha=1.0):
+        """Draw all asteroids.
+        
+        Args:
+            surface: Pygame surface to draw on
+            alpha: Interpolation between the previous (0) and current (1)
+                   simulation step
+        
+        Returns:
+            List of rects that were drawn
+        """
+        n = self.count
+        if n == 0:
+            return []
+        
+        # Motion is constant per step, so the previous state is one step back
+        back = 1.0 - alpha
+        angle = self.angle[:n] - self.spin[:n] * back
+        y = self.y[:n] - self.speed[:n] * back
+        
+        radii = self.radius[:n].astype(np.int64).tolist()
+        buckets = np.floor(angle * (asteroid_sprites.rotation_buckets / 360.0)).astype(np.int64)
+        buckets %= asteroid_sprites.rotation_buckets
+        xs = self.x[:n].astype(np.int64).tolist()
+        ys = y.astype(np.int64).tolist()
+        
+        # Rotated sprites are larger than the asteroid, so center each one
+        blit_list = []
+        for r, bucket, x, y in zip(radii, buckets.tolist(), xs, ys):
+            sprite = asteroid_sprites.get(r, bucket)
+            blit_list.append((sprite, (x - sprite.get_width() // 2, y - sprite.get_height() // 2)))
+        return surface.blits(blit_list)
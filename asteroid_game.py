@@ -2,24 +2,59 @@
 Interactive Asteroid Destroyer Game
 Main game loop and integration of all components.
 """
+import argparse
+import random
 import pygame
 import cv2
 import sys
 import os
+import time
 import config
-from object_tracker import ObjectTracker  # Swapped from hand_tracker
+from calibration import detect_corner_markers, get_marker_positions
+from camera_capture import CameraCapture
+from inference_worker import InferenceWorker
+from motion_filter import KalmanFilter2D
+from multi_tracker import MultiObjectTracker
 from coordinate_mapper import CoordinateMapper
 from game_manager import GameManager
-from game_objects import FingerCursor
+from game_objects import FingerCursor, asteroid_sprites
 from ui_renderer import UIRenderer
 from utils import FPSCounter
+from profiler import profiler
+from detectors import create_detector
+from recording import Recorder, ReplaySource
+from detection_index import DetectionLog, ReplayTracker, detection_settings, has_detection_index
 
 
 class AsteroidGame:
     """Main game class integrating all components."""
     
-    def __init__(self):
-        """Initialize the game."""
+    def __init__(self, frame_source=None, clock=None, seed=None, recorder=None, frame_limit=None,
+                 detector=None):
+        """Initialize the game.
+        
+        Args:
+            frame_source: Object with read()/release()/isOpened() to use
+                          instead of the webcam (e.g. a video file). A
+                          ReplaySource also supplies the recorded key presses
+                          and calibration.
+            clock: Function returning the current time in seconds (default
+                   time.perf_counter). A recording passes Recorder.clock and
+                   a replay ReplaySource.now.
+            seed: Seed for the game's random generators (None = unseeded)
+            recorder: Optional Recorder that captured frames and key presses
+                      are saved to
+            frame_limit: Frame rate cap (default config.FPS_TARGET, 0 = uncapped)
+            detector: Detector backend to use (default: created from
+                      config.DETECTOR), e.g. a ReplayTracker serving
+                      precomputed detections
+        """
+        self.now = clock or time.perf_counter
+        self.frame_source = frame_source
+        self.recorder = recorder
+        self.replay = frame_source if isinstance(frame_source, ReplaySource) else None
+        self.frame_limit = config.FPS_TARGET if frame_limit is None else frame_limit
+        
         # Initialize Pygame
         pygame.init()
         
@@ -42,27 +77,106 @@ class AsteroidGame:
         self.background_image = pygame.transform.scale(self.background_image, (self.screen_width, self.screen_height))
         
         # Initialize components
-        self.object_tracker = ObjectTracker()
         self.coord_mapper = CoordinateMapper(self.screen_width, self.screen_height)
-        self.game_manager = GameManager(self.screen_width, self.screen_height)
-        self.finger_cursor = FingerCursor()
+        if self.recorder is not None and self.coord_mapper.calibrated:
+            self.recorder.meta['calibration'] = self.coord_mapper.calibration_matrix.tolist()
+        if self.replay is not None:
+            # Map with the recorded session's calibration, not the saved one
+            calibration = self.replay.meta.get('calibration')
+            if calibration is None:
+                self.coord_mapper.reset_calibration()
+            else:
+                self.coord_mapper.set_matrix(calibration)
+        self.game_manager = GameManager(self.screen_width, self.screen_height, seed=seed)
+        
+        # Render asteroid sprites in the background while the menu is up
+        level = self.game_manager.level
+        asteroid_sprites.prewarm_async(level['min_size'], level['max_size'])
+        self.finger_cursors = {0: FingerCursor()}  # Keyed by track ID
         self.ui_renderer = UIRenderer(self.screen)
         self.fps_counter = FPSCounter()
         
-        # Initialize webcam
-        self.camera = cv2.VideoCapture(config.CAMERA_INDEX)
-        self.camera.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
-        self.camera.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+        # Initialize webcam (frames are read on a background thread)
+        self.camera = CameraCapture(source=frame_source, clock=clock, recorder=recorder)
         
         if not self.camera.isOpened():
             print("Error: Could not open camera")
             sys.exit(1)
         
+        self.camera.start()
+        
+        # Detector backend; 'auto' benchmarks the available ones on startup frames
+        if detector is None:
+            name = config.DETECTOR
+            frames = None
+            if name == 'auto' and self.replay is not None:
+                # The choice depends on timing, so use the recorded one
+                name = self.replay.meta['detector']
+            elif name == 'auto':
+                frames = self._collect_startup_frames()
+            detector = create_detector(name, frames)
+        self.detector = detector
+        
+        if self.recorder is not None:
+            self.recorder.meta['detector'] = detector.name
+            self.recorder.meta['startup_reads'] = len(self.recorder.index)
+            self.recorder.meta['detections'] = detection_settings()
+            self.recorder.detections = DetectionLog()
+        if self.replay is not None:
+            # Skip the frames the recorded session read before the game started
+            while self.replay.position < self.replay.meta['startup_reads']:
+                self.camera.read_latest()
+        
+        # In multi-ball mode every ball gets its own track ID and cursor
+        self.multi_tracker = None
+        self.process_frame = self.detector.process_frame
+        if config.MULTI_BALL:
+            self.multi_tracker = MultiObjectTracker(self.detector)
+            self.process_frame = self.multi_tracker.process_frame
+        
+        # Run detection on a worker thread so inference can't stall rendering
+        self.inference_worker = None
+        if config.ASYNC_DETECTION:
+            self.inference_worker = InferenceWorker(self.process_frame,
+                                                    snapshot_fn=self.detector.debug_snapshot)
+            self.inference_worker.start()
+        
         # Game state
         self.running = True
-        self.game_state = "menu"  # menu, playing, game_over
+        self.game_state = "menu"  # menu, playing, game_over, calibrating
         self.debug_mode = config.DEBUG_MODE
         self.last_frame = None
+        self.last_frame_timestamp = None
+        self.last_frame_sequence = 0
+        self.last_result_sequence = 0
+        self.debug_view = None  # Detector snapshot published with the last async result
+        self.normalized_position = None
+        self.cursor_position = None
+        
+        # Motion model between the tracker and the coordinate mapper
+        self.motion_filter = KalmanFilter2D() if config.USE_MOTION_FILTER else None
+        self.track_filters = {}  # Track ID -> KalmanFilter2D (multi-ball mode)
+        self.track_positions = {}  # Track ID -> normalized position (multi-ball mode)
+        self.measurement_timestamp = None
+        self.prediction_time = None
+        self.display_delay = 0.0  # Smoothed time from prediction to display flip
+        self.capture_to_display = 0.0  # Smoothed time from capture to display flip
+        
+        # Fixed-timestep simulation: leftover time carries over between frames
+        self.sim_dt = 1.0 / config.SIMULATION_RATE
+        self.sim_accumulator = 0.0
+        self.last_sim_time = self.now()
+        self.interpolation = 1.0  # Fraction of a step to render past the previous state
+        self.sim_steps_dropped = 0
+        
+        # Dirty-rect rendering: rects drawn last frame, and the state they were drawn in
+        self.dirty_rects = []
+        self.last_render_state = None
+        self.partial_updates = 0
+        self.full_updates = 0
+        
+        # Marker positions collected while calibrating
+        self.calibration_samples = []
         self.clock = pygame.time.Clock()
     
     def toggle_fullscreen(self):
@@ -74,123 +188,366 @@ class AsteroidGame:
                                                   pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        
+        # The new screen surface needs a full redraw
+        self.last_render_state = None
     
     def handle_events(self):
-        """Handle pygame events."""
+        """Handle pygame events.
+        
+        During a replay, keys come from the recording instead of the keyboard.
+        """
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
             
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    if self.game_state == "menu":
-                        self.running = False
-                    else:
-                        self.game_state = "menu"
-                
-                elif event.key == pygame.K_SPACE:
-                    if self.game_state == "menu":
-                        self.game_state = "playing"
-                        self.game_manager.reset()
-                    elif self.game_state == "game_over":
-                        self.game_state = "playing"
-                        self.game_manager.reset()
-                
-                elif event.key == pygame.K_f:
-                    self.toggle_fullscreen()
-                
-                elif event.key == pygame.K_d:
-                    self.debug_mode = not self.debug_mode
-                    print(f"Debug Mode: {self.debug_mode}")
+            elif event.type == pygame.KEYDOWN and self.replay is None:
+                if self.recorder is not None:
+                    self.recorder.write_event(event.key)
+                self.handle_key(event.key)
+        
+        if self.replay is not None:
+            for key in self.replay.pop_events():
+                self.handle_key(key)
+    
+    def handle_key(self, key):
+        """Handle a key press.
+        
+        Args:
+            key: pygame key code
+        """
+        if key == pygame.K_ESCAPE:
+            if self.game_state == "menu":
+                self.running = False
+            else:
+                self.game_state = "menu"
+        
+        elif key == pygame.K_SPACE:
+            if self.game_state in ("menu", "game_over"):
+                self.start_game()
+        
+        elif key == pygame.K_c:
+            if self.game_state == "menu":
+                self.game_state = "calibrating"
+                self.calibration_samples = []
+        
+        elif key == pygame.K_f:
+            self.toggle_fullscreen()
+        
+        elif key == pygame.K_d:
+            self.debug_mode = not self.debug_mode
+            print(f"Debug Mode: {self.debug_mode}")
+    
+    def start_game(self):
+        """Start a new game."""
+        self.game_state = "playing"
+        self.game_manager.reset()
+        
+        if self.recorder is not None:
+            self.recorder.mark_play_start()
+        elif self.replay is not None and self.replay.position not in self.replay.meta['play_starts']:
+            print(f"Warning: replay started a game at frame {self.replay.position}, "
+                  f"the recording at {self.replay.meta['play_starts']}")
+    
+    def _collect_startup_frames(self):
+        """Read frames for benchmarking detector backends.
+        
+        Returns:
+            List of up to config.AUTO_DETECTOR_FRAMES BGR images
+        """
+        frames = []
+        for _ in range(config.AUTO_DETECTOR_FRAMES * 2):
+            captured = self.camera.read_latest(timeout=0.5)
+            if captured is not None:
+                frames.append(captured.frame)
+                if len(frames) >= config.AUTO_DETECTOR_FRAMES:
+                    break
+        return frames
     
     def process_tracking(self):
         """Process webcam frame and detect object position.
         
+        The newest camera frame is taken without waiting; if the camera has
+        not produced a new frame since the last call, the previous position
+        is reused so the render loop never blocks on the camera. In async
+        mode the frame is handed to the inference worker and the most recent
+        published result is used instead.
+        
         Returns:
             Screen coordinates (x, y) of object center, or None
         """
-        ret, frame = self.camera.read()
-        if not ret:
-            return None
+        captured = self.camera.read_latest()
+        if captured is not None:
+            # The mirror effect is applied by the coordinate mapper, so the
+            # frame goes to inference untouched
+            self.last_frame = captured.frame # Store for debug rendering
+            self.last_frame_timestamp = captured.timestamp
+            self.last_frame_sequence = captured.sequence
+        
+        if self.inference_worker is not None:
+            if captured is not None:
+                self.inference_worker.submit(captured)
+            
+            result = self.inference_worker.get_latest()
+            if result is None:
+                # Nothing published yet, or the latest result is too old to trust
+                self.normalized_position = None
+                self.track_positions = {}
+            elif result.frame_sequence != self.last_result_sequence:
+                self.last_result_sequence = result.frame_sequence
+                self.debug_view = result.debug
+                self._apply_detection(result.position, result.timestamp)
+        elif captured is not None:
+            # Process with the detector
+            result = self.process_frame(captured.frame)
+            if self.recorder is not None:
+                self.recorder.detections.add(self.detector,
+                                             result if self.multi_tracker is None else None,
+                                             len(self.recorder.index) - 1)
+            self._apply_detection(result, captured.timestamp)
+        
+        return self._update_cursor()
+    
+    def _apply_detection(self, normalized_pos, timestamp):
+        """Feed a new detector result into the motion model.
+        
+        Args:
+            normalized_pos: Tuple (x, y) in range 0-1, or None. In multi-ball
+                            mode, a list of (track_id, (x, y)) instead.
+            timestamp: Capture time of the frame the result came from
+        """
+        self.measurement_timestamp = timestamp
+        
+        if self.multi_tracker is not None:
+            self._apply_tracks(normalized_pos, timestamp)
+            return
+        
+        self.normalized_position = normalized_pos
+        if self.motion_filter is not None:
+            if normalized_pos:
+                self.motion_filter.update(normalized_pos, timestamp)
+            else:
+                self.motion_filter.mark_missing(timestamp)
+    
+    def _apply_tracks(self, tracks, timestamp):
+        """Feed multi-ball tracks into one motion model per track.
+        
+        Args:
+            tracks: List of (track_id, (x, y)) normalized positions
+            timestamp: Capture time of the frame the tracks came from
+        """
+        self.track_positions = dict(tracks)
+        if not config.USE_MOTION_FILTER:
+            return
+        
+        for track_id, position in tracks:
+            if track_id not in self.track_filters:
+                self.track_filters[track_id] = KalmanFilter2D()
+            self.track_filters[track_id].update(position, timestamp)
+        
+        for track_id, motion_filter in list(self.track_filters.items()):
+            if track_id not in self.track_positions:
+                motion_filter.mark_missing(timestamp)
+                if not motion_filter.initialized:
+                    del self.track_filters[track_id]
+    
+    def _update_cursor(self):
+        """Compute the cursor position for the frame about to be displayed.
+        
+        With the motion filter enabled, the ball is predicted forward to the
+        expected display time to hide capture and inference latency.
+        
+        Returns:
+            Screen coordinates (x, y), or None. In multi-ball mode, a dict
+            mapping track ID to screen coordinates.
+        """
+        self.prediction_time = self.now()
+        display_time = self.prediction_time + self.display_delay + config.DISPLAY_LATENCY
         
-        # Flip frame horizontally for mirror effect (intuitive for screen interaction)
-        frame = cv2.flip(frame, 1)
-        self.last_frame = frame # Store for debug rendering
+        if self.multi_tracker is not None:
+            if config.USE_MOTION_FILTER:
+                positions = {track_id: motion_filter.predict(display_time)
+                             for track_id, motion_filter in self.track_filters.items()}
+                positions = {track_id: pos for track_id, pos in positions.items() if pos}
+            else:
+                positions = self.track_positions
+            
+            screen_points = self.coord_mapper.map_to_screen_batch(list(positions.values()))
+            self.cursor_position = {track_id: tuple(point)
+                                    for track_id, point in zip(positions, screen_points.tolist())}
+            return self.cursor_position
         
-        # Process with object tracker
-        normalized_pos = self.object_tracker.process_frame(frame)
+        if self.motion_filter is not None:
+            normalized_pos = self.motion_filter.predict(display_time)
+        else:
+            normalized_pos = self.normalized_position
         
         if normalized_pos:
             # Map to screen coordinates
-            screen_pos = self.coord_mapper.map_to_screen(*normalized_pos)
-            return screen_pos
+            self.cursor_position = self.coord_mapper.map_to_screen(*normalized_pos)
+        else:
+            self.cursor_position = None
+        
+        return self.cursor_position
+    
+    def process_calibration(self):
+        """Look for the projected corner markers and calibrate once they are stable.
+        
+        The markers must be found in CALIBRATION_STABLE_FRAMES consecutive
+        frames; their averaged positions are then used to compute the
+        camera-to-screen homography, which is saved for the next start.
+        """
+        captured = self.camera.read_latest()
+        if captured is None:
+            return
         
-        return None
+        self.last_frame = captured.frame
+        markers = detect_corner_markers(captured.frame, self.coord_mapper.mirror)
+        if markers is None:
+            self.calibration_samples = []
+            return
+        
+        self.calibration_samples.append(markers)
+        if len(self.calibration_samples) < config.CALIBRATION_STABLE_FRAMES:
+            return
+        
+        camera_points = sum(self.calibration_samples) / len(self.calibration_samples)
+        screen_points = get_marker_positions(self.screen_width, self.screen_height)
+        corner_points = [(cx, cy, sx, sy) for (cx, cy), (sx, sy) in zip(camera_points, screen_points)]
+        
+        if self.coord_mapper.calibrate(corner_points):
+            # A replay reproduces the calibration but leaves the saved one alone
+            if self.replay is None:
+                self.coord_mapper.save_calibration()
+            print("Calibration complete")
+        else:
+            print("Calibration failed - markers could not be matched")
+        
+        self.calibration_samples = []
+        self.game_state = "menu"
     
-    def update(self, cursor_position):
+    def update(self, cursor_position, elapsed=None):
         """Update game state.
         
+        The game simulates in fixed steps of 1 / config.SIMULATION_RATE
+        seconds, so its pace doesn't depend on the frame rate. A late frame
+        runs several steps (up to config.MAX_CATCHUP_STEPS) with the same
+        cursor position; rendering and tracking still happen once per frame.
+        
         Args:
-            cursor_position: Tuple (x, y) or None
+            cursor_position: Tuple (x, y) or None, or a dict mapping
+                             track ID to (x, y) in multi-ball mode
+            elapsed: Seconds to simulate (default: wall-clock time since the
+                     last call)
         """
+        now = self.now()
+        if elapsed is None:
+            elapsed = now - self.last_sim_time
+        self.last_sim_time = now
+        
         if self.game_state == "playing":
+            self.sim_accumulator += elapsed
+            steps = int(self.sim_accumulator / self.sim_dt)
+            if steps > config.MAX_CATCHUP_STEPS:
+                # Too far behind to catch up; let the game slow down instead
+                self.sim_steps_dropped += steps - config.MAX_CATCHUP_STEPS
+                self.sim_accumulator -= (steps - config.MAX_CATCHUP_STEPS) * self.sim_dt
+                steps = config.MAX_CATCHUP_STEPS
+            
             # Update game manager
-            self.game_manager.update(cursor_position)
+            with profiler.section("update"):
+                for _ in range(steps):
+                    self.game_manager.update(cursor_position)
+                    self.sim_accumulator -= self.sim_dt
+            self.interpolation = self.sim_accumulator / self.sim_dt
+            
+            # Update cursor visuals, one per tracked ball
+            positions = cursor_position if isinstance(cursor_position, dict) else {0: cursor_position}
+            for track_id, position in positions.items():
+                if track_id not in self.finger_cursors:
+                    self.finger_cursors[track_id] = FingerCursor()
+                self.finger_cursors[track_id].update(position)
             
-            # Update cursor visual
-            self.finger_cursor.update(cursor_position)
+            for track_id in list(self.finger_cursors):
+                if track_id not in positions:
+                    del self.finger_cursors[track_id]
             
             # Check if game is over
             if self.game_manager.game_over:
                 self.game_state = "game_over"
+        else:
+            # Don't bank time spent in menus
+            self.sim_accumulator = 0.0
+            self.interpolation = 1.0
     
     def render(self):
-        """Render the game."""
-        # Draw background image
-        self.screen.blit(self.background_image, (0, 0))
+        """Render the game.
+        
+        While playing with config.DIRTY_RECT_RENDERING, only the background
+        under last frame's sprites is restored and only the changed rects are
+        pushed to the display. Other screens are redrawn in full.
+        """
+        dirty_mode = config.DIRTY_RECT_RENDERING and self.game_state == "playing"
+        full_redraw = not dirty_mode or self.last_render_state != self.game_state
+        self.last_render_state = self.game_state
+        rects = []
+        
+        with profiler.section("render.background"):
+            if full_redraw:
+                # Draw background image
+                self.screen.blit(self.background_image, (0, 0))
+            else:
+                for rect in self.dirty_rects:
+                    self.screen.blit(self.background_image, rect, rect)
         
         if self.game_state == "menu":
             self.ui_renderer.draw_menu()
-            # Add tip about debug mode
-            font = pygame.font.Font(None, 24)
-            debug_text = font.render("Press 'D' to show Camera View (Debug)", True, (150, 150, 150))
-            self.screen.blit(debug_text, (10, self.screen_height - 30))
         
         elif self.game_state == "playing":
             # Draw asteroids
-            for asteroid in self.game_manager.asteroids:
-                asteroid.draw(self.screen)
+            with profiler.section("render.asteroids"):
+                rects.extend(self.game_manager.asteroids.draw(self.screen, self.interpolation))
             
             # Draw particles
-            for particle in self.game_manager.particles:
-                particle.draw(self.screen)
+            with profiler.section("render.particles"):
+                rects.extend(self.game_manager.particles.draw(self.screen, self.interpolation))
             
-            # Draw cursor
-            self.finger_cursor.draw(self.screen)
+            # Draw cursors
+            with profiler.section("render.cursors"):
+                for finger_cursor in self.finger_cursors.values():
+                    rects.extend(finger_cursor.draw(self.screen))
             
             # Draw UI
-            self.ui_renderer.draw_score(self.game_manager.score)
-            self.ui_renderer.draw_lives(self.game_manager.lives)
-            
-            # Draw FPS
-            fps = self.fps_counter.get_fps()
-            self.ui_renderer.draw_fps(fps)
+            with profiler.section("render.ui"):
+                rects.append(self.ui_renderer.draw_score(self.game_manager.score))
+                lives_rect = self.ui_renderer.draw_lives(self.game_manager.lives)
+                if lives_rect is not None:
+                    rects.append(lives_rect)
+                
+                # Draw FPS
+                fps = self.fps_counter.get_fps()
+                rects.append(self.ui_renderer.draw_fps(fps))
+        
+        elif self.game_state == "calibrating":
+            progress = len(self.calibration_samples) / config.CALIBRATION_STABLE_FRAMES
+            self.ui_renderer.draw_calibration_guide(progress)
         
         elif self.game_state == "game_over":
             # Still draw the game in background
-            for asteroid in self.game_manager.asteroids:
-                asteroid.draw(self.screen)
+            self.game_manager.asteroids.draw(self.screen)
             
-            for particle in self.game_manager.particles:
-                particle.draw(self.screen)
+            self.game_manager.particles.draw(self.screen)
             
             # Draw game over overlay
             self.ui_renderer.draw_game_over(self.game_manager.score)
             
-        # Debug Overlay (Picture-in-Picture)
-        if self.debug_mode and self.last_frame is not None:
+        # Debug Overlay (Picture-in-Picture). With async detection the worker
+        # thread is changing the detector, so draw its last published snapshot
+        debug_view = self.detector if self.inference_worker is None else self.debug_view
+        if self.debug_mode and self.last_frame is not None and debug_view is not None:
              # Get debug image from tracker (shows mask)
-            debug_img = self.object_tracker.get_debug_image(self.last_frame)
+            debug_img = debug_view.get_debug_image(self.last_frame,
+                                                   mirror=self.coord_mapper.mirror)
             
             # Resize for PiP
             pip_height = self.screen_height // 4
@@ -203,11 +560,58 @@ class AsteroidGame:
             
             # Draw box and image
             self.screen.blit(debug_surface, (self.screen_width - pip_width - 10, self.screen_height - pip_height - 10))
-            pygame.draw.rect(self.screen, (255, 255, 0), 
-                           (self.screen_width - pip_width - 10, self.screen_height - pip_height - 10, pip_width, pip_height), 2)
+            rects.append(pygame.draw.rect(self.screen, (255, 255, 0), 
+                           (self.screen_width - pip_width - 10, self.screen_height - pip_height - 10, pip_width, pip_height), 2))
+        
+        # Stage timing graph
+        if self.debug_mode and profiler.enabled:
+            graph_rect = pygame.Rect(10, self.screen_height - 250, 240, 120)
+            rects.append(profiler.draw_overlay(self.screen, self.ui_renderer.font_tip, graph_rect))
         
         # Update display
+        with profiler.section("display"):
+            self._present(rects, full_redraw)
+        self._measure_display_latency()
+    
+    def _present(self, rects, full_redraw):
+        """Push the frame to the display.
+        
+        Updates only last frame's and this frame's rects, unless the screen
+        was fully redrawn or the dirty area is large enough that a full flip
+        is cheaper.
+        
+        Args:
+            rects: Rects drawn this frame
+            full_redraw: Whether the whole screen was redrawn
+        """
+        previous = self.dirty_rects
+        self.dirty_rects = rects
+        
+        if not full_redraw:
+            screen_rect = self.screen.get_rect()
+            update_rects = [rect.clip(screen_rect) for rect in previous + rects]
+            dirty_area = sum(rect.width * rect.height for rect in update_rects)
+            
+            if dirty_area <= config.DIRTY_RECT_MAX_FRACTION * screen_rect.width * screen_rect.height:
+                pygame.display.update(update_rects)
+                self.partial_updates += 1
+                return
+        
         pygame.display.flip()
+        self.full_updates += 1
+    
+    def _measure_display_latency(self):
+        """Track how long predictions and captures take to reach the screen."""
+        now = self.now()
+        smoothing = config.LATENCY_SMOOTHING
+        
+        if self.prediction_time is not None:
+            delay = now - self.prediction_time
+            self.display_delay += (delay - self.display_delay) * smoothing
+        
+        if self.measurement_timestamp is not None:
+            delay = now - self.measurement_timestamp
+            self.capture_to_display += (delay - self.capture_to_display) * smoothing
     
     def run(self):
         """Main game loop."""
@@ -215,14 +619,22 @@ class AsteroidGame:
         print("Position your webcam to see the PROJECTED SCREEN.")
         print("Use a BALL (sports ball - tennis, soccer, basketball, etc.) to aim.")
         print("Press 'D' to toggle debug view to see what the camera sees.")
-        print("Using MobileNet-SSD for ball detection")
+        print(f"Using the {self.detector.name} detector")
         
         while self.running:
+            # A replay ends with its recording
+            if getattr(self.frame_source, 'finished', False):
+                break
+            
             # Handle events
             self.handle_events()
             
             # Process tracking
-            cursor_position = self.process_tracking()
+            if self.game_state == "calibrating":
+                self.process_calibration()
+                cursor_position = None
+            else:
+                cursor_position = self.process_tracking()
             
             # Update game
             self.update(cursor_position)
@@ -232,24 +644,86 @@ class AsteroidGame:
             
             # Update FPS
             self.fps_counter.update()
+            profiler.end_frame()
             
             # Cap frame rate
-            self.clock.tick(config.FPS_TARGET)
+            self.clock.tick(self.frame_limit)
         
         # Cleanup
         self.cleanup()
     
     def cleanup(self):
         """Clean up resources."""
+        if self.inference_worker is not None:
+            self.inference_worker.stop()
+            stats = self.inference_worker.get_stats()
+            print(f"Inference: {stats['processed']} frames processed, {stats['skipped']} skipped")
+        
+        print(f"Latency: {self.capture_to_display * 1000:.1f} ms capture-to-display")
+        
+        print(f"Display: {self.partial_updates} dirty-rect updates, {self.full_updates} full flips")
+        if self.sim_steps_dropped:
+            print(f"Simulation: {self.sim_steps_dropped} steps dropped while catching up")
+        
+        if profiler.enabled and profiler.frames:
+            p50, p95, p99 = profiler.percentiles("frame")
+            print(f"Frame time: p50 {p50:.1f} ms, p95 {p95:.1f} ms, p99 {p99:.1f} ms")
+            if config.PROFILER_CSV_FILE:
+                profiler.export_csv(config.PROFILER_CSV_FILE)
+                print(f"Stage timings written to {config.PROFILER_CSV_FILE}")
+        
+        stats = asteroid_sprites.get_stats()
+        print(f"Sprites: {stats['hits']} cache hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions")
+        
+        stats = self.camera.get_stats()
+        print(f"Camera: {stats['captured']} frames captured, {stats['dropped']} stale frames dropped")
         self.camera.release()
-        self.object_tracker.close()
+        self.detector.close()
         pygame.quit()
         print("Game closed. Thanks for playing!")
 
 
 def main():
     """Entry point for the game."""
-    game = AsteroidGame()
+    parser = argparse.ArgumentParser(description="Asteroid Destroyer")
+    parser.add_argument("--record", metavar="DIR", help="Save camera frames to a recording")
+    parser.add_argument("--replay", metavar="DIR", help="Play a recording instead of the webcam")
+    parser.add_argument("--fast", action="store_true",
+                        help="Replay as fast as possible instead of in real time")
+    parser.add_argument("--seed", type=int, help="Seed for the game's random generators")
+    parser.add_argument("--live-detection", action="store_true",
+                        help="Run the detector during replay even if the recording has "
+                             "precomputed detections")
+    args = parser.parse_args()
+    
+    if args.replay:
+        replay = ReplaySource(args.replay, realtime=not args.fast)
+        seed = args.seed if args.seed is not None else replay.meta.get('seed')
+        
+        # Process every recorded frame in order on the main thread, as the
+        # recorded session did
+        config.THREADED_CAPTURE = False
+        config.ASYNC_DETECTION = False
+        detector = None
+        if has_detection_index(args.replay) and not args.live_detection:
+            detector = ReplayTracker(args.replay)
+        game = AsteroidGame(frame_source=replay, clock=replay.now, seed=seed,
+                            frame_limit=0, detector=detector)
+    elif args.record:
+        # Replays need the seed, so always pick one when recording
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        recorder = Recorder(args.record, seed=seed)
+        
+        # A replay can only reproduce a session whose frames, detections and
+        # clock readings happened in a fixed order, so capture and detection
+        # run on the main thread while recording
+        config.THREADED_CAPTURE = False
+        config.ASYNC_DETECTION = False
+        game = AsteroidGame(clock=recorder.clock, seed=seed, recorder=recorder)
+    else:
+        game = AsteroidGame(seed=args.seed)
+    
     game.run()
 
 
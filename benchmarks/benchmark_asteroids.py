@@ -0,0 +1,90 @@
+"""
+Benchmark for asteroid updates.
+Compares the original list of Asteroid objects with the NumPy-backed
+AsteroidField, and GameManager.update_asteroids including the spatial grid.
+"""
+import os
+import sys
+import timeit
+import random
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pygame
+from asteroid_field import AsteroidField
+from game_manager import GameManager
+import config
+
+# Far enough below the screen that nothing leaves during the benchmark
+FLOOR = 1e12
+
+
+class Asteroid:
+    """Original per-object asteroid (update path only), kept here as the baseline."""
+    
+    def __init__(self, x, y, radius, speed):
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.speed = speed
+    
+    def update(self):
+        self.y += self.speed
+    
+    def is_off_screen(self, screen_height):
+        return self.y - self.radius > screen_height
+
+
+def update_list(asteroids, screen_height):
+    """Original per-object update, kept here as the baseline."""
+    for asteroid in asteroids[:]:
+        asteroid.update()
+        if asteroid.is_off_screen(screen_height):
+            asteroids.remove(asteroid)
+
+
+def make_asteroids(count):
+    """Build matching object, field and manager versions of the same asteroids.
+    
+    Returns:
+        Tuple (list of Asteroid, AsteroidField, GameManager)
+    """
+    rng = random.Random(0)
+    objects = []
+    field = AsteroidField()
+    manager = GameManager(config.SCREEN_WIDTH, FLOOR)
+    for _ in range(count):
+        x = rng.uniform(0, config.SCREEN_WIDTH)
+        y = rng.uniform(0, config.SCREEN_HEIGHT)
+        radius = rng.randint(config.ASTEROID_MIN_SIZE, config.ASTEROID_MAX_SIZE)
+        speed = rng.uniform(1.5, 2.5)
+        objects.append(Asteroid(x, y, radius, speed))
+        field.spawn(x, y, radius, speed)
+        manager.grid.insert(manager.asteroids.spawn(x, y, radius, speed), x, y, radius)
+    return objects, field, manager
+
+
+def main():
+    """Run the asteroid update benchmark."""
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    
+    print("Asteroid update benchmark")
+    print("=========================")
+    for count in [10, 100, 10000]:
+        objects, field, manager = make_asteroids(count)
+        runs = max(10, 100000 // count)
+        
+        list_time = timeit.timeit(lambda: update_list(objects, FLOOR), number=runs) / runs
+        field_time = timeit.timeit(lambda: field.update(FLOOR), number=runs) / runs
+        manager_time = timeit.timeit(manager.update_asteroids, number=runs) / runs
+        
+        print(f"{count:>6} asteroids: list {list_time * 1e3:8.3f} ms, "
+              f"field {field_time * 1e3:8.3f} ms ({list_time / field_time:.1f}x), "
+              f"manager+grid {manager_time * 1e3:8.3f} ms")
+    
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark for batch coordinate mapping.
+Compares CoordinateMapper.map_to_screen_batch with looping over map_to_screen,
+and checks that both give identical results.
+"""
+import os
+import sys
+import timeit
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from coordinate_mapper import CoordinateMapper
+from calibration import get_marker_positions
+import config
+
+
+def make_mappers():
+    """Build an uncalibrated and a calibrated mapper.
+    
+    Returns:
+        List of (name, CoordinateMapper) pairs
+    """
+    plain = CoordinateMapper(mirror=True)
+    plain.reset_calibration()
+    
+    # A slightly skewed camera view of the screen corners
+    calibrated = CoordinateMapper()
+    camera_corners = [(0.12, 0.10), (0.90, 0.14), (0.86, 0.92), (0.08, 0.88)]
+    calibrated.calibrate([(cx, cy, sx, sy) for (cx, cy), (sx, sy)
+                          in zip(camera_corners, get_marker_positions())])
+    
+    return [("plain", plain), ("calibrated", calibrated)]
+
+
+def main():
+    """Run the mapping benchmark."""
+    rng = np.random.default_rng(0)
+    
+    print("Coordinate mapping benchmark")
+    print("============================")
+    for name, mapper in make_mappers():
+        for count in [10, 1000, 100000]:
+            # Include points outside 0-1 so clamping is exercised
+            points = rng.uniform(-0.1, 1.1, (count, 2))
+            screen_points = rng.uniform(-50, config.SCREEN_WIDTH + 50, (count, 2))
+            
+            scalar = np.array([mapper.map_to_screen(x, y) for x, y in points.tolist()])
+            batch = mapper.map_to_screen_batch(points)
+            assert np.array_equal(scalar, batch), f"{name}: map_to_screen mismatch"
+            
+            scalar_inv = np.array([mapper.inverse_map(x, y) for x, y in screen_points.tolist()])
+            batch_inv = mapper.inverse_map_batch(screen_points)
+            assert np.array_equal(scalar_inv, batch_inv), f"{name}: inverse_map mismatch"
+            
+            runs = max(1, 100000 // count)
+            point_list = points.tolist()
+            loop_time = timeit.timeit(
+                lambda: [mapper.map_to_screen(x, y) for x, y in point_list], number=runs) / runs
+            batch_time = timeit.timeit(
+                lambda: mapper.map_to_screen_batch(points), number=runs) / runs
+            
+            print(f"{name:>10}, {count:>6} points: loop {loop_time * 1e3:8.3f} ms, "
+                  f"batch {batch_time * 1e3:8.3f} ms ({loop_time / batch_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
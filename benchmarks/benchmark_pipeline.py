@@ -0,0 +1,253 @@
+"""
+Headless end-to-end benchmark for the game pipeline.
+Runs capture -> ObjectTracker -> CoordinateMapper -> GameManager -> render on a
+video file or a synthetic ball animation with the SDL dummy video driver, and
+prints per-stage frame-time percentiles, throughput and peak RSS as JSON.
+
+Usage:
+    python benchmarks/benchmark_pipeline.py --frames 600
+    python benchmarks/benchmark_pipeline.py --video clip.mp4 --output result.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import cv2
+import numpy as np
+import config
+from profiler import profiler
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+class SyntheticSource:
+    """Generates frames of an orange ball bouncing around a dark room."""
+    
+    def __init__(self, width=None, height=None, seed=0):
+        """Initialize the source.
+        
+        Args:
+            width: Frame width (default config.CAMERA_WIDTH)
+            height: Frame height (default config.CAMERA_HEIGHT)
+            seed: Seed for the ball's start position and velocity
+        """
+        self.width = width or config.CAMERA_WIDTH
+        self.height = height or config.CAMERA_HEIGHT
+        rng = np.random.default_rng(seed)
+        self.radius = self.height // 12
+        self.position = rng.uniform([self.radius, self.radius],
+                                    [self.width - self.radius, self.height - self.radius])
+        self.velocity = rng.uniform(-12, 12, 2)
+        self.background = np.full((self.height, self.width, 3), 40, dtype=np.uint8)
+        self.opened = True
+    
+    def isOpened(self):
+        return self.opened
+    
+    def read(self):
+        """Render the next frame.
+        
+        Returns:
+            Tuple (ret, frame)
+        """
+        self.position += self.velocity
+        for axis, limit in ((0, self.width), (1, self.height)):
+            if not self.radius <= self.position[axis] <= limit - self.radius:
+                self.velocity[axis] = -self.velocity[axis]
+                self.position[axis] = np.clip(self.position[axis], self.radius, limit - self.radius)
+        
+        frame = self.background.copy()
+        center = (int(self.position[0]), int(self.position[1]))
+        cv2.circle(frame, center, self.radius, (0, 140, 255), -1)
+        return True, frame
+    
+    def release(self):
+        self.opened = False
+
+
+class LoopingVideoSource:
+    """Reads a video file, starting over when it ends."""
+    
+    def __init__(self, path):
+        """Initialize the source.
+        
+        Args:
+            path: Path to a video file readable by OpenCV
+        """
+        self.capture = cv2.VideoCapture(path)
+    
+    def isOpened(self):
+        return self.capture.isOpened()
+    
+    def read(self):
+        """Read the next frame, rewinding at the end of the file.
+        
+        Returns:
+            Tuple (ret, frame)
+        """
+        ret, frame = self.capture.read()
+        if not ret:
+            self.capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.capture.read()
+        return ret, frame
+    
+    def release(self):
+        self.capture.release()
+
+
+def timed(fn, samples):
+    """Wrap a callable so each call's duration is appended to samples."""
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append(time.perf_counter() - start)
+    return wrapper
+
+
+def summarize(samples):
+    """Get millisecond percentiles for a list of durations in seconds."""
+    if not samples:
+        return None
+    ms = np.array(samples) * 1000.0
+    return {
+        'count': len(ms),
+        'mean_ms': round(float(ms.mean()), 4),
+        'p50_ms': round(float(np.percentile(ms, 50)), 4),
+        'p95_ms': round(float(np.percentile(ms, 95)), 4),
+        'p99_ms': round(float(np.percentile(ms, 99)), 4),
+        'max_ms': round(float(ms.max()), 4),
+    }
+
+
+def peak_rss_mb():
+    """Get the peak resident set size of this process in MB, if known."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run(source, frames, warmup, seed=None):
+    """Run the game pipeline for a fixed number of frames.
+    
+    Args:
+        source: Frame source with read()/release()/isOpened()
+        frames: Number of measured frames
+        warmup: Number of frames to run before measuring
+        seed: Seed for the game's random generators
+    
+    Returns:
+        Dictionary with the benchmark results
+    """
+    # Run every stage in order on this thread so each one can be timed
+    config.THREADED_CAPTURE = False
+    config.ASYNC_DETECTION = False
+    config.FULLSCREEN = False
+    
+    from asteroid_game import AsteroidGame
+    game = AsteroidGame(frame_source=source, seed=seed)
+    game.game_state = "playing"
+    game.game_manager.reset()
+    
+    stages = {name: [] for name in ('capture', 'detect', 'map', 'update', 'render')}
+    game.camera.read_latest = timed(game.camera.read_latest, stages['capture'])
+    game.process_frame = timed(game.process_frame, stages['detect'])
+    game._update_cursor = timed(game._update_cursor, stages['map'])
+    update = timed(game.update, stages['update'])
+    render = timed(game.render, stages['render'])
+    
+    totals = []
+    detections = 0
+    games_played = 1
+    for frame_index in range(warmup + frames):
+        if frame_index == warmup:
+            for samples in stages.values():
+                samples.clear()
+            start_time = time.perf_counter()
+        
+        frame_start = time.perf_counter()
+        cursor_position = game.process_tracking()
+        # Simulate exactly one step per frame so results don't depend on speed
+        update(cursor_position, game.sim_dt)
+        render()
+        totals.append(time.perf_counter() - frame_start)
+        profiler.end_frame()
+        
+        if frame_index >= warmup and game.normalized_position is not None:
+            detections += 1
+        if game.game_state == "game_over":
+            game.game_state = "playing"
+            game.game_manager.reset()
+            games_played += 1
+    
+    elapsed = time.perf_counter() - start_time
+    totals = totals[warmup:]
+    game.cleanup()
+    
+    return {
+        'frames': frames,
+        'warmup_frames': warmup,
+        'elapsed_s': round(elapsed, 3),
+        'throughput_fps': round(frames / elapsed, 2),
+        'frames_with_detection': detections,
+        'games_played': games_played,
+        'total': summarize(totals),
+        'stages': {name: summarize(samples) for name, samples in stages.items()},
+        # Finer-grained stages from the built-in profiler (last PROFILER_HISTORY frames)
+        'profiler_ms': {name: [round(v, 4) for v in values]
+                        for name, values in profiler.get_summary().items()},
+        'peak_rss_mb': peak_rss_mb(),
+        'config': {
+            'detector': game.detector.name,
+            'tracking_mode': config.TRACKING_MODE,
+            'multi_ball': config.MULTI_BALL,
+            'difficulty': config.DIFFICULTY,
+            'dirty_rect_rendering': config.DIRTY_RECT_RENDERING,
+        },
+    }
+
+
+def main():
+    """Run the pipeline benchmark."""
+    parser = argparse.ArgumentParser(description="Headless game pipeline benchmark")
+    parser.add_argument("--video", help="Video file to use instead of the synthetic source")
+    parser.add_argument("--frames", type=int, default=600, help="Number of measured frames")
+    parser.add_argument("--warmup", type=int, default=30, help="Frames to run before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic source and game")
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    args = parser.parse_args()
+    
+    if args.video:
+        source = LoopingVideoSource(args.video)
+        source_name = args.video
+    else:
+        source = SyntheticSource(seed=args.seed)
+        source_name = "synthetic"
+    
+    # Keep stdout for the JSON result
+    with contextlib.redirect_stdout(sys.stderr):
+        result = run(source, args.frames, args.warmup, seed=args.seed)
+    result['source'] = source_name
+    
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
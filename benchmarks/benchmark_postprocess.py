@@ -0,0 +1,101 @@
+"""
+Microbenchmark for MobileNet-SSD post-processing.
+Compares the original per-row Python loop with the vectorized decode, and
+checks that the preallocated blob preparation matches cv2.dnn.blobFromImage.
+"""
+import os
+import sys
+import timeit
+import cv2
+import numpy as np
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from object_tracker import decode_detections, prepare_blob
+import config
+
+
+def decode_loop(detections, target_class, confidence_threshold, region):
+    """Original per-row decode, kept here as the baseline."""
+    rx1, ry1, rx2, ry2 = region
+    width = rx2 - rx1
+    height = ry2 - ry1
+    
+    results = []
+    for i in range(detections.shape[2]):
+        confidence = detections[0, 0, i, 2]
+        class_id = int(detections[0, 0, i, 1])
+        
+        if class_id == target_class and confidence > confidence_threshold:
+            box = detections[0, 0, i, 3:7] * np.array([width, height, width, height])
+            box += np.array([rx1, ry1, rx1, ry1])
+            (x1, y1, x2, y2) = box.astype("int")
+            results.append({
+                'class_id': class_id,
+                'confidence': float(confidence),
+                'bbox': (x1, y1, x2, y2)
+            })
+    return results
+
+
+def make_detections(count, ball_fraction, rng):
+    """Build a synthetic SSD output with some ball rows.
+    
+    Args:
+        count: Number of detection rows
+        ball_fraction: Fraction of rows with the target class
+        rng: NumPy random generator
+    
+    Returns:
+        float32 array of shape (1, 1, count, 7)
+    """
+    detections = np.zeros((1, 1, count, 7), dtype=np.float32)
+    rows = detections[0, 0]
+    rows[:, 1] = rng.integers(1, 21, count)
+    rows[rng.random(count) < ball_fraction, 1] = config.TARGET_CLASS_ID
+    rows[:, 2] = rng.random(count)
+    corners = rng.random((count, 2)) * 0.8
+    rows[:, 3:5] = corners
+    rows[:, 5:7] = corners + 0.1
+    return detections
+
+
+def main():
+    """Run the post-processing benchmark."""
+    rng = np.random.default_rng(0)
+    region = (0, 0, config.CAMERA_WIDTH, config.CAMERA_HEIGHT)
+    threshold = config.CONFIDENCE_THRESHOLD
+    target = config.TARGET_CLASS_ID
+    
+    # The reused-buffer blob must be exactly what blobFromImage produced
+    size = config.DETECTION_INPUT_SIZE
+    frame = rng.integers(0, 256, (config.CAMERA_HEIGHT, config.CAMERA_WIDTH, 3), dtype=np.uint8)
+    expected_blob = cv2.dnn.blobFromImage(cv2.resize(frame, (size, size)), 0.007843,
+                                          (size, size), 127.5)
+    blob = prepare_blob(frame, np.empty((size, size, 3), dtype=np.uint8),
+                        np.empty((1, 3, size, size), dtype=np.float32))
+    assert np.array_equal(blob, expected_blob)
+    
+    print("SSD post-processing benchmark (per frame)")
+    print("=========================================")
+    for count, ball_fraction in [(100, 0.02), (100, 0.2)]:
+        detections = make_detections(count, ball_fraction, rng)
+        
+        # Both paths must agree before timing them
+        expected = decode_loop(detections, target, threshold, region)
+        boxes, confidences = decode_detections(detections, target, threshold, region)
+        assert [d['bbox'] for d in expected] == [tuple(b) for b in boxes.tolist()]
+        assert [d['confidence'] for d in expected] == confidences.tolist()
+        
+        runs = 2000
+        loop_time = timeit.timeit(lambda: decode_loop(detections, target, threshold, region),
+                                  number=runs) / runs
+        vector_time = timeit.timeit(lambda: decode_detections(detections, target, threshold, region),
+                                    number=runs) / runs
+        
+        print(f"{count} rows, {len(expected)} balls: "
+              f"loop {loop_time * 1e6:.1f} us, vectorized {vector_time * 1e6:.1f} us "
+              f"({loop_time / vector_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Projector calibration: corner marker layout and detection.
+"""
+import cv2
+import numpy as np
+import config
+
+
+def get_marker_positions(screen_width=None, screen_height=None):
+    """Get the screen positions of the four calibration markers.
+    
+    Args:
+        screen_width: Width of the game screen
+        screen_height: Height of the game screen
+    
+    Returns:
+        List of (x, y) marker centers: top-left, top-right, bottom-right, bottom-left
+    """
+    width = screen_width or config.SCREEN_WIDTH
+    height = screen_height or config.SCREEN_HEIGHT
+    inset = config.CALIBRATION_MARKER_INSET + config.CALIBRATION_MARKER_SIZE // 2
+    
+    return [
+        (inset, inset),
+        (width - inset, inset),
+        (width - inset, height - inset),
+        (inset, height - inset),
+    ]
+
+
+def order_corners(points, mirror=False):
+    """Order four points as top-left, top-right, bottom-right, bottom-left.
+    
+    Args:
+        points: Array of shape (4, 2) with normalized (0-1) coordinates
+        mirror: Order the corners as seen in the mirrored view, so a
+                marker on the left of the camera image counts as right
+    
+    Returns:
+        Array of shape (4, 2) in corner order
+    """
+    points = np.asarray(points, dtype=np.float64)
+    x = 1.0 - points[:, 0] if mirror else points[:, 0]
+    sums = x + points[:, 1]
+    diffs = points[:, 1] - x
+    
+    return np.array([
+        points[np.argmin(sums)],   # top-left has the smallest x + y
+        points[np.argmin(diffs)],  # top-right has the smallest y - x
+        points[np.argmax(sums)],   # bottom-right has the largest x + y
+        points[np.argmax(diffs)],  # bottom-left has the largest y - x
+    ])
+
+
+def detect_corner_markers(frame, mirror=False):
+    """Find the four projected calibration markers in a camera frame.
+    
+    The markers are bright filled squares on a dark screen, so they are
+    found by thresholding and keeping the four largest square-ish blobs.
+    
+    Args:
+        frame: BGR image from OpenCV
+        mirror: Order the markers as seen in the mirrored view (see order_corners)
+    
+    Returns:
+        Array of shape (4, 2) with normalized (0-1) marker centers in
+        corner order, or None if four markers were not found
+    """
+    height, width = frame.shape[:2]
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    gray = cv2.GaussianBlur(gray, (5, 5), 0)
+    _, mask = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    
+    min_area = config.CALIBRATION_MIN_MARKER_AREA * width * height
+    candidates = []
+    for contour in contours:
+        area = cv2.contourArea(contour)
+        if area < min_area:
+            continue
+        
+        # Keep roughly square blobs
+        x, y, w, h = cv2.boundingRect(contour)
+        aspect = w / h if h else 0
+        if not 0.5 <= aspect <= 2.0 or area < 0.6 * w * h:
+            continue
+        
+        moments = cv2.moments(contour)
+        cx = moments['m10'] / moments['m00']
+        cy = moments['m01'] / moments['m00']
+        candidates.append((area, cx, cy))
+    
+    if len(candidates) < 4:
+        return None
+    
+    candidates.sort(reverse=True)
+    centers = np.array([(cx / width, cy / height) for _, cx, cy in candidates[:4]])
+    return order_corners(centers, mirror)
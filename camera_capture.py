@@ -0,0 +1,169 @@
+"""
+Threaded camera capture with a latest-frame buffer.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+import cv2
+import config
+from profiler import profiler
+
+# A captured frame together with the time it was read and its sequence number
+CapturedFrame = namedtuple('CapturedFrame', ['frame', 'timestamp', 'sequence'])
+
+
+class CameraCapture:
+    """Reads frames from a video source on a background thread.
+    
+    The capture thread keeps the newest frames in a small ring buffer so the
+    game loop never waits on the camera. Frames that are overwritten before
+    the game gets to them are dropped and counted.
+    """
+    
+    def __init__(self, source=None, threaded=None, buffer_size=None, clock=None, recorder=None):
+        """Initialize the camera capture.
+        
+        Args:
+            source: Object with read()/release()/isOpened() (e.g. cv2.VideoCapture).
+                    Defaults to the webcam at config.CAMERA_INDEX.
+            threaded: Read frames on a background thread (default from config)
+            buffer_size: Number of frames kept in the ring buffer
+            clock: Function returning the capture time (default time.perf_counter)
+            recorder: Optional Recorder that every captured frame is written to
+        """
+        if source is None:
+            source = cv2.VideoCapture(config.CAMERA_INDEX)
+            source.set(cv2.CAP_PROP_FRAME_WIDTH, config.CAMERA_WIDTH)
+            source.set(cv2.CAP_PROP_FRAME_HEIGHT, config.CAMERA_HEIGHT)
+            # Keep the driver queue short so we are not handed stale frames
+            source.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.source = source
+        self.clock = clock or time.perf_counter
+        self.recorder = recorder
+        
+        self.threaded = config.THREADED_CAPTURE if threaded is None else threaded
+        self.buffer = deque(maxlen=buffer_size or config.CAPTURE_BUFFER_SIZE)
+        self.lock = threading.Lock()
+        self.new_frame = threading.Event()
+        self.thread = None
+        self.running = False
+        
+        # Statistics
+        self.sequence = 0  # Sequence number of the last captured frame
+        self.last_read_sequence = 0  # Sequence number of the last frame handed out
+        self.frames_captured = 0
+        self.frames_dropped = 0
+        self.read_failures = 0
+    
+    def isOpened(self):
+        """Check whether the underlying source is open."""
+        return self.source.isOpened()
+    
+    def start(self):
+        """Start the background capture thread (no-op when not threaded)."""
+        if not self.threaded or self.running:
+            return self
+        
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop,
+                                       name="CameraCapture", daemon=True)
+        self.thread.start()
+        return self
+    
+    def _grab(self):
+        """Read one frame from the source and push it into the buffer.
+        
+        Returns:
+            True if a frame was captured, False otherwise
+        """
+        with profiler.section("capture"):
+            ret, frame = self.source.read()
+        timestamp = self.clock()
+        if self.recorder is not None:
+            # Failed reads are recorded too, so a replay fails at the same point
+            self.recorder.write(frame if ret else None, timestamp)
+        
+        if not ret:
+            self.read_failures += 1
+            return False
+        
+        with self.lock:
+            self.sequence += 1
+            self.frames_captured += 1
+            self.buffer.append(CapturedFrame(frame, timestamp, self.sequence))
+        self.new_frame.set()
+        return True
+    
+    def _capture_loop(self):
+        """Background loop that keeps the buffer filled with fresh frames."""
+        while self.running:
+            if not self._grab():
+                # Avoid spinning on a disconnected camera
+                time.sleep(0.01)
+    
+    def read_latest(self, timeout=0.0):
+        """Get the newest frame that has not been handed out yet.
+        
+        Older unread frames in the buffer are discarded and counted as dropped.
+        
+        Args:
+            timeout: Seconds to wait for a new frame (0 = don't wait)
+        
+        Returns:
+            CapturedFrame, or None if no new frame is available
+        """
+        if not self.threaded:
+            if not self._grab():
+                return None
+        elif timeout > 0:
+            self.new_frame.wait(timeout)
+        
+        with self.lock:
+            if not self.buffer:
+                return None
+            
+            latest = self.buffer[-1]
+            if latest.sequence <= self.last_read_sequence:
+                return None
+            
+            # Every frame between the last one we handed out and this one is stale
+            self.frames_dropped += latest.sequence - self.last_read_sequence - 1
+            self.last_read_sequence = latest.sequence
+            self.buffer.clear()
+            self.new_frame.clear()
+        
+        return latest
+    
+    def read(self):
+        """Read a frame with the cv2.VideoCapture interface.
+        
+        Returns:
+            Tuple (ret, frame)
+        """
+        captured = self.read_latest()
+        if captured is None:
+            return False, None
+        return True, captured.frame
+    
+    def get_stats(self):
+        """Get capture statistics.
+        
+        Returns:
+            Dictionary with captured, dropped, and failed frame counts
+        """
+        return {
+            'captured': self.frames_captured,
+            'dropped': self.frames_dropped,
+            'failures': self.read_failures,
+            'sequence': self.sequence,
+        }
+    
+    def release(self):
+        """Stop the capture thread and release the source."""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        self.source.release()
+        if self.recorder is not None:
+            self.recorder.close()
@@ -0,0 +1,61 @@
+"""
+Ball tracking by color in HSV space (no model needed).
+"""
+import cv2
+import numpy as np
+import config
+from detectors import Detection, Detector
+
+
+class ColorTracker(Detector):
+    """Finds balls as solid blobs of config.BALL_COLOR."""
+    
+    def __init__(self):
+        """Initialize the color tracker."""
+        self.color_ranges = config.BALL_COLOR_RANGES.get(config.BALL_COLOR,
+                                                         config.BALL_COLOR_RANGES['ANY'])
+        self.min_area = config.COLOR_MIN_AREA
+        self.kernel = np.ones((5, 5), dtype=np.uint8)
+        
+        # Debug info
+        self.mask = None
+        self.detections = []
+        self.last_detections = []
+    
+    def detect(self, frame):
+        """Find blobs of the ball color in a frame.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            List of Detection, largest blob first. Confidence is how round
+            the blob is (how much of its enclosing circle it fills).
+        """
+        height, width = frame.shape[:2]
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        
+        mask = None
+        for lower, upper in self.color_ranges:
+            color_mask = cv2.inRange(hsv, lower, upper)
+            mask = color_mask if mask is None else cv2.bitwise_or(mask, color_mask)
+        
+        # Drop speckle noise before looking for blobs
+        mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, self.kernel)
+        self.mask = mask
+        
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        min_area = self.min_area * width * height
+        
+        blobs = []
+        for contour in contours:
+            area = cv2.contourArea(contour)
+            if area < min_area:
+                continue
+            (cx, cy), radius = cv2.minEnclosingCircle(contour)
+            roundness = min(area / (np.pi * radius * radius), 1.0) if radius > 0 else 0.0
+            x, y, w, h = cv2.boundingRect(contour)
+            blobs.append((area, Detection((cx / width, cy / height), roundness, (x, y, x + w, y + h))))
+        
+        blobs.sort(key=lambda blob: -blob[0])
+        return [detection for _, detection in blobs]
@@ -8,20 +8,44 @@ import numpy as np
 SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS_TARGET = 60
+SIMULATION_RATE = 60  # fixed game steps per second (speeds and spawn rates are per step)
+MAX_CATCHUP_STEPS = 5  # most steps run for one late frame
 FULLSCREEN = False
+DIRTY_RECT_RENDERING = True  # Redraw only changed regions while playing
+DIRTY_RECT_MAX_FRACTION = 0.4  # Full flip when more of the screen than this is dirty
 
 # Camera settings
 CAMERA_INDEX = 0
 CAMERA_WIDTH = 640
 CAMERA_HEIGHT = 480
+THREADED_CAPTURE = True  # Read the camera on a background thread
+CAPTURE_BUFFER_SIZE = 2  # Frames kept in the capture ring buffer
+MIRROR_VIEW = True  # Mirror the camera horizontally (applied to coordinates, not frames)
+
+# Projector calibration (press C on the menu)
+CALIBRATION_FILE = "calibration.json"  # Saved homography, loaded at startup
+CALIBRATION_MARKER_SIZE = 80  # Side of each projected corner marker (pixels)
+CALIBRATION_MARKER_INSET = 40  # Gap between markers and the screen edges (pixels)
+CALIBRATION_MIN_MARKER_AREA = 0.0005  # Smallest marker blob, as a fraction of the frame
+CALIBRATION_STABLE_FRAMES = 15  # Consecutive frames markers must be found in
 
 # Ball Detection Settings - Machine Learning Based
 # Uses pre-trained MobileNet-SSD model to detect actual ball objects
 
+# Detector backend: 'opencv-ssd', 'onnx', 'hsv-color', 'mediapipe-hand',
+# or 'auto' to benchmark the available ones on startup frames
+DETECTOR = 'opencv-ssd'
+AUTO_DETECTOR_FRAMES = 30  # Startup frames each backend is timed on
+AUTO_DETECTOR_REFERENCE = 'opencv-ssd'  # Backend the others are checked against
+AUTO_DETECTOR_MIN_TARGET_FRAMES = 10  # Frames the reference must see a target in to compare
+AUTO_DETECTOR_MIN_ACCURACY = 0.8  # Fraction of target frames that must agree with the reference
+AUTO_DETECTOR_TOLERANCE = 0.05  # Max position difference to agree (normalized units)
+
 # ML Model Configuration
 USE_ML_DETECTION = True  # Use ML-based ball detection
 MODEL_PROTOTXT = "models/MobileNetSSD_deploy.prototxt"
 MODEL_WEIGHTS = "models/MobileNetSSD_deploy.caffemodel"
+ONNX_MODEL = "models/MobileNetSSD.onnx"  # Same network for the 'onnx' backend
 
 # Detection Parameters
 CONFIDENCE_THRESHOLD = 0.3  # Minimum confidence for ball detection (0.0 - 1.0)
@@ -42,23 +66,109 @@ BALL_COLOR_RANGES = {
     'YELLOW': [(np.array([20, 100, 100]), np.array([35, 255, 255]))],
     'ANY': [(np.array([0, 50, 50]), np.array([180, 255, 255]))]
 }
+COLOR_MIN_AREA = 0.001  # Smallest blob for the 'hsv-color' backend, as a fraction of the frame
+
+# Hand tracking ('mediapipe-hand' backend)
+MAX_HANDS = 1
+HAND_DETECTION_CONFIDENCE = 0.5
+HAND_TRACKING_CONFIDENCE = 0.5
+
+# Region-of-interest search: run the network on a window around the last
+# known ball position instead of the whole frame
+USE_ROI_SEARCH = True
+ROI_SCALE = 3.0  # Window size as a multiple of the last ball box
+ROI_MOTION_MARGIN = 2.0  # Extra margin per pixel/frame of ball motion
+ROI_MIN_SIZE = 160  # Smallest window side in pixels
+ROI_FULL_FRAME_INTERVAL = 15  # Force a full-frame pass after this many ROI hits
+DETECTION_INPUT_SIZE = 300  # Network input side; lower (e.g. 224) for less latency
+
+# Detect-then-track: 'detect' runs the network on every frame, 'hybrid' runs it
+# every DETECTION_INTERVAL frames and follows the ball with optical flow in between
+TRACKING_MODE = 'detect'
+DETECTION_INTERVAL = 5  # Frames between full detections in hybrid mode
+TRACKER_MAX_POINTS = 30  # Feature points followed inside the ball box
+TRACKER_MIN_POINTS = 4  # Track is lost below this many points
+TRACKER_MIN_CONFIDENCE = 0.5  # Fraction of points that must survive each frame
+TRACKER_MAX_FB_ERROR = 1.0  # Max forward-backward error (pixels) for a good point
+
+# Multi-ball tracking (several balls at once, each with a persistent ID)
+MULTI_BALL = False
+MULTI_BALL_MAX_TRACKS = 8  # Most balls tracked at once
+MULTI_TRACK_MAX_DISTANCE = 2.0  # Max match distance, in ball box sizes
+MULTI_TRACK_MIN_HITS = 2  # Detections before a new track gets a cursor
+MULTI_TRACK_MAX_MISSES = 3  # Frames a track survives without a detection
+MULTI_TRACK_VELOCITY_GAIN = 0.5  # How quickly track velocity follows new detections
+
+# Asynchronous detection (inference runs on a worker thread)
+ASYNC_DETECTION = True
+ASYNC_MAX_RESULT_AGE = 0.25  # Seconds after capture before a result is ignored
 
 # Detection parameters
 MIN_CONTOUR_AREA = 300  # Minimum size of ball bounding box area
 SMOOTHING_FACTOR = 0.5  # 0.0 to 1.0 (higher = more smoothing, lower latency)
 
+# Motion filter (Kalman) between the tracker and the coordinate mapper
+USE_MOTION_FILTER = True
+KALMAN_PROCESS_NOISE = 8.0  # Acceleration noise (normalized units/s^2)
+KALMAN_MEASUREMENT_NOISE = 0.01  # Measurement std-dev at SMOOTHING_FACTOR = 0.5
+KALMAN_MAX_COAST = 0.2  # Seconds to keep predicting through a detection dropout
+KALMAN_MAX_PREDICTION = 0.15  # Max seconds to extrapolate past the last measurement
+DISPLAY_LATENCY = 0.0  # Extra seconds from display flip to light on the wall (projector lag)
+LATENCY_SMOOTHING = 0.1  # Weight of each new sample in the latency averages
+
 # Debug mode (to see what the camera sees)
 DEBUG_MODE = False
 
+# Profiling (the stage timing graph is shown in debug view)
+PROFILER_ENABLED = True
+PROFILER_HISTORY = 240  # frames kept for rolling percentiles
+PROFILER_CSV_FILE = None  # e.g. "profile.csv" to write per-frame stage timings on exit
+
+# Recording (python asteroid_game.py --record DIR)
+RECORD_JPEG_QUALITY = 90  # 0-100, higher = larger files
+RECORD_FLUSH_FRAMES = 300  # Rewrite the recording's index every this many frames
+
 # Game settings
 INITIAL_ASTEROID_SPEED = 2
-ASTEROID_SPAWN_RATE = 60  # frames between spawns
+ASTEROID_SPAWN_RATE = 60  # simulation steps between spawns
 ASTEROID_MIN_SIZE = 50
 ASTEROID_MAX_SIZE = 100
 DIFFICULTY_INCREASE_INTERVAL = 10  # score points
 SPEED_INCREASE_FACTOR = 1.1
 SPAWN_RATE_DECREASE = 5  # decrease frames between spawns
 
+# Difficulty presets ('swarm' fills the screen with hundreds of small asteroids)
+DIFFICULTY = 'normal'
+DIFFICULTY_LEVELS = {
+    'normal': {
+        'speed': INITIAL_ASTEROID_SPEED,
+        'spawn_rate': ASTEROID_SPAWN_RATE,  # simulation steps between spawns
+        'min_spawn_rate': 20,
+        'spawn_count': 1,  # asteroids per spawn
+        'min_size': ASTEROID_MIN_SIZE,
+        'max_size': ASTEROID_MAX_SIZE,
+    },
+    'swarm': {
+        'speed': 1.5,
+        'spawn_rate': 4,
+        'min_spawn_rate': 2,
+        'spawn_count': 3,
+        'min_size': 20,
+        'max_size': 35,
+    },
+}
+
+# Broad-phase collision grid
+SPATIAL_GRID_CELL_SIZE = 128  # pixels
+
+# Initial slots in the asteroid arrays (doubles when full)
+ASTEROID_FIELD_CAPACITY = 256
+
+# Asteroid sprites
+ASTEROID_SPIN_RANGE = (-2.0, 2.0)  # degrees per simulation step
+ROTATION_BUCKETS = 8  # pre-rendered rotation frames per turn
+SPRITE_CACHE_SIZE = 512  # max (radius, rotation) sprites kept
+
 # Lives system
 ENABLE_LIVES = True
 INITIAL_LIVES = 3
@@ -74,11 +184,14 @@ PARTICLE_COLORS = [(255, 200, 0), (255, 150, 0), (255, 100, 0), (200, 50, 0)]
 FONT_SIZE_SCORE = 48
 FONT_SIZE_NORMAL = 36
 FONT_SIZE_SMALL = 24
+TEXT_CACHE_SIZE = 256  # rendered strings kept by the UI renderer
 
 # Particle effects
 PARTICLE_COUNT = 15
-PARTICLE_LIFETIME = 30  # frames
+PARTICLE_LIFETIME = 30  # simulation steps
 PARTICLE_SPEED_RANGE = (2, 6)
+PARTICLE_POOL_CAPACITY = 2048  # max live particles; oldest are recycled first
+PARTICLE_ALPHA_STEPS = 16  # fade levels pre-rendered in the particle atlas
 
 # Cursor settings
 CURSOR_RADIUS = 30
@@ -1,26 +1,47 @@
 """
 Coordinate mapping between camera space and screen space.
 """
+import json
+import math
+import os
+import cv2
+import numpy as np
 import config
 from utils import clamp
 
+# Smallest homography divisor; points on or past the horizon line of a
+# degenerate calibration are pushed out to the screen edge instead of
+# dividing by zero
+_MIN_W = 1e-6
+
 
 class CoordinateMapper:
     """Maps coordinates from camera view to screen coordinates."""
     
-    def __init__(self, screen_width=None, screen_height=None):
+    def __init__(self, screen_width=None, screen_height=None, mirror=None):
         """Initialize coordinate mapper.
         
         Args:
             screen_width: Width of the game screen
             screen_height: Height of the game screen
+            mirror: Flip X for a mirror effect (default from config.MIRROR_VIEW)
         """
         self.screen_width = screen_width or config.SCREEN_WIDTH
         self.screen_height = screen_height or config.SCREEN_HEIGHT
         
-        # Calibration points (for future calibration feature)
+        # Mirroring is applied to the mapped point instead of flipping each frame
+        self.mirror = config.MIRROR_VIEW if mirror is None else mirror
+        
+        # Homography from normalized camera coordinates to screen pixels.
+        # Its coefficients are unpacked into floats so mapping a point
+        # doesn't allocate any arrays.
         self.calibrated = False
         self.calibration_matrix = None
+        self._h = None
+        self._h_inv = None
+        
+        if config.CALIBRATION_FILE and os.path.exists(config.CALIBRATION_FILE):
+            self.load_calibration(config.CALIBRATION_FILE)
     
     def map_to_screen(self, normalized_x, normalized_y):
         """Convert normalized camera coordinates (0-1) to screen pixel coordinates.
@@ -32,12 +53,24 @@ class CoordinateMapper:
         Returns:
             Tuple (screen_x, screen_y) in pixels
         """
-        # MediaPipe returns normalized coordinates where (0,0) is top-left
-        # and (1,1) is bottom-right, same as screen coordinates
-        
-        # Simple proportional scaling
-        screen_x = int(normalized_x * self.screen_width)
-        screen_y = int(normalized_y * self.screen_height)
+        if self.calibrated:
+            # Projective transform (calibration orders the corners in the
+            # mirrored view when mirroring, so the homography includes it)
+            h0, h1, h2, h3, h4, h5, h6, h7, h8 = self._h
+            w = h6 * normalized_x + h7 * normalized_y + h8
+            if abs(w) < _MIN_W:
+                w = math.copysign(_MIN_W, w)
+            screen_x = int((h0 * normalized_x + h1 * normalized_y + h2) / w)
+            screen_y = int((h3 * normalized_x + h4 * normalized_y + h5) / w)
+        else:
+            # MediaPipe returns normalized coordinates where (0,0) is top-left
+            # and (1,1) is bottom-right, same as screen coordinates
+            if self.mirror:
+                normalized_x = 1.0 - normalized_x
+            
+            # Simple proportional scaling
+            screen_x = int(normalized_x * self.screen_width)
+            screen_y = int(normalized_y * self.screen_height)
         
         # Clamp to screen bounds
         screen_x = clamp(screen_x, 0, self.screen_width - 1)
@@ -55,18 +88,180 @@ class CoordinateMapper:
         Returns:
             Tuple (normalized_x, normalized_y) in range 0-1
         """
+        if self.calibrated:
+            h0, h1, h2, h3, h4, h5, h6, h7, h8 = self._h_inv
+            w = h6 * screen_x + h7 * screen_y + h8
+            if abs(w) < _MIN_W:
+                w = math.copysign(_MIN_W, w)
+            normalized_x = (h0 * screen_x + h1 * screen_y + h2) / w
+            normalized_y = (h3 * screen_x + h4 * screen_y + h5) / w
+            return (normalized_x, normalized_y)
+        
         normalized_x = screen_x / self.screen_width
         normalized_y = screen_y / self.screen_height
+        if self.mirror:
+            normalized_x = 1.0 - normalized_x
         
         return (normalized_x, normalized_y)
     
+    def map_to_screen_batch(self, points):
+        """Convert many normalized camera points to screen pixels at once.
+        
+        Gives exactly the same result as calling map_to_screen on each point.
+        
+        Args:
+            points: Array-like of shape (N, 2) with normalized (x, y) coordinates
+        
+        Returns:
+            int64 array of shape (N, 2) with screen (x, y) pixels
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x = points[:, 0]
+        y = points[:, 1]
+        
+        if self.calibrated:
+            h0, h1, h2, h3, h4, h5, h6, h7, h8 = self._h
+            w = h6 * x + h7 * y + h8
+            w = np.where(np.abs(w) < _MIN_W, np.copysign(_MIN_W, w), w)
+            screen_x = (h0 * x + h1 * y + h2) / w
+            screen_y = (h3 * x + h4 * y + h5) / w
+        else:
+            if self.mirror:
+                x = 1.0 - x
+            screen_x = x * self.screen_width
+            screen_y = y * self.screen_height
+        
+        # astype truncates toward zero, like int()
+        screen = np.empty((len(points), 2), dtype=np.int64)
+        screen[:, 0] = screen_x.astype(np.int64)
+        screen[:, 1] = screen_y.astype(np.int64)
+        
+        # Clamp to screen bounds
+        np.clip(screen[:, 0], 0, self.screen_width - 1, out=screen[:, 0])
+        np.clip(screen[:, 1], 0, self.screen_height - 1, out=screen[:, 1])
+        
+        return screen
+    
+    def inverse_map_batch(self, points):
+        """Convert many screen points back to normalized camera coordinates.
+        
+        Gives exactly the same result as calling inverse_map on each point.
+        
+        Args:
+            points: Array-like of shape (N, 2) with screen (x, y) pixels
+        
+        Returns:
+            float64 array of shape (N, 2) with normalized (x, y) coordinates
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        x = points[:, 0]
+        y = points[:, 1]
+        normalized = np.empty_like(points)
+        
+        if self.calibrated:
+            h0, h1, h2, h3, h4, h5, h6, h7, h8 = self._h_inv
+            w = h6 * x + h7 * y + h8
+            w = np.where(np.abs(w) < _MIN_W, np.copysign(_MIN_W, w), w)
+            normalized[:, 0] = (h0 * x + h1 * y + h2) / w
+            normalized[:, 1] = (h3 * x + h4 * y + h5) / w
+            return normalized
+        
+        normalized[:, 0] = x / self.screen_width
+        normalized[:, 1] = y / self.screen_height
+        if self.mirror:
+            normalized[:, 0] = 1.0 - normalized[:, 0]
+        
+        return normalized
+    
     def calibrate(self, corner_points):
-        """Calibrate using detected corner points (future feature).
+        """Calibrate from matching camera and screen points.
         
         Args:
-            corner_points: List of (camera_x, camera_y, screen_x, screen_y) tuples
+            corner_points: List of at least four (camera_x, camera_y, screen_x, screen_y)
+                           tuples, with camera coordinates normalized (0-1) and
+                           screen coordinates in pixels
+        
+        Returns:
+            True if a homography could be computed, False otherwise
         """
-        # Placeholder for future calibration implementation
-        # Could use perspective transform or homography
+        points = np.asarray(corner_points, dtype=np.float32)
+        if len(points) < 4:
+            return False
+        
+        camera_points = np.ascontiguousarray(points[:, :2])
+        screen_points = np.ascontiguousarray(points[:, 2:])
+        if len(points) == 4:
+            matrix = cv2.getPerspectiveTransform(camera_points, screen_points)
+        else:
+            matrix, _ = cv2.findHomography(camera_points, screen_points, cv2.RANSAC)
+        
+        # Degenerate (e.g. collinear) points give no usable homography
+        if matrix is None or abs(np.linalg.det(matrix)) < 1e-12:
+            return False
+        
+        self.set_matrix(matrix)
+        return True
+    
+    def set_matrix(self, matrix):
+        """Install a homography and precompute its coefficients.
+        
+        Args:
+            matrix: 3x3 homography from normalized camera to screen pixels
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        self.calibration_matrix = matrix
+        self._h = tuple(float(v) for v in matrix.ravel())
+        self._h_inv = tuple(float(v) for v in np.linalg.inv(matrix).ravel())
         self.calibrated = True
-        pass
+    
+    def save_calibration(self, path=None):
+        """Save the current calibration to a JSON file.
+        
+        Args:
+            path: File to write (default config.CALIBRATION_FILE)
+        """
+        if not self.calibrated:
+            return
+        
+        path = path or config.CALIBRATION_FILE
+        data = {
+            'screen_width': self.screen_width,
+            'screen_height': self.screen_height,
+            'homography': self.calibration_matrix.tolist(),
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"Calibration saved to {path}")
+    
+    def load_calibration(self, path=None):
+        """Load a calibration saved by save_calibration.
+        
+        The homography is rescaled if the screen size has changed.
+        
+        Args:
+            path: File to read (default config.CALIBRATION_FILE)
+        
+        Returns:
+            True if a calibration was loaded, False otherwise
+        """
+        path = path or config.CALIBRATION_FILE
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            matrix = np.array(data['homography'], dtype=np.float64).reshape(3, 3)
+            scale = np.diag([self.screen_width / data['screen_width'],
+                             self.screen_height / data['screen_height'], 1.0])
+        except (OSError, ValueError, KeyError) as exc:
+            print(f"Could not load calibration from {path}: {exc}")
+            return False
+        
+        self.set_matrix(scale @ matrix)
+        print(f"Calibration loaded from {path}")
+        return True
+    
+    def reset_calibration(self):
+        """Go back to simple proportional mapping."""
+        self.calibrated = False
+        self.calibration_matrix = None
+        self._h = None
+        self._h_inv = None
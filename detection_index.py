@@ -0,0 +1,251 @@
+"""
+Precomputed detections for recorded sessions.
+
+A recording saves what the detector produced for every frame the game
+processed next to the frames:
+    detection_frames.npy - per frame: the camera read it came from, tracker
+                           output position, tracked box, confidence, which
+                           path produced it, and the slice of
+                           detection_boxes.npy holding its raw detections
+    detection_boxes.npy  - every raw network detection (box, confidence, class)
+Both are plain .npy files and are memory-mapped on load. ReplayTracker then
+serves those results in place of the detector without running inference,
+which is what makes a replay exact: the frames are stored as JPEG, so running
+the detector on them again can give slightly different positions.
+
+build_detection_index() rebuilds the index by running ObjectTracker over the
+recorded frames, e.g. after changing tracker settings.
+
+Usage:
+    python detection_index.py session1
+"""
+import argparse
+import json
+import os
+import numpy as np
+import config
+from object_tracker import ObjectTracker
+from recording import ReplaySource, _replace
+
+FRAMES_FILE = "detection_frames.npy"
+BOXES_FILE = "detection_boxes.npy"
+
+FRAME_DTYPE = np.dtype([
+    ('read', np.int64),  # Index of the camera read (row of index.npy) the frame came from
+    ('first', np.int64),  # Index of the frame's first row in detection_boxes.npy
+    ('count', np.int32),  # Number of raw detections
+    ('x', np.float64),  # Normalized tracker output (NaN = no ball)
+    ('y', np.float64),
+    ('bbox', np.int32, (4,)),  # Tracked box (x, y, w, h)
+    ('confidence', np.float64),
+    ('source', np.int8),  # Index into SOURCES
+])
+BOX_DTYPE = np.dtype([
+    ('bbox', np.int32, (4,)),  # (x1, y1, x2, y2) in frame pixels
+    ('confidence', np.float64),
+    ('class_id', np.int16),
+])
+
+# Values of ObjectTracker.last_source, in the order stored in 'source'
+SOURCES = (None, 'detect', 'track')
+
+
+def detection_settings():
+    """Get the config values that change what ObjectTracker outputs.
+    
+    Returns:
+        Dictionary of setting name to value
+    """
+    return {
+        'tracking_mode': 'detect' if config.MULTI_BALL else config.TRACKING_MODE,
+        'detection_interval': config.DETECTION_INTERVAL,
+        'confidence_threshold': config.CONFIDENCE_THRESHOLD,
+        'target_class': config.TARGET_CLASS_ID,
+        'input_size': config.DETECTION_INPUT_SIZE,
+        'use_roi': config.USE_ROI_SEARCH and not config.MULTI_BALL,
+        'color_filter': config.BALL_COLOR if config.USE_COLOR_FILTER else None,
+    }
+
+
+class DetectionLog:
+    """Collects a detector's output frame by frame in the index format."""
+    
+    def __init__(self):
+        """Start an empty log."""
+        self.frames = []
+        self.boxes = []
+    
+    def add(self, detector, position, read):
+        """Log the detector's output for one frame.
+        
+        Args:
+            detector: Detector that just processed the frame
+            position: What its process_frame returned (None in multi-ball
+                      mode, where only the raw detections are used)
+            read: Index of the camera read the frame came from
+        """
+        detections = detector.detections
+        if position is None:
+            x, y = np.nan, np.nan
+            bbox = (0, 0, 0, 0)
+        else:
+            x, y = position
+            bbox = getattr(detector, 'bbox', None) or (0, 0, 0, 0)
+        self.frames.append((read, len(self.boxes), len(detections), x, y, bbox,
+                            getattr(detector, 'confidence', 0.0),
+                            SOURCES.index(getattr(detector, 'last_source', None))))
+        self.boxes.extend((det['bbox'], det['confidence'], det['class_id'] or 0)
+                          for det in detections)
+    
+    def save(self, path):
+        """Write the index files.
+        
+        Args:
+            path: Recording directory
+        """
+        frames = np.array(self.frames, dtype=FRAME_DTYPE)
+        boxes = np.array(self.boxes, dtype=BOX_DTYPE)
+        _replace(os.path.join(path, FRAMES_FILE), lambda f: np.save(f, frames))
+        _replace(os.path.join(path, BOXES_FILE), lambda f: np.save(f, boxes))
+
+
+def build_detection_index(path, tracker=None):
+    """Run the tracker over the recorded frames and save the results.
+    
+    Only the camera reads the game ran detection on are processed (it skips
+    detection while calibrating, for example). Those come from the index the
+    recording saved; without one, every frame after the detector was chosen
+    is processed.
+    
+    Args:
+        path: Recording directory
+        tracker: ObjectTracker to run (default: a new one from config)
+    
+    Returns:
+        Number of frames indexed
+    """
+    tracker = tracker or ObjectTracker()
+    source = ReplaySource(path)
+    log = DetectionLog()
+    
+    if has_detection_index(path):
+        reads = np.load(os.path.join(path, FRAMES_FILE))['read'].tolist()
+    else:
+        # Frames read while the game chose a detector never reach it, and
+        # neither do failed reads
+        reads = [read for read in range(source.meta['startup_reads'], len(source.index))
+                 if source.index[read]['size']]
+    
+    for read in reads:
+        while source.position <= read:
+            ret, frame = source.read()
+        if not ret:
+            print(f"Warning: camera read {read} has no frame")
+            continue
+        
+        log.add(tracker, tracker.process_frame(frame), read)
+        if len(log.frames) % 500 == 0:
+            print(f"Indexed {len(log.frames)} frames...")
+    
+    source.release()
+    log.save(path)
+    
+    # Remember the settings the index was built with
+    meta_path = os.path.join(path, "meta.json")
+    with open(meta_path) as f:
+        meta = json.load(f)
+    meta['detections'] = detection_settings()
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    
+    return len(log.frames)
+
+
+def has_detection_index(path):
+    """Check whether a recording has a detection index."""
+    return os.path.exists(os.path.join(path, FRAMES_FILE))
+
+
+class ReplayTracker(ObjectTracker):
+    """Serves a recording's precomputed detections in place of ObjectTracker.
+    
+    Frames must be passed to process_frame in recorded order, one call per
+    frame, as a replay with synchronous capture does.
+    """
+    
+    name = 'replay'
+    
+    def __init__(self, path):
+        """Load a detection index.
+        
+        Args:
+            path: Recording directory with a detection index
+        """
+        super().__init__(use_ml=False)
+        self.frames = np.load(os.path.join(path, FRAMES_FILE), mmap_mode="r")
+        self.boxes = np.load(os.path.join(path, BOXES_FILE), mmap_mode="r")
+        self.position_index = 0  # Next frame to serve
+        
+        with open(os.path.join(path, "meta.json")) as f:
+            settings = json.load(f).get('detections')
+        if settings != detection_settings():
+            print("Warning: detection index was built with different tracker settings")
+    
+    def process_frame(self, frame):
+        """Get the stored tracker output for the next frame.
+        
+        Args:
+            frame: BGR image (unused; the result comes from the index)
+        
+        Returns:
+            Tuple (x, y) in normalized coordinates (0-1), or None if not detected
+        """
+        if self.position_index >= len(self.frames):
+            self.detections = []
+            self.position = None
+            self.bbox = None
+            self.last_source = None
+            return None
+        
+        record = self.frames[self.position_index]
+        self.position_index += 1
+        
+        first = int(record['first'])
+        rows = self.boxes[first:first + int(record['count'])]
+        self.detections = [
+            {'class_id': class_id, 'confidence': confidence, 'bbox': tuple(bbox)}
+            for bbox, confidence, class_id in zip(rows['bbox'].tolist(),
+                                                  rows['confidence'].tolist(),
+                                                  rows['class_id'].tolist())
+        ]
+        self.last_source = SOURCES[record['source']]
+        self.confidence = float(record['confidence'])
+        
+        if np.isnan(record['x']):
+            self.position = None
+            self.bbox = None
+            return None
+        
+        # Rebuild the pixel position for the debug view
+        x, y, w, h = record['bbox'].tolist()
+        self.bbox = (x, y, w, h)
+        self.position = (x + w // 2, y + h // 2)
+        return (float(record['x']), float(record['y']))
+    
+    def close(self):
+        """Cleanup resources."""
+        print(f"Replay tracker: served {self.position_index} of {len(self.frames)} indexed frames")
+
+
+def main():
+    """Build the detection index for a recording."""
+    parser = argparse.ArgumentParser(description="Precompute detections for a recording")
+    parser.add_argument("recording", help="Recording directory (from asteroid_game.py --record)")
+    args = parser.parse_args()
+    
+    count = build_detection_index(args.recording)
+    print(f"Indexed {count} frames in {args.recording}")
+
+
+if __name__ == "__main__":
+    main()
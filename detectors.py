@@ -0,0 +1,311 @@
+"""
+Detector backends behind one interface, with a registry and auto-selection.
+
+Every backend subclasses Detector: detect(frame) returns the frame's
+candidates as Detection tuples (best first), and process_frame(frame)
+returns the best normalized position, which is what the game consumes.
+Backends live next to the code they wrap and are imported lazily, so a
+missing optional package (onnxruntime, mediapipe) only disables its backend.
+"""
+import copy
+import importlib
+import importlib.util
+import os
+import time
+from abc import ABC, abstractmethod
+from collections import namedtuple
+import cv2
+import numpy as np
+import config
+
+# One detected target: normalized (x, y) center, confidence 0-1, and the
+# (x1, y1, x2, y2) box in frame pixels (None if the backend has no box)
+Detection = namedtuple('Detection', ['position', 'confidence', 'bbox'])
+
+# Backend name -> (module, class name, required packages)
+DETECTORS = {}
+
+
+def register_detector(name, module, class_name, requires=()):
+    """Register a detector backend.
+    
+    Args:
+        name: Backend name used in config.DETECTOR
+        module: Module that defines the backend class
+        class_name: Name of a Detector subclass in that module
+        requires: Packages that must be installed to use the backend
+    """
+    DETECTORS[name] = (module, class_name, tuple(requires))
+
+
+register_detector('opencv-ssd', 'object_tracker', 'ObjectTracker')
+register_detector('onnx', 'object_tracker', 'OnnxObjectTracker', requires=('onnxruntime',))
+register_detector('hsv-color', 'color_tracker', 'ColorTracker')
+register_detector('mediapipe-hand', 'hand_tracker', 'HandDetector', requires=('mediapipe',))
+
+
+class Detector(ABC):
+    """Base class for detector backends.
+    
+    Subclasses implement detect(). Backends with their own per-frame state
+    (like ObjectTracker's detect-then-track loop) may override process_frame
+    instead and build detect() on top of it.
+    """
+    
+    name = None  # Registry name, set by get_detector_class
+    
+    @classmethod
+    def model_files(cls):
+        """Get the files this backend needs on disk.
+        
+        Returns:
+            List of file paths
+        """
+        return []
+    
+    @abstractmethod
+    def detect(self, frame):
+        """Find targets in a frame.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            List of Detection, best first
+        """
+    
+    def process_frame(self, frame):
+        """Detect targets and keep them for the debug view and multi-ball tracking.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            Tuple (x, y) in normalized coordinates (0-1), or None if not detected
+        """
+        found = self.detect(frame)
+        self.last_detections = found
+        self.detections = [
+            {'class_id': None, 'confidence': detection.confidence, 'bbox': detection.bbox}
+            for detection in found if detection.bbox is not None
+        ]
+        return found[0].position if found else None
+    
+    def debug_snapshot(self):
+        """Copy the state get_debug_image draws from.
+        
+        With async detection the worker takes a snapshot after every frame,
+        so the render loop can draw it while the detector is already busy
+        with the next one. Backends replace their per-frame attributes
+        instead of mutating them, so a shallow copy is enough.
+        
+        Returns:
+            Copy of this detector to call get_debug_image on
+        """
+        return copy.copy(self)
+    
+    def get_debug_image(self, frame, mirror=False):
+        """Get a debug image showing the last frame's detections.
+        
+        Args:
+            frame: Original BGR frame
+            mirror: Flip the image and overlays horizontally
+        
+        Returns:
+            Debug visualization image
+        """
+        height, width = frame.shape[:2]
+        debug_frame = cv2.flip(frame, 1) if mirror else frame.copy()
+        
+        for index, detection in enumerate(getattr(self, 'last_detections', [])):
+            color = (0, 255, 0) if index == 0 else (0, 255, 255)
+            if detection.bbox is not None:
+                x1, y1, x2, y2 = detection.bbox
+                if mirror:
+                    x1, x2 = width - x2, width - x1
+                cv2.rectangle(debug_frame, (x1, y1), (x2, y2), color, 2 if index == 0 else 1)
+            
+            x, y = detection.position
+            cx = int((1 - x if mirror else x) * width)
+            cv2.circle(debug_frame, (cx, int(y * height)), 8, color, -1)
+            cv2.putText(debug_frame, f"{detection.confidence:.2f}", (cx + 12, int(y * height)),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+        
+        cv2.putText(debug_frame, f"Detector: {self.name}", (10, 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        return debug_frame
+    
+    def close(self):
+        """Cleanup resources."""
+        pass
+
+
+def get_detector_class(name):
+    """Import a registered backend class.
+    
+    Args:
+        name: Backend name
+    
+    Returns:
+        Detector subclass
+    """
+    if name not in DETECTORS:
+        raise ValueError(f"Unknown detector '{name}' (choose from {', '.join(DETECTORS)} or auto)")
+    module, class_name, _ = DETECTORS[name]
+    cls = getattr(importlib.import_module(module), class_name)
+    cls.name = name
+    return cls
+
+
+def is_available(name):
+    """Check whether a backend's packages and model files are installed.
+    
+    Args:
+        name: Backend name
+    
+    Returns:
+        True if the backend can be created
+    """
+    _, _, requires = DETECTORS[name]
+    if any(importlib.util.find_spec(package) is None for package in requires):
+        return False
+    return all(os.path.exists(path) for path in get_detector_class(name).model_files())
+
+
+def available_detectors():
+    """Get the names of all backends that can run here.
+    
+    Returns:
+        List of backend names, in registration order
+    """
+    return [name for name in DETECTORS if is_available(name)]
+
+
+def create_detector(name=None, frames=None):
+    """Create a detector backend.
+    
+    Args:
+        name: Backend name or 'auto' (default config.DETECTOR)
+        frames: Startup frames to benchmark on when name is 'auto'
+    
+    Returns:
+        Detector instance
+    """
+    name = name or config.DETECTOR
+    if name == 'auto':
+        return select_detector(frames or [])
+    return get_detector_class(name)()
+
+
+def _agreement(positions, reference):
+    """Fraction of frames where a backend agrees with the reference.
+    
+    Only frames where at least one of the two sees a target count, so
+    frames with nothing in view can't make a backend look accurate. A frame
+    agrees when both see a target within config.AUTO_DETECTOR_TOLERANCE.
+    
+    Args:
+        positions: Per-frame positions (or None) from the backend
+        reference: Per-frame positions (or None) from the reference backend
+    
+    Returns:
+        Agreement fraction 0-1 (0 if neither ever sees a target)
+    """
+    counted = 0
+    agree = 0
+    for position, expected in zip(positions, reference):
+        if position is None and expected is None:
+            continue
+        counted += 1
+        if position is not None and expected is not None:
+            agree += np.hypot(position[0] - expected[0],
+                              position[1] - expected[1]) <= config.AUTO_DETECTOR_TOLERANCE
+    return agree / counted if counted else 0.0
+
+
+def benchmark_detectors(frames, names=None):
+    """Run backends over the same frames and time them.
+    
+    Args:
+        frames: List of BGR images
+        names: Backends to try (default: every available one)
+    
+    Returns:
+        Dictionary mapping name to {'detector', 'ms', 'positions'}; backends
+        that fail to start are left out
+    """
+    names = names if names is not None else available_detectors()
+    results = {}
+    for name in names:
+        try:
+            detector = create_detector(name)
+        except Exception as e:
+            print(f"Detector {name} failed to start: {e}")
+            continue
+        
+        # The first frame pays for lazy initialization, so it isn't timed
+        times = []
+        positions = []
+        for index, frame in enumerate(frames):
+            start = time.perf_counter()
+            positions.append(detector.process_frame(frame))
+            if index:
+                times.append(time.perf_counter() - start)
+        results[name] = {'detector': detector,
+                         'ms': float(np.median(times)) * 1000 if times else 0.0,
+                         'positions': positions}
+    return results
+
+
+def select_detector(frames):
+    """Pick the fastest backend that meets the accuracy floor.
+    
+    The reference backend (config.AUTO_DETECTOR_REFERENCE, or the first
+    available one) runs first. Startup frames have no ground truth, so the
+    others are scored by agreement with it, which is only meaningful when it
+    saw a target in at least config.AUTO_DETECTOR_MIN_TARGET_FRAMES frames.
+    Otherwise the reference is used without trying the others.
+    
+    Args:
+        frames: Startup frames to benchmark on
+    
+    Returns:
+        Detector instance
+    """
+    available = available_detectors()
+    preferred = config.AUTO_DETECTOR_REFERENCE
+    if preferred in available:
+        available.remove(preferred)
+        available.insert(0, preferred)
+    
+    # The first backend that starts is the reference
+    results = {}
+    while available and not results:
+        results = benchmark_detectors(frames, [available.pop(0)])
+    if not results:
+        raise RuntimeError("No detector backend is available")
+    reference_name, reference = next(iter(results.items()))
+    
+    targets = sum(position is not None for position in reference['positions'])
+    if targets < config.AUTO_DETECTOR_MIN_TARGET_FRAMES:
+        print(f"Target seen in {targets} of {len(frames)} startup frames, "
+              f"too few to compare detectors; using {reference_name}")
+        return reference['detector']
+    
+    results.update(benchmark_detectors(frames, available))
+    for result in results.values():
+        result['accuracy'] = _agreement(result['positions'], reference['positions'])
+    
+    print(f"Detector benchmark on {len(frames)} frames ({targets} with a target):")
+    for name, result in results.items():
+        print(f"  {name}: {result['ms']:.1f} ms, {result['accuracy']:.0%} agreement")
+    
+    qualified = [name for name, result in results.items()
+                 if result['accuracy'] >= config.AUTO_DETECTOR_MIN_ACCURACY]
+    chosen = min(qualified, key=lambda name: results[name]['ms'])
+    print(f"Using detector: {chosen}")
+    
+    for name, result in results.items():
+        if name != chosen:
+            result['detector'].close()
+    return results[chosen]['detector']
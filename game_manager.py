@@ -2,22 +2,33 @@
 Game manager handles game logic and state.
 """
 import random
+import numpy as np
 import config
-from game_objects import Asteroid, Particle
+from asteroid_field import AsteroidField
+from particle_pool import ParticlePool
+from utils import segment_circle_impact
+from spatial_grid import SpatialHashGrid
 
 
 class GameManager:
     """Manages the game state, asteroids, scoring, and difficulty."""
     
-    def __init__(self, screen_width, screen_height):
+    def __init__(self, screen_width, screen_height, difficulty=None, seed=None):
         """Initialize game manager.
         
         Args:
             screen_width: Width of the game screen
             screen_height: Height of the game screen
+            difficulty: Name of a config.DIFFICULTY_LEVELS preset (default config.DIFFICULTY)
+            seed: Seed for asteroid and particle randomness (None = unseeded)
         """
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.difficulty = difficulty or config.DIFFICULTY
+        self.level = config.DIFFICULTY_LEVELS[self.difficulty]
+        
+        # Own random generators so a seeded game is reproducible
+        self.rng = random.Random(seed)
         
         # Game state
         self.score = 0
@@ -25,12 +36,18 @@ class GameManager:
         self.game_over = False
         
         # Asteroids and effects
-        self.asteroids = []
-        self.particles = []
+        self.asteroids = AsteroidField()
+        self.particles = ParticlePool(rng=np.random.default_rng(seed))
+        
+        # Broad phase: asteroids are stored in the grid by ID
+        self.grid = SpatialHashGrid()
+        
+        # Cursor positions from the previous frame, for swept collisions
+        self.previous_cursors = {}
         
         # Difficulty settings
-        self.asteroid_speed = config.INITIAL_ASTEROID_SPEED
-        self.spawn_rate = config.ASTEROID_SPAWN_RATE
+        self.asteroid_speed = self.level['speed']
+        self.spawn_rate = self.level['spawn_rate']
         self.frames_since_spawn = 0
         
         # Difficulty scaling
@@ -38,62 +55,149 @@ class GameManager:
     
     def spawn_asteroid(self):
         """Spawn a new asteroid at a random position."""
-        x = random.randint(config.ASTEROID_MAX_SIZE, 
-                          self.screen_width - config.ASTEROID_MAX_SIZE)
-        y = -config.ASTEROID_MAX_SIZE
-        radius = random.randint(config.ASTEROID_MIN_SIZE, config.ASTEROID_MAX_SIZE)
-        speed = self.asteroid_speed + random.uniform(-0.5, 0.5)
-        
-        asteroid = Asteroid(x, y, radius, speed)
-        self.asteroids.append(asteroid)
+        min_size = self.level['min_size']
+        max_size = self.level['max_size']
+        x = self.rng.randint(max_size, 
+                          self.screen_width - max_size)
+        y = -max_size
+        radius = self.rng.randint(min_size, max_size)
+        speed = self.asteroid_speed + self.rng.uniform(-0.5, 0.5)
+        spin = self.rng.uniform(*config.ASTEROID_SPIN_RANGE)
+        
+        asteroid_id = self.asteroids.spawn(x, y, radius, speed, spin)
+        self.grid.insert(asteroid_id, x, y, radius)
     
     def update_asteroids(self):
         """Update all asteroids and remove off-screen ones."""
-        for asteroid in self.asteroids[:]:
-            asteroid.update()
-            
-            # Check if asteroid is off screen (missed)
-            if asteroid.is_off_screen(self.screen_height):
-                self.asteroids.remove(asteroid)
-                if config.ENABLE_LIVES and asteroid.alive:
-                    self.lives -= 1
-                    if self.lives <= 0:
-                        self.game_over = True
+        field = self.asteroids
+        
+        # Centers as they were before the move, i.e. where the grid last put them
+        prev_ids = field.ids[:len(field)].copy()
+        prev_y = field.y[:len(field)].copy()
+        removed_ids, missed = field.update(self.screen_height)
+        
+        for asteroid_id in removed_ids.tolist():
+            self.grid.remove(asteroid_id)
+        
+        # Check if asteroids went off screen (missed)
+        if config.ENABLE_LIVES and missed:
+            self.lives -= missed
+            if self.lives <= 0:
+                self.game_over = True
+        
+        # Only re-buckets asteroids that crossed into new cells. The field
+        # keeps survivors in order, so dropping removed IDs lines them up.
+        if len(removed_ids):
+            prev_y = prev_y[~np.isin(prev_ids, removed_ids, assume_unique=True)]
+        n = len(field)
+        x = field.x[:n]
+        self.grid.move_batch(field.ids[:n], x, field.y[:n], field.radius[:n], x, prev_y)
     
     def update_particles(self):
-        """Update all particles and remove dead ones."""
-        for particle in self.particles[:]:
-            particle.update()
-            if not particle.is_alive():
-                self.particles.remove(particle)
+        """Update all particles; expired slots are recycled by the pool."""
+        self.particles.update()
+    
+    @staticmethod
+    def _normalize_cursors(finger_position):
+        """Turn any accepted cursor argument into a dict of positions.
+        
+        Args:
+            finger_position: Tuple (x, y), None, a list of (x, y) tuples, or a
+                             dict mapping cursor ID to (x, y)
+        
+        Returns:
+            Dict mapping cursor ID to (x, y), without missing cursors
+        """
+        if finger_position is None:
+            return {}
+        if isinstance(finger_position, dict):
+            cursors = finger_position
+        elif isinstance(finger_position, list):
+            cursors = dict(enumerate(finger_position))
+        else:
+            cursors = {0: finger_position}
+        return {cursor_id: pos for cursor_id, pos in cursors.items() if pos is not None}
     
     def check_collisions(self, finger_position):
-        """Check for collisions between finger and asteroids.
+        """Check for collisions between the cursors and asteroids.
+        
+        Each cursor is swept from its previous position to the current one,
+        so a fast ball can't pass through an asteroid between two
+        detections. Asteroids are first narrowed down with the spatial grid
+        and the segment's bounding box, then tested exactly. Explosions spawn
+        where the ball crossed the asteroid's edge.
         
         Args:
-            finger_position: Tuple (x, y) of finger position, or None
+            finger_position: Tuple (x, y) of finger position, or None. Also
+                             accepts a list of positions or a dict mapping
+                             cursor ID to position for several balls.
         
         Returns:
             Number of asteroids destroyed this frame
         """
-        if finger_position is None:
+        cursors = self._normalize_cursors(finger_position)
+        previous_cursors = self.previous_cursors
+        # Cursors that disappear start a fresh sweep when they come back
+        self.previous_cursors = dict(cursors)
+        if not cursors or not self.asteroids:
             return 0
         
-        destroyed_count = 0
-        for asteroid in self.asteroids[:]:
-            if asteroid.check_collision(finger_position):
-                # Destroy asteroid
-                asteroid.alive = False
-                self.asteroids.remove(asteroid)
-                
-                # Create explosion particles
-                self.create_explosion(asteroid.x, asteroid.y)
-                
-                # Increase score
-                self.score += 1
-                destroyed_count += 1
-        
-        return destroyed_count
+        max_radius = self.level['max_size']
+        impacts = {}  # asteroid ID -> (time of impact, impact point)
+        
+        for cursor_id, end in cursors.items():
+            start = previous_cursors.get(cursor_id, end)
+            x0, x1 = min(start[0], end[0]), max(start[0], end[0])
+            y0, y1 = min(start[1], end[1]), max(start[1], end[1])
+            
+            # Broad phase: grid cells near the swept segment
+            candidate_ids = self.grid.query_rect(x0 - max_radius, y0 - max_radius,
+                                                 x1 + max_radius, y1 + max_radius)
+            if not candidate_ids:
+                continue
+            
+            # Keep spawn order so results don't depend on set ordering
+            ids = np.array(sorted(candidate_ids), dtype=np.int64)
+            slots = self.asteroids.slots(ids)
+            circles = np.column_stack((self.asteroids.x[slots], self.asteroids.y[slots],
+                                       self.asteroids.radius[slots]))
+            
+            # Reject asteroids whose bounding box misses the segment's
+            radii = circles[:, 2]
+            overlap = ((circles[:, 0] + radii >= x0) & (circles[:, 0] - radii <= x1) &
+                       (circles[:, 1] + radii >= y0) & (circles[:, 1] - radii <= y1))
+            if not overlap.any():
+                continue
+            
+            # Exact capsule test on the survivors
+            rows = np.flatnonzero(overlap)
+            toi = segment_circle_impact(start, end, circles[rows, :2], radii[rows])
+            
+            dx = end[0] - start[0]
+            dy = end[1] - start[1]
+            for row, t in zip(rows.tolist(), toi.tolist()):
+                if t == np.inf:
+                    continue
+                asteroid_id = int(ids[row])
+                if asteroid_id not in impacts or t < impacts[asteroid_id][0]:
+                    impacts[asteroid_id] = (t, (start[0] + dx * t, start[1] + dy * t))
+        
+        if not impacts:
+            return 0
+        
+        for asteroid_id in sorted(impacts):
+            self.grid.remove(asteroid_id)
+            
+            # Create explosion particles where the ball hit
+            impact_x, impact_y = impacts[asteroid_id][1]
+            self.create_explosion(impact_x, impact_y)
+        
+        # Destroy all hit asteroids in one pass
+        self.asteroids.kill(np.array(sorted(impacts), dtype=np.int64))
+        
+        # Increase score
+        self.score += len(impacts)
+        return len(impacts)
     
     def create_explosion(self, x, y):
         """Create particle explosion at position.
@@ -102,9 +206,7 @@ class GameManager:
             x: X position
             y: Y position
         """
-        for _ in range(config.PARTICLE_COUNT):
-            particle = Particle(x, y)
-            self.particles.append(particle)
+        self.particles.spawn(x, y, config.PARTICLE_COUNT)
     
     def update_difficulty(self):
         """Increase difficulty based on score."""
@@ -112,14 +214,17 @@ class GameManager:
         
         if score_increase >= config.DIFFICULTY_INCREASE_INTERVAL:
             self.asteroid_speed *= config.SPEED_INCREASE_FACTOR
-            self.spawn_rate = max(20, self.spawn_rate - config.SPAWN_RATE_DECREASE)
+            self.spawn_rate = max(self.level['min_spawn_rate'],
+                                  self.spawn_rate - config.SPAWN_RATE_DECREASE)
             self.last_difficulty_increase = self.score
     
     def update(self, finger_position):
         """Update game state.
         
         Args:
-            finger_position: Tuple (x, y) of finger position, or None
+            finger_position: Tuple (x, y) of finger position, or None. Also
+                             accepts a list of positions or a dict mapping
+                             cursor ID to position for several balls.
         """
         if self.game_over:
             return
@@ -136,7 +241,8 @@ class GameManager:
         # Spawn new asteroids
         self.frames_since_spawn += 1
         if self.frames_since_spawn >= self.spawn_rate:
-            self.spawn_asteroid()
+            for _ in range(self.level['spawn_count']):
+                self.spawn_asteroid()
             self.frames_since_spawn = 0
         
         # Update difficulty
@@ -147,9 +253,11 @@ class GameManager:
         self.score = 0
         self.lives = config.INITIAL_LIVES if config.ENABLE_LIVES else 999
         self.game_over = False
-        self.asteroids = []
-        self.particles = []
-        self.asteroid_speed = config.INITIAL_ASTEROID_SPEED
-        self.spawn_rate = config.ASTEROID_SPAWN_RATE
+        self.asteroids.clear()
+        self.particles.clear()
+        self.grid.clear()
+        self.previous_cursors = {}
+        self.asteroid_speed = self.level['speed']
+        self.spawn_rate = self.level['spawn_rate']
         self.frames_since_spawn = 0
         self.last_difficulty_increase = 0
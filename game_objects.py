@@ -1,12 +1,11 @@
 """
-Game objects: Asteroids, Particles, and Finger Cursor.
+Game objects: asteroid sprites and the finger cursor.
 """
-import random
+import threading
+from collections import OrderedDict, deque
 import pygame
-import math
 import os
 import config
-from utils import distance
 
 # Cache for asteroid image
 _asteroid_image_cache = None
@@ -20,127 +19,146 @@ def get_asteroid_image():
     return _asteroid_image_cache
 
 
-class Asteroid:
-    """Represents a falling asteroid."""
+class SpriteCache:
+    """Bounded LRU cache of scaled and rotated asteroid sprites.
     
-    def __init__(self, x, y, radius, speed):
-        """Initialize an asteroid.
-        
-        Args:
-            x: X position
-            y: Y position
-            radius: Asteroid radius
-            speed: Falling speed (pixels per frame)
-        """
-        self.x = x
-        self.y = y
-        self.radius = radius
-        self.speed = speed
-        self.color = config.ASTEROID_COLOR
-        self.alive = True
-        
-        # Load and scale the asteroid image based on radius
-        original_image = get_asteroid_image()
-        size = radius * 2  # Diameter
-        self.image = pygame.transform.smoothscale(original_image, (size, size))
+    Sprites are keyed by (radius, rotation bucket), so an asteroid's spin is
+    quantized to config.ROTATION_BUCKETS frames. Safe to fill from a
+    background thread while the game reads from it.
+    """
     
-    def update(self):
-        """Move asteroid downward."""
-        self.y += self.speed
-    
-    def draw(self, surface):
-        """Draw the asteroid on a Pygame surface.
+    def __init__(self, max_size=None, rotation_buckets=None):
+        """Initialize the cache.
         
         Args:
-            surface: Pygame surface to draw on
+            max_size: Maximum number of sprites kept (default from config)
+            rotation_buckets: Rotation frames per full turn (default from config)
         """
-        if self.alive:
-            # Draw the asteroid image centered on the position
-            image_rect = self.image.get_rect(center=(int(self.x), int(self.y)))
-            surface.blit(self.image, image_rect)
+        self.max_size = max_size or config.SPRITE_CACHE_SIZE
+        self.rotation_buckets = rotation_buckets or config.ROTATION_BUCKETS
+        self.sprites = OrderedDict()  # (radius, bucket) -> surface
+        self.lock = threading.Lock()
+        self.prewarm_thread = None
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
     
-    def check_collision(self, point):
-        """Check if a point collides with this asteroid.
-        
-        Args:
-            point: Tuple (x, y) representing the point to test
-        
-        Returns:
-            True if collision detected, False otherwise
-        """
-        if not self.alive:
-            return False
-        
-        if point is None:
-            return False
-        
-        dist = distance(point, (self.x, self.y))
-        return dist <= self.radius
+    def _render(self, radius, bucket):
+        """Scale and rotate the source image for one cache entry."""
+        size = radius * 2  # Diameter
+        image = pygame.transform.smoothscale(get_asteroid_image(), (size, size))
+        if bucket:
+            image = pygame.transform.rotate(image, bucket * 360.0 / self.rotation_buckets)
+        return image
     
-    def is_off_screen(self, screen_height):
-        """Check if asteroid has fallen off the screen.
+    def get(self, radius, bucket=0):
+        """Get a sprite, rendering it on a miss.
         
         Args:
-            screen_height: Height of the screen
+            radius: Asteroid radius in pixels
+            bucket: Rotation bucket (0 to rotation_buckets - 1)
         
         Returns:
-            True if off screen, False otherwise
+            Pygame surface centered on the asteroid (rotated sprites are
+            slightly larger than 2 * radius)
         """
-        return self.y - self.radius > screen_height
-
-
-class Particle:
-    """Particle effect for explosions."""
+        key = (radius, bucket)
+        with self.lock:
+            sprite = self.sprites.get(key)
+            if sprite is not None:
+                self.sprites.move_to_end(key)
+                self.hits += 1
+                return sprite
+            self.misses += 1
+        
+        sprite = self._render(radius, bucket)
+        self._store(key, sprite)
+        return sprite
     
-    def __init__(self, x, y):
-        """Initialize a particle.
+    def _store(self, key, sprite):
+        """Insert a sprite, evicting the least recently used if full."""
+        with self.lock:
+            self.sprites[key] = sprite
+            self.sprites.move_to_end(key)
+            while len(self.sprites) > self.max_size:
+                self.sprites.popitem(last=False)
+                self.evictions += 1
+    
+    def prewarm(self, min_radius, max_radius):
+        """Render every sprite for a range of radii.
         
         Args:
-            x: Initial X position
-            y: Initial Y position
+            min_radius: Smallest radius (inclusive)
+            max_radius: Largest radius (inclusive)
         """
-        self.x = x
-        self.y = y
-        
-        # Random velocity
-        angle = random.uniform(0, 2 * math.pi)
-        speed = random.uniform(*config.PARTICLE_SPEED_RANGE)
-        self.vx = math.cos(angle) * speed
-        self.vy = math.sin(angle) * speed
-        
-        self.lifetime = config.PARTICLE_LIFETIME
-        self.max_lifetime = config.PARTICLE_LIFETIME
-        self.color = random.choice(config.PARTICLE_COLORS)
-        self.size = random.randint(2, 5)
-    
-    def update(self):
-        """Update particle position and lifetime."""
-        self.x += self.vx
-        self.y += self.vy
-        self.lifetime -= 1
+        for radius in range(min_radius, max_radius + 1):
+            for bucket in range(self.rotation_buckets):
+                key = (radius, bucket)
+                with self.lock:
+                    if key in self.sprites:
+                        continue
+                self._store(key, self._render(radius, bucket))
     
-    def draw(self, surface):
-        """Draw the particle.
+    def prewarm_async(self, min_radius, max_radius):
+        """Prewarm on a background thread (e.g. while the menu is shown).
         
         Args:
-            surface: Pygame surface to draw on
+            min_radius: Smallest radius (inclusive)
+            max_radius: Largest radius (inclusive)
         """
-        if self.lifetime > 0:
-            # Fade out based on lifetime
-            alpha = int(255 * (self.lifetime / self.max_lifetime))
-            # Create a surface with alpha for fading effect
-            temp_surface = pygame.Surface((self.size * 2, self.size * 2), pygame.SRCALPHA)
-            color_with_alpha = (*self.color, alpha)
-            pygame.draw.circle(temp_surface, color_with_alpha, (self.size, self.size), self.size)
-            surface.blit(temp_surface, (int(self.x) - self.size, int(self.y) - self.size))
+        # The source image must be converted on the main thread
+        get_asteroid_image()
+        self.prewarm_thread = threading.Thread(target=self.prewarm, args=(min_radius, max_radius),
+                                               name="SpritePrewarm", daemon=True)
+        self.prewarm_thread.start()
     
-    def is_alive(self):
-        """Check if particle is still alive.
+    def get_stats(self):
+        """Get cache statistics.
         
         Returns:
-            True if alive, False otherwise
+            Dictionary with hit, miss and eviction counts and the cache size
         """
-        return self.lifetime > 0
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self.sprites),
+        }
+
+
+# Shared cache for all asteroid sprites
+asteroid_sprites = SpriteCache()
+
+
+# Pre-rendered trail sprites shared by all cursors: (color, radius, length) -> list
+_trail_sprite_cache = {}
+
+def get_trail_sprites(color, radius, length):
+    """Get the faded trail sprites for a trail of a given length.
+    
+    Args:
+        color: RGB cursor color
+        radius: Cursor radius
+        length: Number of points currently in the trail
+    
+    Returns:
+        List with one (surface, half size) pair per trail position, oldest first
+    """
+    key = (color, radius, length)
+    sprites = _trail_sprite_cache.get(key)
+    if sprites is None:
+        sprites = []
+        for i in range(length):
+            alpha = int(255 * ((i + 1) / length))
+            size = int(radius * 0.5 * ((i + 1) / length))
+            temp_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            color_with_alpha = (*color, alpha)
+            pygame.draw.circle(temp_surface, color_with_alpha, (size, size), size)
+            sprites.append((temp_surface, size))
+        _trail_sprite_cache[key] = sprites
+    return sprites
 
 
 class FingerCursor:
@@ -149,7 +167,7 @@ class FingerCursor:
     def __init__(self):
         """Initialize finger cursor."""
         self.position = None
-        self.trail = []
+        self.trail = deque(maxlen=config.CURSOR_TRAIL_LENGTH)
         self.color = config.FINGER_CURSOR_COLOR
         self.radius = config.CURSOR_RADIUS
     
@@ -163,28 +181,30 @@ class FingerCursor:
         
         if position:
             self.trail.append(position)
-            if len(self.trail) > config.CURSOR_TRAIL_LENGTH:
-                self.trail.pop(0)
     
     def draw(self, surface):
         """Draw the cursor and its trail.
         
         Args:
             surface: Pygame surface to draw on
+        
+        Returns:
+            List of rects that were drawn
         """
-        # Draw trail
-        for i, pos in enumerate(self.trail):
-            alpha = int(255 * ((i + 1) / len(self.trail)))
-            size = int(self.radius * 0.5 * ((i + 1) / len(self.trail)))
-            temp_surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            color_with_alpha = (*self.color, alpha)
-            pygame.draw.circle(temp_surface, color_with_alpha, (size, size), size)
-            surface.blit(temp_surface, (int(pos[0]) - size, int(pos[1]) - size))
+        rects = []
+        
+        # Draw trail from cached sprites in one batch
+        if self.trail:
+            sprites = get_trail_sprites(self.color, self.radius, len(self.trail))
+            rects = surface.blits([(sprite, (int(pos[0]) - size, int(pos[1]) - size))
+                                   for (sprite, size), pos in zip(sprites, self.trail)])
         
         # Draw main cursor
         if self.position:
-            pygame.draw.circle(surface, self.color, 
-                             (int(self.position[0]), int(self.position[1])), self.radius)
+            rects.append(pygame.draw.circle(surface, self.color, 
+                                            (int(self.position[0]), int(self.position[1])), self.radius))
             # Add a white center for better visibility
             pygame.draw.circle(surface, (255, 255, 255), 
                              (int(self.position[0]), int(self.position[1])), self.radius // 3)
+        
+        return rects
@@ -1,12 +1,17 @@
 """
 Hand tracking module using MediaPipe Hands.
 """
+import copy
 import cv2
 import os
 import urllib.request
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 import config
+from detectors import Detection, Detector
+
+MODEL_URL = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
+MODEL_PATH = os.path.join(os.path.dirname(__file__), "models", "hand_landmarker.task")
 
 
 class HandTracker:
@@ -35,20 +40,16 @@ class HandTracker:
     
     def _get_model_path(self):
         """Download and return the path to the hand landmarker model."""
-        model_url = "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task"
-        model_dir = os.path.join(os.path.dirname(__file__), "models")
-        model_path = os.path.join(model_dir, "hand_landmarker.task")
-        
         # Create models directory if it doesn't exist
-        os.makedirs(model_dir, exist_ok=True)
+        os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
         
         # Download model if it doesn't exist
-        if not os.path.exists(model_path):
+        if not os.path.exists(MODEL_PATH):
             print(f"Downloading hand tracking model...")
-            urllib.request.urlretrieve(model_url, model_path)
-            print(f"Model downloaded to {model_path}")
+            urllib.request.urlretrieve(MODEL_URL, MODEL_PATH)
+            print(f"Model downloaded to {MODEL_PATH}")
         
-        return model_path
+        return MODEL_PATH
     
     def process_frame(self, frame):
         """Process a frame and detect hands.
@@ -149,3 +150,78 @@ class HandTracker:
         """Release MediaPipe resources."""
         if hasattr(self, 'detector'):
             self.detector.close()
+
+
+class HandDetector(Detector):
+    """Detector backend that aims with the index finger tip of each hand."""
+    
+    @classmethod
+    def model_files(cls):
+        """Get the files this backend needs on disk.
+        
+        Auto-selection skips the backend until the model has been downloaded
+        (HandTracker fetches it on first use).
+        
+        Returns:
+            List of file paths
+        """
+        return [MODEL_PATH]
+    
+    def __init__(self):
+        """Initialize MediaPipe Hands."""
+        self.hand_tracker = HandTracker()
+        self.detections = []
+        self.last_detections = []
+    
+    def detect(self, frame):
+        """Find index finger tips in a frame.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            List of Detection (one per hand, box around its landmarks),
+            most confident first
+        """
+        height, width = frame.shape[:2]
+        results = self.hand_tracker.process_frame(frame)
+        
+        found = []
+        for index, hand_landmarks in enumerate(self.hand_tracker.landmarks):
+            xs = [landmark.x for landmark in hand_landmarks]
+            ys = [landmark.y for landmark in hand_landmarks]
+            bbox = (int(min(xs) * width), int(min(ys) * height),
+                    int(max(xs) * width), int(max(ys) * height))
+            confidence = results.handedness[index][0].score if results.handedness else 1.0
+            found.append(Detection(self.hand_tracker.get_finger_tip(hand_landmarks),
+                                   confidence, bbox))
+        
+        found.sort(key=lambda detection: -detection.confidence)
+        return found
+    
+    def debug_snapshot(self):
+        """Copy the state get_debug_image draws from, landmarks included.
+        
+        Returns:
+            Copy of this detector to call get_debug_image on
+        """
+        snapshot = super().debug_snapshot()
+        snapshot.hand_tracker = copy.copy(self.hand_tracker)
+        return snapshot
+    
+    def get_debug_image(self, frame, mirror=False):
+        """Get a debug image with the hand landmarks and finger tips.
+        
+        Args:
+            frame: Original BGR frame
+            mirror: Flip the image and overlays horizontally
+        
+        Returns:
+            Debug visualization image
+        """
+        annotated = self.hand_tracker.draw_landmarks(frame.copy())
+        return super().get_debug_image(annotated, mirror)
+    
+    def close(self):
+        """Release MediaPipe resources."""
+        self.hand_tracker.close()
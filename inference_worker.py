@@ -0,0 +1,167 @@
+"""
+Asynchronous inference worker that runs ball detection off the render loop.
+"""
+import threading
+import time
+from collections import namedtuple
+import config
+
+# Result of running the detector on one captured frame; debug is the
+# detector's debug_snapshot() from right after that frame (or None)
+DetectionResult = namedtuple('DetectionResult',
+                             ['position', 'frame_sequence', 'timestamp', 'completed_at', 'debug'])
+
+
+class InferenceWorker:
+    """Runs a detector on a background thread and publishes the latest result.
+    
+    Only the newest submitted frame is kept; if a new frame arrives while the
+    detector is busy, the older pending frame is skipped. Results are
+    published under this policy:
+    
+    - Out of order: a result for a frame older than the one already published
+      is discarded.
+    - Late: a published result whose source frame is older than
+      config.ASYNC_MAX_RESULT_AGE seconds is treated as "no detection".
+    """
+    
+    def __init__(self, process_fn, max_result_age=None, snapshot_fn=None):
+        """Initialize the inference worker.
+        
+        Args:
+            process_fn: Callable taking a BGR frame and returning a normalized
+                        (x, y) position or None (e.g. ObjectTracker.process_frame)
+            max_result_age: Seconds after capture a result stays valid
+            snapshot_fn: Optional callable run on the worker thread after each
+                         frame; its return value is published as the result's
+                         debug field (e.g. Detector.debug_snapshot)
+        """
+        self.process_fn = process_fn
+        self.snapshot_fn = snapshot_fn
+        self.max_result_age = (config.ASYNC_MAX_RESULT_AGE if max_result_age is None
+                               else max_result_age)
+        
+        self.lock = threading.Lock()
+        self.frame_ready = threading.Event()
+        self.thread = None
+        self.running = False
+        self.error = None
+        
+        self.pending = None  # Newest CapturedFrame waiting for inference
+        self.latest = None  # Newest published DetectionResult
+        
+        # Statistics
+        self.frames_processed = 0
+        self.frames_skipped = 0
+        self.results_out_of_order = 0
+        self.results_late = 0
+        self.last_late_sequence = 0  # Frame sequence of the last result counted as late
+    
+    def start(self):
+        """Start the worker thread."""
+        if self.running:
+            return self
+        
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop,
+                                       name="InferenceWorker", daemon=True)
+        self.thread.start()
+        return self
+    
+    def submit(self, captured):
+        """Queue a captured frame for inference, replacing any pending frame.
+        
+        Args:
+            captured: CapturedFrame from CameraCapture
+        """
+        with self.lock:
+            if self.pending is not None:
+                self.frames_skipped += 1
+            self.pending = captured
+        self.frame_ready.set()
+    
+    def _worker_loop(self):
+        """Run inference on the newest pending frame until stopped."""
+        while self.running:
+            if not self.frame_ready.wait(0.1):
+                continue
+            
+            with self.lock:
+                captured = self.pending
+                self.pending = None
+                self.frame_ready.clear()
+            
+            if captured is None:
+                continue
+            
+            try:
+                position = self.process_fn(captured.frame)
+                debug = self.snapshot_fn() if self.snapshot_fn is not None else None
+            except Exception as exc:
+                self.error = exc
+                self.running = False
+                return
+            
+            self.frames_processed += 1
+            self._publish(DetectionResult(position, captured.sequence,
+                                          captured.timestamp, time.perf_counter(), debug))
+    
+    def _publish(self, result):
+        """Publish a result unless it is older than the current one.
+        
+        Args:
+            result: DetectionResult to publish
+        """
+        with self.lock:
+            if self.latest is not None and result.frame_sequence <= self.latest.frame_sequence:
+                self.results_out_of_order += 1
+                return
+            self.latest = result
+    
+    def get_latest(self, now=None):
+        """Get the most recent detection result that is not too old.
+        
+        Args:
+            now: Current perf_counter() time (defaults to now)
+        
+        Returns:
+            DetectionResult, or None if nothing valid has been published
+        """
+        if self.error is not None:
+            raise RuntimeError("Inference worker failed") from self.error
+        
+        result = self.latest
+        if result is None:
+            return None
+        
+        if now is None:
+            now = time.perf_counter()
+        if now - result.timestamp > self.max_result_age:
+            # Count each stale result once, not once per poll
+            if result.frame_sequence != self.last_late_sequence:
+                self.last_late_sequence = result.frame_sequence
+                self.results_late += 1
+            return None
+        
+        return result
+    
+    def get_stats(self):
+        """Get worker statistics.
+        
+        Returns:
+            Dictionary with processed, skipped, out-of-order and late counts
+        """
+        return {
+            'processed': self.frames_processed,
+            'skipped': self.frames_skipped,
+            'out_of_order': self.results_out_of_order,
+            'late': self.results_late,
+        }
+    
+    def stop(self):
+        """Stop the worker thread."""
+        self.running = False
+        self.frame_ready.set()
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+            self.thread = None
@@ -0,0 +1,151 @@
+"""
+Kalman-filter motion model for latency-compensated cursor prediction.
+"""
+import numpy as np
+import config
+
+
+class KalmanFilter2D:
+    """Constant-velocity Kalman filter over a 2D position.
+    
+    Measurements are tagged with the time their camera frame was captured,
+    so the filter can be asked where the ball will be at some later time
+    (e.g. when the next frame reaches the screen). Short detection dropouts
+    are bridged by coasting on the estimated velocity.
+    """
+    
+    def __init__(self, process_noise=None, measurement_noise=None,
+                 max_coast=None, max_prediction=None):
+        """Initialize the filter.
+        
+        Args:
+            process_noise: Acceleration noise (units/s^2); default from config
+            measurement_noise: Measurement std-dev (units); default derived from
+                               config.SMOOTHING_FACTOR
+            max_coast: Seconds to keep predicting without a measurement
+            max_prediction: Max seconds to extrapolate past the last measurement
+        """
+        if measurement_noise is None:
+            # Higher smoothing trusts measurements less
+            smoothing = min(max(config.SMOOTHING_FACTOR, 0.0), 0.95)
+            measurement_noise = config.KALMAN_MEASUREMENT_NOISE * smoothing / (1.0 - smoothing)
+            measurement_noise = max(measurement_noise, 1e-4)
+        
+        self.process_noise = config.KALMAN_PROCESS_NOISE if process_noise is None else process_noise
+        self.max_coast = config.KALMAN_MAX_COAST if max_coast is None else max_coast
+        self.max_prediction = config.KALMAN_MAX_PREDICTION if max_prediction is None else max_prediction
+        
+        self.H = np.array([[1.0, 0.0, 0.0, 0.0],
+                           [0.0, 1.0, 0.0, 0.0]])
+        self.R = np.eye(2) * measurement_noise ** 2
+        self.reset()
+    
+    def reset(self):
+        """Forget the current track."""
+        self.state = np.zeros(4)  # [x, y, vx, vy]
+        self.covariance = np.eye(4)
+        self.timestamp = None  # Time of the current state estimate
+        self.last_measurement_time = None
+        self.initialized = False
+    
+    def _transition(self, dt):
+        """Build the state transition and process noise matrices.
+        
+        Args:
+            dt: Time step in seconds
+        
+        Returns:
+            Tuple (F, Q)
+        """
+        F = np.eye(4)
+        F[0, 2] = dt
+        F[1, 3] = dt
+        
+        # Piecewise white acceleration noise
+        q = self.process_noise ** 2
+        dt2 = dt * dt
+        Q = np.zeros((4, 4))
+        Q[0, 0] = Q[1, 1] = dt2 * dt2 / 4 * q
+        Q[0, 2] = Q[2, 0] = Q[1, 3] = Q[3, 1] = dt2 * dt / 2 * q
+        Q[2, 2] = Q[3, 3] = dt2 * q
+        return F, Q
+    
+    def update(self, position, timestamp):
+        """Fold in a new measurement.
+        
+        Measurements older than the current estimate are ignored.
+        
+        Args:
+            position: Tuple (x, y)
+            timestamp: Capture time of the measurement (seconds)
+        """
+        z = np.array(position, dtype=np.float64)
+        
+        if not self.initialized:
+            self.state[:2] = z
+            self.state[2:] = 0.0
+            self.covariance = np.diag([self.R[0, 0], self.R[1, 1], 1.0, 1.0])
+            self.timestamp = timestamp
+            self.last_measurement_time = timestamp
+            self.initialized = True
+            return
+        
+        dt = timestamp - self.timestamp
+        if dt < 0:
+            return
+        
+        # Predict to the measurement time
+        F, Q = self._transition(dt)
+        self.state = F @ self.state
+        self.covariance = F @ self.covariance @ F.T + Q
+        
+        # Correct
+        innovation = z - self.H @ self.state
+        S = self.H @ self.covariance @ self.H.T + self.R
+        K = self.covariance @ self.H.T @ np.linalg.inv(S)
+        self.state = self.state + K @ innovation
+        self.covariance = (np.eye(4) - K @ self.H) @ self.covariance
+        
+        self.timestamp = timestamp
+        self.last_measurement_time = timestamp
+    
+    def mark_missing(self, timestamp):
+        """Record that a frame had no detection.
+        
+        The track coasts until max_coast has passed since the last
+        measurement, then it is dropped.
+        
+        Args:
+            timestamp: Capture time of the frame without a detection
+        """
+        if self.initialized and timestamp - self.last_measurement_time > self.max_coast:
+            self.reset()
+    
+    def predict(self, timestamp):
+        """Predict the position at a given time without changing the state.
+        
+        Args:
+            timestamp: Time to predict for (seconds)
+        
+        Returns:
+            Tuple (x, y), or None if there is no live track
+        """
+        if not self.initialized:
+            return None
+        
+        if timestamp - self.last_measurement_time > self.max_coast + self.max_prediction:
+            return None
+        
+        # Don't extrapolate further than we can trust the velocity
+        dt = min(max(timestamp - self.timestamp, 0.0), self.max_prediction)
+        x = self.state[0] + self.state[2] * dt
+        y = self.state[1] + self.state[3] * dt
+        return (float(x), float(y))
+    
+    def get_velocity(self):
+        """Get the estimated velocity.
+        
+        Returns:
+            Tuple (vx, vy) in units per second
+        """
+        return (float(self.state[2]), float(self.state[3]))
@@ -0,0 +1,230 @@
+"""
+Multi-ball tracking with persistent track IDs (SORT-style association).
+"""
+import numpy as np
+import config
+
+# Cost given to detection/track pairs that are too far apart to match
+_GATED_COST = 1e6
+
+
+def linear_assignment(cost):
+    """Solve the rectangular assignment problem (Hungarian algorithm).
+    
+    Args:
+        cost: Array of shape (N, M) with the cost of pairing row i with column j
+    
+    Returns:
+        int array of shape (K, 2) with (row, column) pairs, K = min(N, M)
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.size == 0:
+        return np.empty((0, 2), dtype=int)
+    
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    
+    # Shortest augmenting path with row/column potentials (1-based, column 0 is a sentinel)
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=int)  # p[j] = row assigned to column j
+    way = np.zeros(m + 1, dtype=int)
+    
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            free = ~used[1:]
+            
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            
+            candidates = np.where(free, minv[1:], np.inf)
+            j1 = int(np.argmin(candidates)) + 1
+            delta = candidates[j1 - 1]
+            
+            used_columns = np.nonzero(used)[0]
+            u[p[used_columns]] += delta
+            v[used_columns] -= delta
+            minv[1:][free] -= delta
+            
+            j0 = j1
+            if p[j0] == 0:
+                break
+        
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    
+    columns = np.nonzero(p[1:])[0]
+    pairs = np.stack([p[columns + 1] - 1, columns], axis=1)
+    if transposed:
+        pairs = pairs[:, ::-1]
+    return pairs
+
+
+class Track:
+    """One tracked ball with a constant-velocity box model."""
+    
+    def __init__(self, track_id, bbox, confidence):
+        """Initialize a track.
+        
+        Args:
+            track_id: Persistent track ID
+            bbox: (x1, y1, x2, y2) in frame pixels
+            confidence: Detection confidence
+        """
+        self.track_id = track_id
+        self.bbox = np.array(bbox, dtype=np.float64)
+        self.velocity = np.zeros(4)
+        self.confidence = confidence
+        self.hits = 1
+        self.misses = 0
+    
+    def predict(self):
+        """Move the box by its velocity for the new frame."""
+        self.bbox += self.velocity
+    
+    def update(self, bbox, confidence):
+        """Correct the track with a matched detection.
+        
+        Args:
+            bbox: (x1, y1, x2, y2) in frame pixels
+            confidence: Detection confidence
+        """
+        bbox = np.asarray(bbox, dtype=np.float64)
+        # self.bbox already holds the prediction, so this is the velocity error
+        self.velocity += (bbox - self.bbox) * config.MULTI_TRACK_VELOCITY_GAIN
+        self.bbox = bbox
+        self.confidence = confidence
+        self.hits += 1
+        self.misses = 0
+    
+    def get_center(self):
+        """Get the box center.
+        
+        Returns:
+            Tuple (cx, cy) in frame pixels
+        """
+        x1, y1, x2, y2 = self.bbox.tolist()
+        return ((x1 + x2) / 2, (y1 + y2) / 2)
+
+
+class MultiObjectTracker:
+    """Tracks several balls at once and keeps a stable ID for each.
+    
+    Each frame, existing tracks are predicted forward and matched to the
+    new detections by center distance with the Hungarian algorithm.
+    Unmatched detections start new tracks; tracks that go unmatched for
+    too long are dropped.
+    """
+    
+    def __init__(self, detector=None):
+        """Initialize the multi-object tracker.
+        
+        Args:
+            detector: Detector backend used by process_frame (optional)
+        """
+        self.detector = detector
+        self.tracks = []
+        self.next_id = 1
+        self.max_tracks = config.MULTI_BALL_MAX_TRACKS
+    
+    def update(self, detections):
+        """Associate a frame's detections with the existing tracks.
+        
+        Args:
+            detections: List of detection dicts with 'bbox' (x1, y1, x2, y2)
+                        and 'confidence', as in ObjectTracker.detections
+        
+        Returns:
+            List of confirmed Track objects seen in this frame
+        """
+        for track in self.tracks:
+            track.predict()
+        
+        boxes = np.array([det['bbox'] for det in detections], dtype=np.float64).reshape(-1, 4)
+        matched_tracks = set()
+        matched_detections = set()
+        
+        if self.tracks and len(boxes):
+            track_boxes = np.array([track.bbox for track in self.tracks])
+            cost = self._distance_cost(track_boxes, boxes)
+            for t, d in linear_assignment(cost):
+                if cost[t, d] <= config.MULTI_TRACK_MAX_DISTANCE:
+                    self.tracks[t].update(boxes[d], detections[d]['confidence'])
+                    matched_tracks.add(t)
+                    matched_detections.add(d)
+        
+        # Age out tracks that found no detection
+        for t, track in enumerate(self.tracks):
+            if t not in matched_tracks:
+                track.misses += 1
+        self.tracks = [track for track in self.tracks
+                       if track.misses <= config.MULTI_TRACK_MAX_MISSES]
+        
+        # Start new tracks, most confident detections first
+        new_detections = [d for d in range(len(boxes)) if d not in matched_detections]
+        new_detections.sort(key=lambda d: -detections[d]['confidence'])
+        for d in new_detections:
+            if len(self.tracks) >= self.max_tracks:
+                break
+            self.tracks.append(Track(self.next_id, boxes[d], detections[d]['confidence']))
+            self.next_id += 1
+        
+        return [track for track in self.tracks
+                if track.misses == 0 and track.hits >= config.MULTI_TRACK_MIN_HITS]
+    
+    @staticmethod
+    def _distance_cost(track_boxes, boxes):
+        """Center distance between every track and detection, in box sizes.
+        
+        Args:
+            track_boxes: Array of shape (T, 4)
+            boxes: Array of shape (D, 4)
+        
+        Returns:
+            Array of shape (T, D); pairs beyond the gate get a very large cost
+        """
+        track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+        track_sizes = np.maximum(track_boxes[:, 2] - track_boxes[:, 0],
+                                 track_boxes[:, 3] - track_boxes[:, 1])
+        
+        delta = track_centers[:, None, :] - centers[None, :, :]
+        distance = np.sqrt((delta ** 2).sum(axis=2)) / np.maximum(track_sizes, 1.0)[:, None]
+        distance[distance > config.MULTI_TRACK_MAX_DISTANCE] = _GATED_COST
+        return distance
+    
+    def process_frame(self, frame):
+        """Run the detector on a frame and update the tracks.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            List of (track_id, (x, y)) with normalized (0-1) ball centers
+        """
+        height, width = frame.shape[:2]
+        self.detector.process_frame(frame)
+        
+        results = []
+        for track in self.update(self.detector.detections):
+            cx, cy = track.get_center()
+            results.append((track.track_id, (cx / width, cy / height)))
+        return results
+    
+    def reset(self):
+        """Drop all tracks."""
+        self.tracks = []
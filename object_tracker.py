@@ -1,17 +1,78 @@
 """
-Ball tracking module using Machine Learning (MobileNet-SSD).
+Ball tracking module using Machine Learning (MobileNet-SSD), run with OpenCV
+DNN or ONNX Runtime.
 """
 import cv2
 import numpy as np
 import config
 import os
+import time
+from profiler import profiler
+from detectors import Detection, Detector
 
-class ObjectTracker:
+
+def decode_detections(detections, target_class, confidence_threshold, region):
+    """Decode raw MobileNet-SSD output into boxes for one class.
+    
+    Args:
+        detections: Network output of shape (1, 1, N, 7) with rows
+                    [image_id, class_id, confidence, x1, y1, x2, y2]
+        target_class: Class ID to keep
+        confidence_threshold: Minimum confidence (exclusive)
+        region: (x1, y1, x2, y2) area the network ran on, in frame pixels
+    
+    Returns:
+        Tuple (boxes, confidences): int array of shape (K, 4) with
+        (x1, y1, x2, y2) frame pixel boxes, and float array of shape (K,)
+    """
+    rows = detections[0, 0]
+    keep = ((rows[:, 1].astype(np.int32) == target_class)
+            & (rows[:, 2] > confidence_threshold))
+    rows = rows[keep]
+    
+    rx1, ry1, rx2, ry2 = region
+    region_width = rx2 - rx1
+    region_height = ry2 - ry1
+    scale = np.array([region_width, region_height, region_width, region_height])
+    offset = np.array([rx1, ry1, rx1, ry1])
+    boxes = (rows[:, 3:7] * scale + offset).astype(int)
+    
+    return boxes, rows[:, 2].astype(np.float64)
+
+
+def prepare_blob(image, resize_buffer, blob):
+    """Build the network input in preallocated buffers.
+    
+    Produces exactly what cv2.dnn.blobFromImage(resized, 0.007843,
+    (size, size), 127.5) does. That call turns the scalar mean into
+    Scalar(127.5, 0, 0), so only the first channel is centered.
+    
+    Args:
+        image: BGR image (any size)
+        resize_buffer: uint8 array of shape (size, size, 3)
+        blob: float32 array of shape (1, 3, size, size), filled in place
+    
+    Returns:
+        blob
+    """
+    size = resize_buffer.shape[0]
+    cv2.resize(image, (size, size), dst=resize_buffer)
+    blob[0] = resize_buffer.transpose(2, 0, 1)
+    blob[0, 0] -= np.float32(127.5)  # Mean subtraction (first channel only)
+    np.multiply(blob, np.float32(0.007843), out=blob)  # Scale factor
+    return blob
+
+
+class ObjectTracker(Detector):
     """Tracks a ball using ML-based object detection (MobileNet-SSD)."""
     
-    def __init__(self):
-        """Initialize the ML-based ball tracker."""
-        self.use_ml = config.USE_ML_DETECTION
+    def __init__(self, use_ml=None):
+        """Initialize the ML-based ball tracker.
+        
+        Args:
+            use_ml: Load and run the network (default config.USE_ML_DETECTION)
+        """
+        self.use_ml = config.USE_ML_DETECTION if use_ml is None else use_ml
         self.confidence_threshold = config.CONFIDENCE_THRESHOLD
         self.target_class = config.TARGET_CLASS_ID
         
@@ -30,10 +91,47 @@ class ObjectTracker:
         self.detections = []
         self.mask = None
         
+        # Detect-then-track state ('detect' runs the network on every frame,
+        # 'hybrid' follows the ball with optical flow between detections)
+        self.tracking_mode = config.TRACKING_MODE
+        self.detection_interval = config.DETECTION_INTERVAL
+        self.frames_since_detection = 0
+        self.prev_gray = None
+        self.track_points = None
+        self.track_confidence = 0.0
+        
+        # Which path produced the last position ('detect', 'track', or None)
+        self.last_source = None
+        self.path_counts = {'detect': 0, 'track': 0, 'track_lost': 0}
+        self.path_time = {'detect': 0.0, 'track': 0.0, 'track_lost': 0.0}
+        
+        # Region-of-interest search around the last known position
+        self.use_roi = config.USE_ROI_SEARCH
+        self.input_size = config.DETECTION_INPUT_SIZE
+        self.velocity = (0, 0)  # Pixels per processed frame
+        self.search_region = None  # Last region the network ran on
+        self.detections_since_full_frame = 0
+        self.roi_stats = {'hits': 0, 'misses': 0, 'full': 0}
+        
+        # Multi-ball tracking needs every ball in every frame, so it always
+        # runs full-frame detection
+        if config.MULTI_BALL:
+            self.tracking_mode = 'detect'
+            self.use_roi = False
+        
+        # Reusable inference buffers
+        self._resize_buffer = np.empty((self.input_size, self.input_size, 3), dtype=np.uint8)
+        self._blob = np.empty((1, 3, self.input_size, self.input_size), dtype=np.float32)
+        
         # Load ML model
         if self.use_ml:
             self._load_model()
     
+    @classmethod
+    def model_files(cls):
+        """Get the model files this backend needs on disk."""
+        return [config.MODEL_PROTOTXT, config.MODEL_WEIGHTS]
+    
     def _load_model(self):
         """Load the MobileNet-SSD model."""
         prototxt = config.MODEL_PROTOTXT
@@ -64,6 +162,10 @@ class ObjectTracker:
     def process_frame(self, frame):
         """Process a frame and detect a ball using ML.
         
+        In 'hybrid' mode the network only runs every DETECTION_INTERVAL
+        frames (or when the optical-flow track is lost); in between, the
+        ball is followed with pyramidal Lucas-Kanade optical flow.
+        
         Args:
             frame: BGR image from OpenCV
         
@@ -73,77 +175,351 @@ class ObjectTracker:
         if not self.use_ml:
             return None
         
-        height, width = frame.shape[:2]
+        if self.tracking_mode != 'hybrid':
+            return self._timed('detect', self._detect_frame, frame)
         
-        # Prepare frame for DNN
-        blob = cv2.dnn.blobFromImage(
-            cv2.resize(frame, (300, 300)),  # MobileNet-SSD expects 300x300
-            0.007843,  # Scale factor
-            (300, 300),
-            127.5  # Mean subtraction
-        )
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         
-        # Run inference
-        self.net.setInput(blob)
-        detections = self.net.forward()
+        if self._can_track():
+            start = time.perf_counter()
+            result = self._track_frame(frame, gray)
+            path = 'track' if result is not None else 'track_lost'
+            self.path_counts[path] += 1
+            self.path_time[path] += time.perf_counter() - start
+            if result is not None:
+                self.last_source = 'track'
+                self.frames_since_detection += 1
+                return result
         
-        # Store all detections for debug
-        self.detections = []
-        
-        # Find the best ball detection
-        best_detection = None
-        best_confidence = 0.0
+        result = self._timed('detect', self._detect_frame, frame)
+        self.frames_since_detection = 0
+        self._init_track(gray)
+        return result
+    
+    def _timed(self, path, fn, frame):
+        """Run one processing path and record its count and duration.
         
-        for i in range(detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            class_id = int(detections[0, 0, i, 1])
+        Args:
+            path: Path name ('detect' or 'track')
+            fn: Callable taking the frame
+            frame: BGR image
             
-            # Check if it's a sports ball with sufficient confidence
-            if class_id == self.target_class and confidence > self.confidence_threshold:
-                # Get bounding box coordinates
-                box = detections[0, 0, i, 3:7] * np.array([width, height, width, height])
-                (x1, y1, x2, y2) = box.astype("int")
-                
-                # Store detection info
-                detection_info = {
-                    'class_id': class_id,
-                    'confidence': float(confidence),
-                    'bbox': (x1, y1, x2, y2)
-                }
-                self.detections.append(detection_info)
-                
-                # Optional: Apply color filter
-                if self.use_color_filter:
-                    if not self._check_color_match(frame, (x1, y1, x2, y2)):
-                        continue
-                
-                # Keep the most confident detection
-                if confidence > best_confidence:
-                    best_confidence = confidence
-                    best_detection = detection_info
-        
-        # Process best detection
+        Returns:
+            Result of fn(frame)
+        """
+        start = time.perf_counter()
+        result = fn(frame)
+        self.path_counts[path] += 1
+        self.path_time[path] += time.perf_counter() - start
+        self.last_source = path if result is not None else None
+        return result
+    
+    def _detect_frame(self, frame):
+        """Run MobileNet-SSD on a frame and keep the best ball detection.
+        
+        When the ball was seen recently, the network first runs on a window
+        around its predicted position; the whole frame is only searched on a
+        miss or every ROI_FULL_FRAME_INTERVAL detections.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            Tuple (x, y) in normalized coordinates (0-1), or None if not detected
+        """
+        height, width = frame.shape[:2]
+        
+        region = self._get_search_region(width, height)
+        if region is not None:
+            best_detection = self._detect_in_region(frame, region)
+            if best_detection:
+                self.roi_stats['hits'] += 1
+                self.detections_since_full_frame += 1
+                return self._accept_detection(best_detection, width, height)
+            self.roi_stats['misses'] += 1
+        
+        # Full-frame pass
+        self.roi_stats['full'] += 1
+        self.detections_since_full_frame = 0
+        best_detection = self._detect_in_region(frame, (0, 0, width, height))
         if best_detection:
-            x1, y1, x2, y2 = best_detection['bbox']
-            
-            # Calculate center
-            cx = (x1 + x2) // 2
-            cy = (y1 + y2) // 2
-            
-            # Store info
-            self.position = (cx, cy)
-            self.bbox = (x1, y1, x2 - x1, y2 - y1)  # (x, y, w, h)
-            self.confidence = best_confidence
-            
-            # Return normalized coordinates
-            return (cx / width, cy / height)
+            return self._accept_detection(best_detection, width, height)
         
         # No ball detected
         self.position = None
         self.bbox = None
         self.confidence = 0.0
+        self.velocity = (0, 0)
+        return None
+    
+    def _get_search_region(self, width, height):
+        """Get the window to search around the last known ball position.
+        
+        The window is square (the network input is square), sized from the
+        last box and widened by the ball's recent motion.
+        
+        Args:
+            width: Frame width
+            height: Frame height
+        
+        Returns:
+            (x1, y1, x2, y2) region, or None if a full-frame pass is needed
+        """
+        if not self.use_roi or self.bbox is None:
+            return None
+        if self.detections_since_full_frame >= config.ROI_FULL_FRAME_INTERVAL:
+            return None
+        
+        _, _, w, h = self.bbox
+        cx, cy = self.position
+        vx, vy = self.velocity
+        
+        # Center on where the ball should be now, widen by how fast it moves
+        cx += vx
+        cy += vy
+        half = max(w, h) * config.ROI_SCALE / 2 + max(abs(vx), abs(vy)) * config.ROI_MOTION_MARGIN
+        half = int(max(half, config.ROI_MIN_SIZE / 2))
+        
+        # A window this big is barely cheaper than the full frame
+        if half * 2 >= min(width, height):
+            return None
+        
+        # Shift the window inside the frame rather than shrinking it
+        x1 = int(min(max(cx - half, 0), width - 2 * half))
+        y1 = int(min(max(cy - half, 0), height - 2 * half))
+        return (x1, y1, x1 + 2 * half, y1 + 2 * half)
+    
+    def _detect_in_region(self, frame, region):
+        """Run the network on one region of the frame.
+        
+        Args:
+            frame: BGR image from OpenCV
+            region: (x1, y1, x2, y2) area to search, in frame pixels
+        
+        Returns:
+            Best detection info dict (bbox in frame pixels), or None
+        """
+        rx1, ry1, rx2, ry2 = region
+        image = frame[ry1:ry2, rx1:rx2]
+        
+        # Prepare frame for DNN (reusing the resize and blob buffers)
+        with profiler.section("detect.prep"):
+            blob = prepare_blob(image, self._resize_buffer, self._blob)
+        
+        # Run inference
+        with profiler.section("detect.forward"):
+            detections = self._forward(blob)
+        
+        # Decode every candidate in one pass
+        with profiler.section("detect.decode"):
+            boxes, confidences = decode_detections(detections, self.target_class,
+                                                   self.confidence_threshold, region)
+        
+        # Store all detections for debug
+        self.detections = [
+            {'class_id': self.target_class, 'confidence': confidence, 'bbox': tuple(box)}
+            for box, confidence in zip(boxes.tolist(), confidences.tolist())
+        ]
+        
+        self.search_region = region
+        if not self.detections:
+            return None
+        
+        # Keep the most confident detection
+        if not self.use_color_filter:
+            return self.detections[int(np.argmax(confidences))]
+        
+        # Optional: Apply color filter, most confident first
+        for i in np.argsort(-confidences, kind='stable'):
+            detection_info = self.detections[i]
+            if self._check_color_match(frame, detection_info['bbox']):
+                return detection_info
+        
         return None
     
+    def _forward(self, blob):
+        """Run the network on a prepared input blob.
+        
+        Args:
+            blob: Float32 array of shape (1, 3, size, size)
+        
+        Returns:
+            Raw SSD output of shape (1, 1, N, 7)
+        """
+        self.net.setInput(blob)
+        return self.net.forward()
+    
+    def detect(self, frame):
+        """Process a frame and return the tracked ball and the other candidates.
+        
+        Other candidates are only listed when the network ran on this frame;
+        after an optical-flow step the last network results are out of date.
+        
+        Args:
+            frame: BGR image from OpenCV
+        
+        Returns:
+            List of Detection, the tracked ball first (empty if there is none)
+        """
+        position = self.process_frame(frame)
+        if position is None:
+            return []
+        
+        x, y, w, h = self.bbox
+        best_box = (x, y, x + w, y + h)
+        found = [Detection(position, self.confidence, best_box)]
+        if self.last_source != 'detect':
+            return found
+        
+        height, width = frame.shape[:2]
+        for det in sorted(self.detections, key=lambda det: -det['confidence']):
+            # The accepted detection's box converts back to best_box exactly
+            if det['bbox'] == best_box:
+                continue
+            x1, y1, x2, y2 = det['bbox']
+            center = ((x1 + x2) // 2 / width, (y1 + y2) // 2 / height)
+            found.append(Detection(center, det['confidence'], det['bbox']))
+        return found
+    
+    def _accept_detection(self, detection, width, height):
+        """Store a detection as the tracked ball.
+        
+        Args:
+            detection: Detection info dict with 'bbox' and 'confidence'
+            width: Frame width
+            height: Frame height
+        
+        Returns:
+            Tuple (x, y) in normalized coordinates (0-1)
+        """
+        x1, y1, x2, y2 = detection['bbox']
+        
+        # Calculate center
+        cx = (x1 + x2) // 2
+        cy = (y1 + y2) // 2
+        
+        # Store info
+        self._update_velocity(cx, cy)
+        self.position = (cx, cy)
+        self.bbox = (x1, y1, x2 - x1, y2 - y1)  # (x, y, w, h)
+        self.confidence = detection['confidence']
+        
+        # Return normalized coordinates
+        return (cx / width, cy / height)
+    
+    def _update_velocity(self, cx, cy):
+        """Update the per-frame ball velocity from a new center.
+        
+        Args:
+            cx: New center X in pixels
+            cy: New center Y in pixels
+        """
+        if self.position is None:
+            self.velocity = (0, 0)
+        else:
+            self.velocity = (cx - self.position[0], cy - self.position[1])
+    
+    def _can_track(self):
+        """Check whether the optical-flow tracker can be used for this frame.
+        
+        Returns:
+            True if there is a live track and a detection is not yet due
+        """
+        return (self.track_points is not None
+                and self.prev_gray is not None
+                and self.frames_since_detection < self.detection_interval - 1)
+    
+    def _init_track(self, gray):
+        """Pick feature points inside the detected box to follow.
+        
+        Args:
+            gray: Grayscale version of the frame that was just detected on
+        """
+        self.prev_gray = gray
+        self.track_points = None
+        self.track_confidence = 0.0
+        
+        if self.bbox is None:
+            return
+        
+        x, y, w, h = self.bbox
+        mask = np.zeros(gray.shape, dtype=np.uint8)
+        # Shrink the box a little so we don't lock onto the background
+        inset_x, inset_y = w // 8, h // 8
+        mask[max(0, y + inset_y):max(0, y + h - inset_y),
+             max(0, x + inset_x):max(0, x + w - inset_x)] = 255
+        
+        points = cv2.goodFeaturesToTrack(gray, maxCorners=config.TRACKER_MAX_POINTS,
+                                         qualityLevel=0.01, minDistance=3, mask=mask)
+        if points is not None and len(points) >= config.TRACKER_MIN_POINTS:
+            self.track_points = points
+            self.track_confidence = 1.0
+    
+    def _track_frame(self, frame, gray):
+        """Follow the ball from the previous frame with optical flow.
+        
+        Points are checked with a forward-backward pass; the track is
+        considered lost when too few of them survive.
+        
+        Args:
+            frame: BGR image from OpenCV
+            gray: Grayscale version of frame
+        
+        Returns:
+            Tuple (x, y) in normalized coordinates (0-1), or None if the track was lost
+        """
+        height, width = frame.shape[:2]
+        lk_params = dict(winSize=(15, 15), maxLevel=2,
+                         criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+        
+        old_points = self.track_points
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, old_points,
+                                                         None, **lk_params)
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, new_points,
+                                                               None, **lk_params)
+        
+        fb_error = np.linalg.norm((old_points - back_points).reshape(-1, 2), axis=1)
+        good = ((status.ravel() == 1) & (back_status.ravel() == 1)
+                & (fb_error < config.TRACKER_MAX_FB_ERROR))
+        
+        self.prev_gray = gray
+        self.track_confidence = float(good.sum()) / len(old_points)
+        if good.sum() < config.TRACKER_MIN_POINTS or self.track_confidence < config.TRACKER_MIN_CONFIDENCE:
+            self.track_points = None
+            return None
+        
+        # Move the box by the median point displacement
+        shift = np.median((new_points - old_points).reshape(-1, 2)[good], axis=0)
+        x, y, w, h = self.bbox
+        x = int(round(x + shift[0]))
+        y = int(round(y + shift[1]))
+        cx = x + w // 2
+        cy = y + h // 2
+        
+        if not (0 <= cx < width and 0 <= cy < height):
+            self.track_points = None
+            return None
+        
+        self.track_points = new_points[good].reshape(-1, 1, 2)
+        self._update_velocity(cx, cy)
+        self.position = (cx, cy)
+        self.bbox = (x, y, w, h)
+        self.detections = []
+        
+        return (cx / width, cy / height)
+    
+    def get_path_stats(self):
+        """Get how often each processing path ran and what it cost.
+        
+        Returns:
+            Dictionary mapping path name to {'count', 'avg_ms'}
+        """
+        stats = {}
+        for path, count in self.path_counts.items():
+            avg_ms = (self.path_time[path] / count * 1000) if count else 0.0
+            stats[path] = {'count': count, 'avg_ms': avg_ms}
+        return stats
+    
     def _check_color_match(self, frame, bbox):
         """Check if the detected region matches the target color.
         
@@ -174,20 +550,36 @@ class ObjectTracker:
         color_ratio = np.sum(mask > 0) / mask.size
         return color_ratio > 0.2  # At least 20% of the region should match
     
-    def get_debug_image(self, frame):
+    def get_debug_image(self, frame, mirror=False):
         """Get a debug image showing detections and tracking info.
         
+        Detection runs on the unflipped camera frame; when mirror is set,
+        only this debug copy is flipped and the boxes are mirrored to match.
+        
         Args:
             frame: Original BGR frame
+            mirror: Flip the image and overlays horizontally
             
         Returns:
             Debug visualization image
         """
-        debug_frame = frame.copy()
+        width = frame.shape[1]
+        debug_frame = cv2.flip(frame, 1) if mirror else frame.copy()
+        
+        def to_view(x1, y1, x2, y2):
+            """Map a frame box into the (possibly mirrored) debug view."""
+            if mirror:
+                x1, x2 = width - x2, width - x1
+            return (x1, y1), (x2, y2)
+        
+        # Draw the region the network last searched
+        if self.search_region is not None:
+            top_left, bottom_right = to_view(*self.search_region)
+            cv2.rectangle(debug_frame, top_left, bottom_right, (255, 128, 0), 1)
         
         # Draw all detections (lower confidence in yellow)
         for det in self.detections:
-            x1, y1, x2, y2 = det['bbox']
+            (x1, y1), (x2, y2) = to_view(*det['bbox'])
             conf = det['confidence']
             
             # Draw bounding box
@@ -201,10 +593,13 @@ class ObjectTracker:
         # Draw the final tracked ball (if any)
         if self.position and self.bbox:
             x, y, w, h = self.bbox
+            (x, y), (x2, y2) = to_view(x, y, x + w, y + h)
             cx, cy = self.position
+            if mirror:
+                cx = width - cx
             
             # Draw green bounding box for tracked ball
-            cv2.rectangle(debug_frame, (x, y), (x + w, y + h), (0, 255, 0), 2)
+            cv2.rectangle(debug_frame, (x, y), (x2, y2), (0, 255, 0), 2)
             
             # Draw center point
             cv2.circle(debug_frame, (cx, cy), 8, (0, 0, 255), -1)
@@ -219,6 +614,8 @@ class ObjectTracker:
         mode_text = "ML Detection: ON"
         if self.use_color_filter:
             mode_text += f" + {self.ball_color} color filter"
+        if self.tracking_mode == 'hybrid':
+            mode_text += f" | {self.last_source or '-'}"
         cv2.putText(debug_frame, mode_text, (10, 30),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
@@ -230,4 +627,47 @@ class ObjectTracker:
     
     def close(self):
         """Cleanup resources."""
-        pass
+        if self.tracking_mode == 'hybrid':
+            stats = self.get_path_stats()
+            print(f"Tracker: {stats['detect']['count']} detections ({stats['detect']['avg_ms']:.1f} ms), "
+                  f"{stats['track']['count']} tracked ({stats['track']['avg_ms']:.1f} ms), "
+                  f"{stats['track_lost']['count']} tracks lost")
+
+
+class OnnxObjectTracker(ObjectTracker):
+    """MobileNet-SSD tracker that runs the network with ONNX Runtime on the CPU.
+    
+    Expects config.ONNX_MODEL to be the same network exported with its
+    detection output, i.e. rows of [image_id, class_id, confidence, x1, y1,
+    x2, y2]; everything else (ROI search, hybrid tracking) is shared.
+    """
+    
+    @classmethod
+    def model_files(cls):
+        """Get the model files this backend needs on disk."""
+        return [config.ONNX_MODEL]
+    
+    def _load_model(self):
+        """Load the ONNX model into a CPU inference session."""
+        import onnxruntime
+        
+        if not os.path.exists(config.ONNX_MODEL):
+            raise FileNotFoundError(f"ONNX model not found: {config.ONNX_MODEL}")
+        
+        print(f"Loading MobileNet-SSD ONNX model...")
+        self.session = onnxruntime.InferenceSession(config.ONNX_MODEL,
+                                                    providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+        print(f"✅ Model loaded successfully!")
+    
+    def _forward(self, blob):
+        """Run the network on a prepared input blob.
+        
+        Args:
+            blob: Float32 array of shape (1, 3, size, size)
+        
+        Returns:
+            Raw SSD output of shape (1, 1, N, 7)
+        """
+        output = self.session.run(None, {self.input_name: blob})[0]
+        return output.reshape(1, 1, -1, 7)
@@ -0,0 +1,154 @@
+"""
+Fixed-capacity particle system backed by a ring of NumPy arrays.
+"""
+import numpy as np
+import pygame
+import config
+
+# Cache for the particle sprite atlas
+_particle_atlas_cache = None
+
+
+def get_particle_atlas():
+    """Build and cache the particle sprite atlas.
+    
+    The atlas holds a faded circle for every particle size (2-5), every
+    config.PARTICLE_COLORS entry and config.PARTICLE_ALPHA_STEPS alpha
+    levels, so drawing a particle is just a blit from a sub-rectangle.
+    
+    Returns:
+        Tuple (atlas surface, list of area rects indexed by sprite key)
+    """
+    global _particle_atlas_cache
+    if _particle_atlas_cache is None:
+        sizes = range(2, 6)
+        colors = config.PARTICLE_COLORS
+        steps = config.PARTICLE_ALPHA_STEPS
+        cell = 2 * max(sizes)
+        
+        atlas = pygame.Surface((cell * steps, cell * len(sizes) * len(colors)), pygame.SRCALPHA)
+        rects = []
+        for size in sizes:
+            for color in colors:
+                top = len(rects) // steps * cell
+                for step in range(steps):
+                    alpha = int(255 * (step + 1) / steps)
+                    rect = pygame.Rect(step * cell, top, size * 2, size * 2)
+                    pygame.draw.circle(atlas, (*color, alpha), rect.center, size)
+                    rects.append(rect)
+        
+        _particle_atlas_cache = (atlas, rects)
+    return _particle_atlas_cache
+
+
+class ParticlePool:
+    """Stores explosion particles in preallocated parallel arrays.
+    
+    New particles are written at the ring's head, overwriting the oldest
+    slots. All particles share the same lifetime, so the oldest slot has
+    always expired first unless the pool is over capacity, in which case the
+    oldest live particles are recycled early. Nothing is allocated per
+    particle, so chain explosions don't cause GC spikes.
+    """
+    
+    def __init__(self, capacity=None, rng=None):
+        """Initialize the pool.
+        
+        Args:
+            capacity: Maximum number of live particles (default from config)
+            rng: numpy Generator used for particle directions, speeds, colors
+                 and sizes (default: a fresh unseeded generator)
+        """
+        self.capacity = capacity or config.PARTICLE_POOL_CAPACITY
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.colors = config.PARTICLE_COLORS
+        self.max_lifetime = config.PARTICLE_LIFETIME
+        
+        self.x = np.zeros(self.capacity, dtype=np.float64)
+        self.y = np.zeros(self.capacity, dtype=np.float64)
+        self.vx = np.zeros(self.capacity, dtype=np.float64)
+        self.vy = np.zeros(self.capacity, dtype=np.float64)
+        self.lifetime = np.zeros(self.capacity, dtype=np.int32)
+        self.color_index = np.zeros(self.capacity, dtype=np.int8)
+        self.size = np.zeros(self.capacity, dtype=np.int8)
+        
+        self.atlas, self.atlas_rects = get_particle_atlas()
+        self.alpha_steps = config.PARTICLE_ALPHA_STEPS
+        
+        self.head = 0  # Next slot to write
+        self.recycled_early = 0  # Live particles overwritten because the pool was full
+    
+    def __len__(self):
+        return int(np.count_nonzero(self.lifetime))
+    
+    def spawn(self, x, y, count):
+        """Spawn a burst of particles at a position.
+        
+        Args:
+            x: X position
+            y: Y position
+            count: Number of particles
+        """
+        count = min(count, self.capacity)
+        slots = (self.head + np.arange(count)) % self.capacity
+        self.head = (self.head + count) % self.capacity
+        self.recycled_early += int(np.count_nonzero(self.lifetime[slots]))
+        
+        # Random velocity
+        angle = self.rng.uniform(0, 2 * np.pi, count)
+        speed = self.rng.uniform(*config.PARTICLE_SPEED_RANGE, count)
+        
+        self.x[slots] = x
+        self.y[slots] = y
+        self.vx[slots] = np.cos(angle) * speed
+        self.vy[slots] = np.sin(angle) * speed
+        self.lifetime[slots] = self.max_lifetime
+        self.color_index[slots] = self.rng.integers(0, len(self.colors), count)
+        self.size[slots] = self.rng.integers(2, 6, count)
+    
+    def update(self):
+        """Move all live particles and age them by one frame."""
+        live = self.lifetime > 0
+        if not live.any():
+            return
+        
+        self.x += self.vx
+        self.y += self.vy
+        np.subtract(self.lifetime, 1, out=self.lifetime, where=live)
+    
+    def clear(self):
+        """Expire every particle."""
+        self.lifetime[:] = 0
+    
+    def draw(self, surface, alpha=1.0):
+        """Draw all live particles with one batched blit from the atlas.
+        
+        Args:
+            surface: Pygame surface to draw on
+            alpha: Interpolation between the previous (0) and current (1)
+                   simulation step
+        
+        Returns:
+            List of rects that were drawn
+        """
+        live = np.flatnonzero(self.lifetime)
+        if len(live) == 0:
+            return []
+        
+        size = self.size[live].astype(np.int64)
+        
+        # Fade out based on lifetime, quantized to the atlas alpha steps
+        step = (self.lifetime[live] * self.alpha_steps + self.max_lifetime - 1) // self.max_lifetime - 1
+        key = ((size - 2) * len(self.colors) + self.color_index[live]) * self.alpha_steps + step
+        
+        # Motion is constant per step, so the previous position is one step back
+        back = 1.0 - alpha
+        x = self.x[live] - self.vx[live] * back
+        y = self.y[live] - self.vy[live] * back
+        
+        left = (x.astype(np.int64) - size).tolist()
+        top = (y.astype(np.int64) - size).tolist()
+        atlas = self.atlas
+        rects = self.atlas_rects
+        return surface.blits([(atlas, (lx, ty), rects[k])
+                              for lx, ty, k in zip(left, top, key.tolist())])
@@ -0,0 +1,256 @@
+"""
+Lightweight per-stage profiler with rolling percentiles and a frame-time graph.
+"""
+import csv
+import threading
+import time
+import numpy as np
+import pygame
+import config
+
+# Colors for stages in the frame-time graph, cycled in order of first use
+STAGE_COLORS = [
+    (80, 160, 255), (255, 160, 60), (120, 220, 120), (230, 90, 90),
+    (200, 120, 255), (255, 230, 90), (90, 220, 220), (200, 200, 200),
+]
+
+
+class _Section:
+    """Timer for one stage, used as a context manager."""
+    
+    __slots__ = ('profiler', 'name', 'start')
+    
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+    
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+
+class _NullSection:
+    """Stand-in timer used when profiling is disabled."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class Profiler:
+    """Collects per-frame stage timings in fixed-size ring buffers.
+    
+    Code under measurement wraps itself in `with profiler.section("name"):`.
+    Times for a stage are summed over the frame (stages may run on other
+    threads, e.g. capture and inference, but each stage name should only be
+    timed from one thread), and end_frame() pushes one value per stage plus
+    the total frame time into the rings.
+    """
+    
+    LEGEND_INTERVAL = 15  # Frames between legend updates
+    
+    def __init__(self, enabled=None, history=None):
+        """Initialize the profiler.
+        
+        Args:
+            enabled: Record timings (default config.PROFILER_ENABLED)
+            history: Number of frames kept per stage (default config.PROFILER_HISTORY)
+        """
+        self.enabled = config.PROFILER_ENABLED if enabled is None else enabled
+        self.history = history or config.PROFILER_HISTORY
+        self.lock = threading.Lock()
+        
+        self.sections = {}  # name -> _Section
+        self.rings = {}  # name -> int64 array of nanoseconds per frame
+        self.current = {}  # name -> nanoseconds accumulated this frame
+        self.frame_ring = np.zeros(self.history, dtype=np.int64)
+        self.head = 0  # Next ring slot to write
+        self.frames = 0  # Total frames recorded
+        self.last_frame_ns = None
+        
+        # Rendered legend lines for the overlay
+        self.legend = None
+        self.legend_frame = 0
+    
+    def section(self, name):
+        """Get a timer for a stage.
+        
+        Args:
+            name: Stage name (e.g. "detect.forward")
+        
+        Returns:
+            Context manager that records the time spent inside it
+        """
+        if not self.enabled:
+            return _NULL_SECTION
+        section = self.sections.get(name)
+        if section is None:
+            section = self.sections[name] = _Section(self, name)
+        return section
+    
+    def record(self, name, ns):
+        """Add time to a stage for the current frame.
+        
+        Args:
+            name: Stage name
+            ns: Duration in nanoseconds
+        """
+        with self.lock:
+            self.current[name] = self.current.get(name, 0) + ns
+    
+    def end_frame(self):
+        """Close the current frame and push its timings into the rings."""
+        if not self.enabled:
+            return
+        
+        now = time.perf_counter_ns()
+        with self.lock:
+            current = self.current
+            self.current = {}
+        
+        head = self.head
+        for name, ns in current.items():
+            if name not in self.rings:
+                self.rings[name] = np.zeros(self.history, dtype=np.int64)
+        for name, ring in self.rings.items():
+            ring[head] = current.get(name, 0)
+        
+        self.frame_ring[head] = now - self.last_frame_ns if self.last_frame_ns else 0
+        self.last_frame_ns = now
+        self.head = (head + 1) % self.history
+        self.frames += 1
+    
+    def _ordered(self, ring):
+        """Get the valid part of a ring, oldest first."""
+        if self.frames < self.history:
+            return ring[:self.frames]
+        return np.roll(ring, -self.head)
+    
+    def percentiles(self, name, percents=(50, 95, 99)):
+        """Get rolling percentiles for a stage.
+        
+        Args:
+            name: Stage name, or "frame" for the total frame time
+            percents: Percentiles to compute
+        
+        Returns:
+            List of values in milliseconds (zeros if nothing was recorded)
+        """
+        ring = self.frame_ring if name == "frame" else self.rings.get(name)
+        if ring is None or self.frames == 0:
+            return [0.0] * len(percents)
+        values = self._ordered(ring)
+        return [float(v) / 1e6 for v in np.percentile(values, percents)]
+    
+    def get_summary(self):
+        """Get p50/p95/p99 for every stage and the total frame time.
+        
+        Returns:
+            Dictionary mapping stage name to (p50, p95, p99) in milliseconds
+        """
+        names = ["frame"] + list(self.rings)
+        return {name: tuple(self.percentiles(name)) for name in names}
+    
+    def export_csv(self, path):
+        """Write the buffered per-frame timings to a CSV file.
+        
+        Args:
+            path: Output file path
+        """
+        names = list(self.rings)
+        columns = [self._ordered(self.frame_ring)] + [self._ordered(self.rings[n]) for n in names]
+        first_frame = self.frames - len(columns[0])
+        
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in names])
+            for i, row in enumerate(zip(*columns)):
+                writer.writerow([first_frame + i] + [f"{ns / 1e6:.4f}" for ns in row])
+    
+    def draw_overlay(self, surface, font, rect):
+        """Draw a stacked frame-time graph with a per-stage legend.
+        
+        The graph is built as a pixel array in one vectorized pass; the
+        legend text is only re-rendered every LEGEND_INTERVAL frames.
+        
+        Args:
+            surface: Pygame surface to draw on
+            font: Pygame font for the legend
+            rect: Pygame Rect to draw the graph in
+        
+        Returns:
+            Rect covering everything drawn
+        """
+        width, height = rect.size
+        budget_ms = 1000.0 / config.FPS_TARGET
+        scale = height / (2.0 * budget_ms)  # Graph spans two frame budgets
+        
+        pixels = np.zeros((width, height, 3), dtype=np.uint8)
+        names = list(self.rings)
+        count = min(self.frames, self.history, width)
+        if count:
+            rows = np.arange(height)[None, :]
+            stacked = np.zeros(count)
+            columns = slice(width - count, width)
+            for index, name in enumerate(names):
+                values = self._ordered(self.rings[name])[-count:] / 1e6
+                tops = stacked + values
+                y1 = (height - tops * scale)[:, None]
+                y2 = (height - stacked * scale)[:, None]
+                band = (rows >= y1) & (rows < y2)
+                pixels[columns][band] = STAGE_COLORS[index % len(STAGE_COLORS)]
+                stacked = tops
+        
+        # Frame budget line
+        budget_y = height - int(budget_ms * scale)
+        if 0 <= budget_y < height:
+            pixels[:, budget_y] = 255
+        
+        panel = pygame.surfarray.make_surface(pixels)
+        panel.set_alpha(200)
+        surface.blit(panel, rect)
+        
+        # Legend with rolling p50 / p95
+        if self.legend is None or self.frames - self.legend_frame >= self.LEGEND_INTERVAL:
+            lines = [("frame", (255, 255, 255))] + [
+                (name, STAGE_COLORS[i % len(STAGE_COLORS)]) for i, name in enumerate(names)]
+            texts = []
+            for name, color in lines:
+                p50, p95 = self.percentiles(name, (50, 95))
+                texts.append(font.render(f"{name} {p50:.2f}/{p95:.2f} ms", True, color))
+            self.legend = texts
+            self.legend_frame = self.frames
+        
+        drawn = pygame.Rect(rect)
+        y = rect.top
+        for text in self.legend:
+            drawn.union_ip(surface.blit(text, (rect.right + 8, y)))
+            y += text.get_height()
+        return drawn
+    
+    def reset(self):
+        """Forget all recorded timings."""
+        with self.lock:
+            self.current = {}
+        self.rings = {}
+        self.frame_ring[:] = 0
+        self.head = 0
+        self.frames = 0
+        self.last_frame_ns = None
+        self.legend = None
+
+
+# Shared profiler for the whole game
+profiler = Profiler()
@@ -0,0 +1,249 @@
+"""
+Recording game sessions to disk and replaying them as a frame source.
+
+A recording is a directory with:
+    frames.bin  - JPEG-encoded frames, back to back
+    index.npy   - offset, size and capture time (seconds from the first frame)
+                  of every camera read; failed reads have size 0
+    clock.npy   - every game clock reading, in the order the game made them
+    detection_frames.npy, detection_boxes.npy
+                - the detector's output for every frame the game processed
+                  (see detection_index.py)
+    meta.json   - frame size, frame count, the game's RNG seed, projector
+                  calibration and detector, the camera reads made before the
+                  game loop started, the key presses (with the camera read
+                  they came before) and the reads at which a game was started
+
+The index, clock, detections and metadata are rewritten every
+config.RECORD_FLUSH_FRAMES frames and on every key press, so a session that crashes keeps everything up
+to the last flush.
+"""
+import json
+import os
+import time
+import cv2
+import numpy as np
+import config
+
+# One row of index.npy
+INDEX_DTYPE = np.dtype([('offset', np.int64), ('size', np.int64), ('timestamp', np.float64)])
+
+
+def _replace(path, write, mode="wb"):
+    """Write a file through a temporary copy so readers never see half of it.
+    
+    Args:
+        path: File to write
+        write: Function called with the open temporary file
+        mode: File mode for the temporary file
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, mode) as f:
+        write(f)
+    os.replace(temp_path, path)
+
+
+class Recorder:
+    """Records the inputs of a session: camera frames, clock readings and keys.
+    
+    The game must run capture and detection synchronously while recording,
+    as a replay does, so that it makes the same clock readings in the same
+    order.
+    """
+    
+    def __init__(self, path, seed=None, quality=None):
+        """Start a new recording.
+        
+        Args:
+            path: Directory to write (created if needed)
+            seed: Game RNG seed, stored so a replay can reuse it
+            quality: JPEG quality 0-100 (default config.RECORD_JPEG_QUALITY)
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.quality = config.RECORD_JPEG_QUALITY if quality is None else quality
+        self.frames_file = open(os.path.join(path, "frames.bin"), "wb")
+        self.index = []
+        self.clock_readings = []
+        self.offset = 0
+        self.start_time = None
+        self.detections = None  # DetectionLog, set by the game
+        
+        # Written to meta.json; the game adds its calibration
+        self.meta = {
+            'frames': 0,
+            'frame_size': None,
+            'seed': seed,
+            'calibration': None,
+            'detector': None,
+            'startup_reads': 0,  # Camera reads made while choosing a detector
+            'events': [],  # [read index, pygame key]
+            'play_starts': [],  # Read index at which each game started
+        }
+    
+    def clock(self):
+        """Read the game clock and log the reading.
+        
+        Returns:
+            time.perf_counter() seconds
+        """
+        now = time.perf_counter()
+        self.clock_readings.append(now)
+        return now
+    
+    def write(self, frame, timestamp):
+        """Append one camera read.
+        
+        Args:
+            frame: BGR image, or None if the read failed
+            timestamp: Capture time (game clock seconds)
+        """
+        if self.start_time is None:
+            self.start_time = timestamp
+        
+        data = b""
+        if frame is not None:
+            ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+            if ok:
+                data = encoded.tobytes()
+                if self.meta['frame_size'] is None:
+                    self.meta['frame_size'] = (frame.shape[1], frame.shape[0])
+        
+        self.frames_file.write(data)
+        self.index.append((self.offset, len(data), timestamp - self.start_time))
+        self.offset += len(data)
+        
+        if len(self.index) % config.RECORD_FLUSH_FRAMES == 0:
+            self.flush()
+    
+    def write_event(self, key):
+        """Log a key press before the next camera read.
+        
+        Args:
+            key: pygame key code
+        """
+        self.meta['events'].append([len(self.index), key])
+        self.flush()
+    
+    def mark_play_start(self):
+        """Log that a game starts before the next camera read."""
+        self.meta['play_starts'].append(len(self.index))
+        self.flush()
+    
+    def flush(self):
+        """Write the index, clock log, detections and metadata recorded so far."""
+        if self.frames_file.closed:
+            return
+        
+        # Frames must be on disk before an index that points at them
+        self.frames_file.flush()
+        self.meta['frames'] = len(self.index)
+        index = np.array(self.index, dtype=INDEX_DTYPE)
+        clock_readings = np.array(self.clock_readings, dtype=np.float64)
+        _replace(os.path.join(self.path, "index.npy"), lambda f: np.save(f, index))
+        _replace(os.path.join(self.path, "clock.npy"), lambda f: np.save(f, clock_readings))
+        if self.detections is not None:
+            self.detections.save(self.path)
+        _replace(os.path.join(self.path, "meta.json"),
+                 lambda f: json.dump(self.meta, f, indent=2), mode="w")
+    
+    def close(self):
+        """Finish the recording."""
+        self.flush()
+        self.frames_file.close()
+
+
+class ReplaySource:
+    """Plays a recording back through the cv2.VideoCapture interface.
+    
+    It also acts as the game clock: now() returns the recorded clock
+    readings in order. A replay that runs capture and detection synchronously
+    and gets the recorded key presses (pop_events) makes the same readings as
+    the recorded session, so with the same seed it reproduces the session
+    frame for frame, however fast the host runs it.
+    """
+    
+    def __init__(self, path, realtime=False):
+        """Open a recording.
+        
+        Args:
+            path: Recording directory
+            realtime: Pace frames at their recorded times (False = as fast as possible)
+        """
+        self.index = np.load(os.path.join(path, "index.npy"))
+        self.clock_readings = np.load(os.path.join(path, "clock.npy"))
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.data = (np.memmap(os.path.join(path, "frames.bin"), dtype=np.uint8, mode="r")
+                     if self.index['size'].any() else np.zeros(0, dtype=np.uint8))
+        
+        self.realtime = realtime
+        self.position = 0  # Index of the next camera read
+        self.clock_position = 0  # Index of the next clock reading
+        self.event_position = 0  # Index of the next key press
+        self.opened = True
+        self.finished = False  # Set once the last recorded read has been replayed
+        self.start_wall_time = None
+    
+    def isOpened(self):
+        return self.opened
+    
+    def read(self):
+        """Decode the next frame.
+        
+        Returns:
+            Tuple (ret, frame); ret is False for a recorded failed read and
+            once the recording has ended
+        """
+        if self.position >= len(self.index):
+            self.finished = True
+            return False, None
+        
+        offset, size, timestamp = self.index[self.position]
+        self.position += 1
+        # The recorded session stopped after its last read
+        self.finished = self.position >= len(self.index)
+        
+        if self.realtime:
+            if self.start_wall_time is None:
+                self.start_wall_time = time.perf_counter() - timestamp
+            delay = self.start_wall_time + timestamp - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        
+        if not size:
+            return False, None
+        frame = cv2.imdecode(self.data[offset:offset + size], cv2.IMREAD_COLOR)
+        return frame is not None, frame
+    
+    def now(self):
+        """Get the next recorded game clock reading.
+        
+        Returns:
+            Seconds; the last reading is repeated once they run out, which
+            also marks the replay finished
+        """
+        if self.clock_position >= len(self.clock_readings):
+            self.finished = True
+            return float(self.clock_readings[-1]) if len(self.clock_readings) else 0.0
+        
+        now = float(self.clock_readings[self.clock_position])
+        self.clock_position += 1
+        return now
+    
+    def pop_events(self):
+        """Get the key presses recorded before the next camera read.
+        
+        Returns:
+            List of pygame key codes
+        """
+        events = self.meta['events']
+        keys = []
+        while self.event_position < len(events) and events[self.event_position][0] <= self.position:
+            keys.append(events[self.event_position][1])
+            self.event_position += 1
+        return keys
+    
+    def release(self):
+        self.opened = False
+        self.data = None
@@ -0,0 +1,162 @@
+"""
+Uniform spatial hash grid for broad-phase collision queries.
+"""
+import math
+import numpy as np
+import config
+
+
+class SpatialHashGrid:
+    """Buckets circular items into square cells for fast neighborhood queries.
+    
+    Items are re-bucketed only when the range of cells they overlap changes,
+    so moving an item a few pixels within its cells costs one comparison.
+    """
+    
+    def __init__(self, cell_size=None):
+        """Initialize the grid.
+        
+        Args:
+            cell_size: Side of each cell in pixels (default from config)
+        """
+        self.cell_size = cell_size or config.SPATIAL_GRID_CELL_SIZE
+        self.cells = {}  # (cell_x, cell_y) -> set of items
+        self.item_ranges = {}  # item -> (x0, y0, x1, y1) cell range it occupies
+    
+    def _cell_range(self, x0, y0, x1, y1):
+        """Get the range of cells covering a rectangle.
+        
+        Returns:
+            Tuple (cell_x0, cell_y0, cell_x1, cell_y1), inclusive
+        """
+        size = self.cell_size
+        return (math.floor(x0 / size), math.floor(y0 / size),
+                math.floor(x1 / size), math.floor(y1 / size))
+    
+    def insert(self, item, x, y, radius):
+        """Add an item covering the circle at (x, y).
+        
+        Args:
+            item: Hashable item to store
+            x: Center X
+            y: Center Y
+            radius: Circle radius
+        """
+        cell_range = self._cell_range(x - radius, y - radius, x + radius, y + radius)
+        self.item_ranges[item] = cell_range
+        self._add_to_cells(item, cell_range)
+    
+    def move(self, item, x, y, radius):
+        """Update an item's position, re-bucketing only if its cells changed.
+        
+        Args:
+            item: Item previously inserted
+            x: New center X
+            y: New center Y
+            radius: Circle radius
+        """
+        cell_range = self._cell_range(x - radius, y - radius, x + radius, y + radius)
+        old_range = self.item_ranges.get(item)
+        if cell_range == old_range:
+            return
+        
+        if old_range is not None:
+            self._remove_from_cells(item, old_range)
+        self.item_ranges[item] = cell_range
+        self._add_to_cells(item, cell_range)
+    
+    def move_batch(self, items, x, y, radius, prev_x, prev_y):
+        """Update many items at once, re-bucketing only those that changed cells.
+        
+        Args:
+            items: Array of items previously inserted
+            x, y: Arrays of new centers
+            radius: Array of radii
+            prev_x, prev_y: Arrays of the centers the items were last placed at
+        """
+        size = self.cell_size
+        changed = ((np.floor((x - radius) / size) != np.floor((prev_x - radius) / size)) |
+                   (np.floor((x + radius) / size) != np.floor((prev_x + radius) / size)) |
+                   (np.floor((y - radius) / size) != np.floor((prev_y - radius) / size)) |
+                   (np.floor((y + radius) / size) != np.floor((prev_y + radius) / size)))
+        
+        rows = np.flatnonzero(changed)
+        for item, item_x, item_y, item_radius in zip(np.asarray(items)[rows].tolist(),
+                                                     x[rows].tolist(), y[rows].tolist(),
+                                                     radius[rows].tolist()):
+            self.move(item, item_x, item_y, item_radius)
+    
+    def remove(self, item):
+        """Remove an item from the grid.
+        
+        Args:
+            item: Item to remove (ignored if not present)
+        """
+        cell_range = self.item_ranges.pop(item, None)
+        if cell_range is not None:
+            self._remove_from_cells(item, cell_range)
+    
+    def query(self, x, y, radius):
+        """Get items whose cells overlap a circle's bounding box.
+        
+        Args:
+            x: Center X
+            y: Center Y
+            radius: Query radius
+        
+        Returns:
+            Set of candidate items (a superset of the true hits)
+        """
+        return self.query_rect(x - radius, y - radius, x + radius, y + radius)
+    
+    def query_rect(self, x0, y0, x1, y1):
+        """Get items whose cells overlap a rectangle.
+        
+        Args:
+            x0, y0: Top-left corner
+            x1, y1: Bottom-right corner
+        
+        Returns:
+            Set of candidate items
+        """
+        cx0, cy0, cx1, cy1 = self._cell_range(x0, y0, x1, y1)
+        found = set()
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found |= bucket
+        return found
+    
+    def clear(self):
+        """Remove all items."""
+        self.cells = {}
+        self.item_ranges = {}
+    
+    def __len__(self):
+        return len(self.item_ranges)
+    
+    def _add_to_cells(self, item, cell_range):
+        """Add an item to every cell in a range."""
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = {item}
+                else:
+                    bucket.add(item)
+    
+    def _remove_from_cells(self, item, cell_range):
+        """Remove an item from every cell in a range, dropping empty cells."""
+        cx0, cy0, cx1, cy1 = cell_range
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(item)
+                    if not bucket:
+                        del cells[(cx, cy)]
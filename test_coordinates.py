@@ -22,7 +22,12 @@ def main():
     
     # Initialize components
     hand_tracker = HandTracker()
-    coord_mapper = CoordinateMapper()
+    # The frame is flipped below, so the mapper must not mirror again
+    coord_mapper = CoordinateMapper(mirror=False)
+    if coord_mapper.calibrated:
+        # This test shows the plain proportional mapping
+        print(f"Ignoring the saved projector calibration in {config.CALIBRATION_FILE}")
+        coord_mapper.reset_calibration()
     camera = cv2.VideoCapture(config.CAMERA_INDEX)
     
     # Initialize Pygame for screen visualization
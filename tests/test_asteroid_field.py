@@ -0,0 +1,108 @@
+"""
+Tests for the structure-of-arrays asteroid storage in asteroid_field.py.
+"""
+import numpy as np
+from asteroid_field import AsteroidField
+
+SCREEN_HEIGHT = 720
+
+
+class ReferenceAsteroid:
+    """One asteroid as a plain object, updated the way the old per-object list was."""
+    
+    def __init__(self, asteroid_id, x, y, radius, speed, spin):
+        self.id = asteroid_id
+        self.x = x
+        self.y = y
+        self.radius = radius
+        self.speed = speed
+        self.angle = 0.0
+        self.spin = spin
+        self.alive = True
+    
+    def update(self):
+        self.y += self.speed
+        self.angle += self.spin
+    
+    def is_off_screen(self, screen_height):
+        return self.y - self.radius > screen_height
+
+
+def reference_update(asteroids):
+    """Move every asteroid, then drop the off-screen ones as the old game loop did."""
+    for asteroid in asteroids:
+        asteroid.update()
+    removed = [asteroid for asteroid in asteroids if asteroid.is_off_screen(SCREEN_HEIGHT)]
+    missed = sum(asteroid.alive for asteroid in removed)
+    asteroids[:] = [asteroid for asteroid in asteroids if not asteroid.is_off_screen(SCREEN_HEIGHT)]
+    return [asteroid.id for asteroid in removed], missed
+
+
+def assert_same(field, asteroids):
+    n = len(field)
+    assert n == len(asteroids)
+    assert field.ids[:n].tolist() == [asteroid.id for asteroid in asteroids]
+    assert field.x[:n].tolist() == [asteroid.x for asteroid in asteroids]
+    assert field.y[:n].tolist() == [asteroid.y for asteroid in asteroids]
+    assert field.radius[:n].tolist() == [asteroid.radius for asteroid in asteroids]
+    assert field.speed[:n].tolist() == [asteroid.speed for asteroid in asteroids]
+    assert field.angle[:n].tolist() == [asteroid.angle for asteroid in asteroids]
+    assert field.alive[:n].all()
+
+
+def test_field_matches_per_asteroid_reference():
+    rng = np.random.default_rng(13)
+    field = AsteroidField(capacity=4)  # Small, so the arrays have to grow
+    asteroids = []
+    
+    for _ in range(600):
+        for _ in range(rng.poisson(0.6)):
+            x = float(rng.uniform(0, 1280))
+            y = float(rng.uniform(-80, 0))
+            radius = float(rng.integers(15, 60))
+            speed = float(rng.uniform(1, 9))
+            spin = float(rng.uniform(-3, 3))
+            asteroid_id = field.spawn(x, y, radius, speed, spin)
+            asteroids.append(ReferenceAsteroid(asteroid_id, x, y, radius, speed, spin))
+        
+        removed_ids, missed = field.update(SCREEN_HEIGHT)
+        expected_ids, expected_missed = reference_update(asteroids)
+        assert removed_ids.tolist() == expected_ids
+        assert missed == expected_missed
+        
+        if asteroids and rng.random() < 0.3:
+            hit = rng.choice(len(asteroids), size=rng.integers(1, min(4, len(asteroids)) + 1),
+                             replace=False)
+            hit_ids = np.array([asteroids[i].id for i in hit])
+            field.kill(hit_ids)
+            asteroids = [asteroid for asteroid in asteroids if asteroid.id not in hit_ids]
+        
+        assert_same(field, asteroids)
+    
+    assert field.capacity > 4
+
+
+def test_slots_after_removals():
+    field = AsteroidField(capacity=8)
+    for i in range(20):
+        field.spawn(float(i), 0.0, 10.0, 1.0 + i, 0.0)
+    field.kill(np.array([0, 3, 4, 11, 19]))
+    
+    ids = np.array([17, 1, 12, 2])
+    
+    slots = field.slots(ids)
+    
+    assert field.ids[slots].tolist() == ids.tolist()
+    assert field.x[slots].tolist() == [17.0, 1.0, 12.0, 2.0]
+
+
+def test_kill_nothing_and_clear():
+    field = AsteroidField(capacity=2)
+    field.spawn(0.0, 0.0, 10.0, 1.0)
+    field.kill(np.array([], dtype=np.int64))
+    assert len(field) == 1
+    
+    field.clear()
+    
+    assert len(field) == 0
+    assert field.spawn(0.0, 0.0, 10.0, 1.0) == 0
@@ -0,0 +1,86 @@
+"""
+Tests for corner ordering and marker detection in calibration.py.
+"""
+import itertools
+import cv2
+import numpy as np
+import pytest
+import config
+from calibration import detect_corner_markers, get_marker_positions, order_corners
+from coordinate_mapper import CoordinateMapper
+
+SCREEN_SIZE = (1280, 720)
+CAMERA_SIZE = (640, 480)
+
+# A tilted projection as the camera sees it: top-left, top-right,
+# bottom-right, bottom-left corners of the screen, normalized
+QUAD = [(0.18, 0.12), (0.86, 0.08), (0.93, 0.88), (0.08, 0.92)]
+
+
+@pytest.fixture(autouse=True)
+def no_saved_calibration(monkeypatch):
+    """Keep a calibration.json in the working tree out of the tests."""
+    monkeypatch.setattr(config, "CALIBRATION_FILE", None)
+
+
+@pytest.mark.parametrize("order", list(itertools.permutations(range(4))))
+def test_order_corners(order):
+    points = np.array(QUAD)[list(order)]
+    
+    assert order_corners(points).tolist() == np.array(QUAD).tolist()
+
+
+@pytest.mark.parametrize("order", list(itertools.permutations(range(4))))
+def test_order_corners_mirrored(order):
+    # In the mirrored view the camera's right-hand points are on the left
+    points = np.array(QUAD)[list(order)]
+    expected = np.array(QUAD)[[1, 0, 3, 2]]
+    
+    assert order_corners(points, mirror=True).tolist() == expected.tolist()
+
+
+def screen_to_camera(mirror):
+    """Homography from screen pixels to camera pixels for the test projection."""
+    width, height = SCREEN_SIZE
+    quad = [((1 - x) if mirror else x, y) for x, y in QUAD]
+    camera = np.float32([(x * CAMERA_SIZE[0], y * CAMERA_SIZE[1]) for x, y in quad])
+    screen = np.float32([(0, 0), (width, 0), (width, height), (0, height)])
+    return cv2.getPerspectiveTransform(screen, camera)
+
+
+def render_markers(mirror):
+    """Camera frame of the projected calibration screen."""
+    screen = np.zeros((SCREEN_SIZE[1], SCREEN_SIZE[0], 3), dtype=np.uint8)
+    half = config.CALIBRATION_MARKER_SIZE // 2
+    for x, y in get_marker_positions(*SCREEN_SIZE):
+        cv2.rectangle(screen, (x - half, y - half), (x + half, y + half), (255, 255, 255), -1)
+    return cv2.warpPerspective(screen, screen_to_camera(mirror), CAMERA_SIZE)
+
+
+@pytest.mark.parametrize("mirror", [False, True])
+def test_detected_markers_calibrate_onto_screen(mirror):
+    frame = render_markers(mirror)
+    
+    markers = detect_corner_markers(frame, mirror)
+    
+    assert markers is not None
+    screen_points = get_marker_positions(*SCREEN_SIZE)
+    mapper = CoordinateMapper(*SCREEN_SIZE, mirror=mirror)
+    assert mapper.calibrate([(cx, cy, sx, sy) for (cx, cy), (sx, sy) in zip(markers, screen_points)])
+    
+    # Markers land on their screen positions
+    for (cx, cy), (sx, sy) in zip(markers, screen_points):
+        x, y = mapper.map_to_screen(cx, cy)
+        assert abs(x - sx) <= 2 and abs(y - sy) <= 2
+    
+    # So do the screen corners as the camera sees them
+    width, height = SCREEN_SIZE
+    corners = np.float32([[(0, 0), (width - 1, 0), (width - 1, height - 1), (0, height - 1)]])
+    camera_corners = cv2.perspectiveTransform(corners, screen_to_camera(mirror))[0] / CAMERA_SIZE
+    for (cx, cy), (sx, sy) in zip(camera_corners, corners[0]):
+        x, y = mapper.map_to_screen(cx, cy)
+        assert abs(x - sx) <= 3 and abs(y - sy) <= 3
+
+
+def test_no_markers():
+    assert detect_corner_markers(np.zeros((480, 640, 3), dtype=np.uint8)) is None
@@ -0,0 +1,71 @@
+"""
+Tests for batch point mapping in coordinate_mapper.py.
+"""
+import numpy as np
+import pytest
+import config
+from coordinate_mapper import CoordinateMapper
+
+
+@pytest.fixture(autouse=True)
+def no_saved_calibration(monkeypatch):
+    """Keep a calibration.json in the working tree out of the tests."""
+    monkeypatch.setattr(config, "CALIBRATION_FILE", None)
+
+
+def make_mapper(mirror, calibrated):
+    mapper = CoordinateMapper(1280, 720, mirror=mirror)
+    if calibrated:
+        # Projector seen at an angle: a trapezoid in the camera image
+        corners = [(0.15, 0.10, 0, 0), (0.85, 0.05, 1279, 0),
+                   (0.95, 0.90, 1279, 719), (0.05, 0.95, 0, 719)]
+        if mirror:
+            corners = [(1 - cx, cy, sx, sy) for cx, cy, sx, sy in corners]
+        assert mapper.calibrate(corners)
+    return mapper
+
+
+def random_points(count):
+    rng = np.random.default_rng(9)
+    points = rng.uniform(-0.2, 1.2, size=(count, 2))
+    points[:4] = [(0, 0), (1, 1), (0.5, 0.5), (1, 0)]
+    return points
+
+
+@pytest.mark.parametrize("mirror", [False, True])
+@pytest.mark.parametrize("calibrated", [False, True])
+def test_map_to_screen_batch_matches_single(mirror, calibrated):
+    mapper = make_mapper(mirror, calibrated)
+    points = random_points(500)
+    
+    expected = [mapper.map_to_screen(x, y) for x, y in points.tolist()]
+    
+    assert [tuple(point) for point in mapper.map_to_screen_batch(points).tolist()] == expected
+
+
+@pytest.mark.parametrize("mirror", [False, True])
+@pytest.mark.parametrize("calibrated", [False, True])
+def test_inverse_map_batch_matches_single(mirror, calibrated):
+    mapper = make_mapper(mirror, calibrated)
+    points = random_points(500) * (1280, 720)
+    
+    expected = [mapper.inverse_map(x, y) for x, y in points.tolist()]
+    
+    assert [tuple(point) for point in mapper.inverse_map_batch(points).tolist()] == expected
+
+
+def test_map_to_screen_batch_on_the_horizon():
+    mapper = CoordinateMapper(1280, 720, mirror=False)
+    # w = 1 - x, so x = 1 is the horizon line
+    mapper.set_matrix([[1000, 0, 0], [0, 700, 0], [-1, 0, 1]])
+    points = np.array([(1.0, 0.5), (1.0 - 1e-9, 0.5), (1.0 + 1e-9, 0.5), (0.5, 0.5)])
+    
+    screen = mapper.map_to_screen_batch(points)
+    
+    assert screen.tolist() == [list(mapper.map_to_screen(x, y)) for x, y in points.tolist()]
+    assert screen[:3, 0].tolist() == [1279, 1279, 0]
+
+
+def test_map_to_screen_batch_empty():
+    mapper = make_mapper(False, True)
+    assert mapper.map_to_screen_batch([]).shape == (0, 2)
@@ -0,0 +1,111 @@
+"""
+Tests for detector auto-selection in detectors.py.
+"""
+import time
+import numpy as np
+import pytest
+import config
+import detectors
+from detectors import Detection, Detector, _agreement, select_detector
+
+
+def agreement_reference(positions, reference, tolerance):
+    """Agreement over the frames where either side sees a target."""
+    counted = [(position, expected) for position, expected in zip(positions, reference)
+               if position is not None or expected is not None]
+    if not counted:
+        return 0.0
+    agree = [position is not None and expected is not None
+             and np.hypot(position[0] - expected[0], position[1] - expected[1]) <= tolerance
+             for position, expected in counted]
+    return sum(agree) / len(counted)
+
+
+def random_positions(rng, count, seen):
+    return [tuple(rng.random(2)) if rng.random() < seen else None for _ in range(count)]
+
+
+def test_agreement_matches_reference():
+    rng = np.random.default_rng(25)
+    for _ in range(200):
+        reference = random_positions(rng, 30, 0.5)
+        # Jitter some of the reference positions, drop or invent others
+        positions = [
+            None if rng.random() < 0.1 else
+            (tuple(np.add(expected, rng.normal(0, 0.04, 2))) if expected is not None
+             else (tuple(rng.random(2)) if rng.random() < 0.2 else None))
+            for expected in reference
+        ]
+        
+        assert _agreement(positions, reference) == pytest.approx(
+            agreement_reference(positions, reference, config.AUTO_DETECTOR_TOLERANCE))
+
+
+def test_agreement_ignores_empty_frames():
+    reference = [None] * 28 + [(0.5, 0.5), (0.2, 0.2)]
+    assert _agreement([None] * 30, reference) == 0.0
+    assert _agreement([None] * 30, [None] * 30) == 0.0
+
+
+class FakeDetector(Detector):
+    """Returns scripted positions; frames are frame numbers."""
+    
+    created = []
+    
+    def __init__(self, positions, delay):
+        self.positions = positions
+        self.delay = delay
+        self.closed = False
+        FakeDetector.created.append(self)
+    
+    def detect(self, frame):
+        time.sleep(self.delay)
+        position = self.positions[frame]
+        return [Detection(position, 1.0, None)] if position is not None else []
+    
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_backends(monkeypatch):
+    """Install scripted backends: name -> (positions, seconds per frame)."""
+    backends = {}
+    
+    def create(name, frames=None):
+        detector = FakeDetector(*backends[name])
+        detector.name = name
+        return detector
+    
+    FakeDetector.created = []
+    monkeypatch.setattr(detectors, "available_detectors", lambda: list(backends))
+    monkeypatch.setattr(detectors, "create_detector", create)
+    monkeypatch.setattr(config, "AUTO_DETECTOR_REFERENCE", "reference")
+    return backends
+
+
+def test_select_detector_picks_fastest_that_agrees(fake_backends):
+    rng = np.random.default_rng(1)
+    truth = random_positions(rng, 20, 0.8)
+    fake_backends["reference"] = (truth, 0.004)
+    fake_backends["fast"] = (truth, 0.0)
+    fake_backends["wrong"] = ([None] * 20, 0.0)
+    
+    chosen = select_detector(list(range(20)))
+    
+    assert chosen.name == "fast"
+    assert [detector.name for detector in FakeDetector.created] == ["reference", "fast", "wrong"]
+    assert [detector.closed for detector in FakeDetector.created] == [True, False, True]
+
+
+def test_select_detector_keeps_reference_without_targets(fake_backends):
+    few = [None] * 20
+    few[3] = (0.5, 0.5)
+    fake_backends["reference"] = (few, 0.004)
+    fake_backends["fast"] = (few, 0.0)
+    
+    chosen = select_detector(list(range(20)))
+    
+    assert chosen.name == "reference"
+    # The others are not even built
+    assert [detector.name for detector in FakeDetector.created] == ["reference"]
@@ -0,0 +1,97 @@
+"""
+Tests for prediction and coasting in motion_filter.py.
+"""
+import pytest
+from motion_filter import KalmanFilter2D
+
+START = (0.2, 0.6)
+VELOCITY = (0.5, -0.25)  # Units per second
+FRAME_TIME = 1 / 30
+
+
+def position_at(t):
+    """Analytic constant-velocity position."""
+    return (START[0] + VELOCITY[0] * t, START[1] + VELOCITY[1] * t)
+
+
+def tracked_filter(frames=60, **kwargs):
+    """Filter fed exact measurements of the constant-velocity ball."""
+    kalman = KalmanFilter2D(measurement_noise=1e-3, **kwargs)
+    for frame in range(frames):
+        t = frame * FRAME_TIME
+        kalman.update(position_at(t), t)
+    return kalman, (frames - 1) * FRAME_TIME
+
+
+def test_predicts_constant_velocity():
+    kalman, last = tracked_filter()
+    
+    assert kalman.get_velocity() == pytest.approx(VELOCITY, abs=1e-3)
+    for ahead in (0.0, 0.02, 0.05, 0.1):
+        assert kalman.predict(last + ahead) == pytest.approx(position_at(last + ahead), abs=1e-3)
+
+
+def test_predict_leaves_state_alone():
+    kalman, last = tracked_filter()
+    state = kalman.state.copy()
+    
+    kalman.predict(last + 0.1)
+    
+    assert (kalman.state == state).all()
+
+
+def test_prediction_is_capped():
+    kalman, last = tracked_filter(max_coast=0.2, max_prediction=0.1)
+    capped = position_at(last + 0.1)
+    
+    assert kalman.predict(last + 0.15) == pytest.approx(capped, abs=1e-3)
+    assert kalman.predict(last + 0.3) == pytest.approx(capped, abs=1e-3)
+    # Past max_coast + max_prediction the track is too stale to predict from
+    assert kalman.predict(last + 0.31) is None
+
+
+def test_prediction_does_not_go_backwards():
+    kalman, last = tracked_filter()
+    
+    assert kalman.predict(last - 0.1) == pytest.approx(position_at(last), abs=1e-3)
+
+
+def test_coasts_through_short_dropout():
+    kalman, last = tracked_filter(max_coast=0.2, max_prediction=0.15)
+    
+    # Short enough that the prediction isn't capped
+    for frame in range(1, 5):
+        t = last + frame * FRAME_TIME
+        kalman.mark_missing(t)
+        assert kalman.initialized
+        assert kalman.predict(t) == pytest.approx(position_at(t), abs=1e-3)
+    
+    # The track picks up again where the ball is
+    t = last + 5 * FRAME_TIME
+    kalman.update(position_at(t), t)
+    assert kalman.predict(t + FRAME_TIME) == pytest.approx(position_at(t + FRAME_TIME), abs=1e-3)
+
+
+def test_resets_after_long_dropout():
+    kalman, last = tracked_filter(max_coast=0.2)
+    
+    kalman.mark_missing(last + 0.2)
+    assert kalman.initialized
+    kalman.mark_missing(last + 0.21)
+    
+    assert not kalman.initialized
+    assert kalman.predict(last + 0.21) is None
+    
+    # The next measurement starts a new track at rest
+    kalman.update((0.9, 0.1), last + 0.25)
+    assert kalman.predict(last + 0.3) == pytest.approx((0.9, 0.1))
+    assert kalman.get_velocity() == (0.0, 0.0)
+
+
+def test_ignores_stale_measurement():
+    kalman, last = tracked_filter()
+    state = kalman.state.copy()
+    
+    kalman.update((0.0, 0.0), last - FRAME_TIME)
+    
+    assert (kalman.state == state).all()
@@ -0,0 +1,37 @@
+"""
+Tests for the Hungarian assignment in multi_tracker.py.
+"""
+import itertools
+import numpy as np
+import pytest
+from multi_tracker import linear_assignment
+
+
+def best_total_cost(cost):
+    """Minimum assignment cost by trying every pairing."""
+    n, m = cost.shape
+    if n > m:
+        return best_total_cost(cost.T)
+    return min(cost[range(n), columns].sum() for columns in itertools.permutations(range(m), n))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (5, 5), (2, 6), (6, 2), (4, 7), (7, 4)])
+def test_linear_assignment_is_optimal(shape):
+    rng = np.random.default_rng(sum(shape))
+    for _ in range(20):
+        cost = rng.uniform(0, 100, size=shape)
+        # Ties and gated pairs, as the tracker produces
+        cost[rng.random(shape) < 0.2] = 1e6
+        cost[0, :] = cost[0, 0]
+        
+        pairs = linear_assignment(cost)
+        
+        assert len(pairs) == min(shape)
+        assert len(set(pairs[:, 0].tolist())) == len(pairs)
+        assert len(set(pairs[:, 1].tolist())) == len(pairs)
+        assert cost[pairs[:, 0], pairs[:, 1]].sum() == pytest.approx(best_total_cost(cost))
+
+
+@pytest.mark.parametrize("shape", [(0, 0), (0, 3), (3, 0)])
+def test_linear_assignment_empty(shape):
+    assert linear_assignment(np.zeros(shape)).shape == (0, 2)
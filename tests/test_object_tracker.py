@@ -0,0 +1,71 @@
+"""
+Tests for the vectorized SSD post-processing in object_tracker.py.
+"""
+import cv2
+import numpy as np
+import pytest
+from object_tracker import decode_detections, prepare_blob
+
+
+def decode_detections_reference(detections, target_class, confidence_threshold, region):
+    """Per-row decoding loop that decode_detections replaced."""
+    rx1, ry1, rx2, ry2 = region
+    region_width = rx2 - rx1
+    region_height = ry2 - ry1
+    boxes = []
+    confidences = []
+    for i in range(detections.shape[2]):
+        confidence = detections[0, 0, i, 2]
+        class_id = int(detections[0, 0, i, 1])
+        if class_id == target_class and confidence > confidence_threshold:
+            box = detections[0, 0, i, 3:7] * np.array([region_width, region_height,
+                                                       region_width, region_height])
+            box += np.array([rx1, ry1, rx1, ry1])
+            boxes.append(tuple(box.astype("int")))
+            confidences.append(float(confidence))
+    return boxes, confidences
+
+
+def random_detections(rng, count):
+    """Network-like output with a mix of classes, confidences and boxes."""
+    detections = np.zeros((1, 1, count, 7), dtype=np.float32)
+    rows = detections[0, 0]
+    rows[:, 1] = rng.choice([5, 15, 37], size=count)
+    rows[:, 2] = rng.random(count)
+    rows[:, 2][:3] = 0.5  # Exactly at the threshold
+    corners = np.sort(rng.uniform(-0.1, 1.1, size=(count, 2, 2)), axis=1)
+    rows[:, 3:7] = corners.transpose(0, 2, 1).reshape(count, 4)[:, [0, 2, 1, 3]]
+    return detections
+
+
+@pytest.mark.parametrize("region", [(0, 0, 640, 480), (120, 80, 420, 380), (7, 3, 307, 303)])
+def test_decode_detections_matches_loop(region):
+    rng = np.random.default_rng(5)
+    detections = random_detections(rng, 100)
+    
+    boxes, confidences = decode_detections(detections, 37, 0.5, region)
+    expected_boxes, expected_confidences = decode_detections_reference(detections, 37, 0.5, region)
+    
+    assert [tuple(box) for box in boxes.tolist()] == expected_boxes
+    assert confidences.tolist() == expected_confidences
+
+
+def test_decode_detections_empty():
+    boxes, confidences = decode_detections(np.zeros((1, 1, 0, 7), dtype=np.float32),
+                                           37, 0.5, (0, 0, 640, 480))
+    assert boxes.shape == (0, 4)
+    assert confidences.shape == (0,)
+
+
+@pytest.mark.parametrize("shape", [(480, 640, 3), (300, 300, 3), (721, 1283, 3)])
+def test_prepare_blob_matches_blob_from_image(shape):
+    rng = np.random.default_rng(11)
+    image = rng.integers(0, 256, size=shape, dtype=np.uint8)
+    size = 300
+    resize_buffer = np.empty((size, size, 3), dtype=np.uint8)
+    blob = np.empty((1, 3, size, size), dtype=np.float32)
+    
+    prepare_blob(image, resize_buffer, blob)
+    expected = cv2.dnn.blobFromImage(cv2.resize(image, (size, size)), 0.007843, (size, size), 127.5)
+    
+    assert np.array_equal(blob, expected)
@@ -0,0 +1,132 @@
+"""
+Tests for the ring-buffer particle pool in particle_pool.py.
+"""
+from collections import deque
+import numpy as np
+import pytest
+import config
+from particle_pool import ParticlePool, get_particle_atlas
+
+
+class ReferenceParticle:
+    """One particle as a plain object, like the old per-particle list."""
+    
+    def __init__(self, x, y, angle, speed, color_index, size):
+        self.x = x
+        self.y = y
+        self.vx = np.cos(angle) * speed
+        self.vy = np.sin(angle) * speed
+        self.lifetime = config.PARTICLE_LIFETIME
+        self.color_index = color_index
+        self.size = size
+    
+    def update(self):
+        self.x += self.vx
+        self.y += self.vy
+        self.lifetime -= 1
+
+
+class ReferencePool:
+    """A list of particles capped at the pool capacity, oldest dropped first."""
+    
+    def __init__(self, capacity, rng):
+        self.particles = deque(maxlen=capacity)  # Expired particles keep their slot
+        self.rng = rng
+        self.recycled_early = 0
+    
+    def spawn(self, x, y, count):
+        count = min(count, self.particles.maxlen)
+        angles = self.rng.uniform(0, 2 * np.pi, count)
+        speeds = self.rng.uniform(*config.PARTICLE_SPEED_RANGE, count)
+        colors = self.rng.integers(0, len(config.PARTICLE_COLORS), count)
+        sizes = self.rng.integers(2, 6, count)
+        for i in range(count):
+            if len(self.particles) == self.particles.maxlen and self.particles[0].lifetime > 0:
+                self.recycled_early += 1
+            self.particles.append(ReferenceParticle(x, y, angles[i], speeds[i], colors[i], sizes[i]))
+    
+    def update(self):
+        for particle in self.particles:
+            if particle.lifetime > 0:
+                particle.update()
+    
+    def live(self):
+        return sorted((p.x, p.y, p.vx, p.vy, p.lifetime, p.color_index, p.size)
+                      for p in self.particles if p.lifetime > 0)
+
+
+def pool_live(pool):
+    live = np.flatnonzero(pool.lifetime)
+    return sorted(zip(pool.x[live].tolist(), pool.y[live].tolist(), pool.vx[live].tolist(),
+                      pool.vy[live].tolist(), pool.lifetime[live].tolist(),
+                      pool.color_index[live].tolist(), pool.size[live].tolist()))
+
+
+@pytest.mark.parametrize("capacity", [2048, 40])
+def test_pool_matches_per_particle_reference(capacity):
+    pool = ParticlePool(capacity=capacity, rng=np.random.default_rng(14))
+    reference = ReferencePool(capacity, np.random.default_rng(14))
+    rng = np.random.default_rng(1)
+    
+    for _ in range(300):
+        if rng.random() < 0.2:
+            x, y = rng.uniform(0, 1280), rng.uniform(0, 720)
+            count = int(rng.integers(1, 60))
+            pool.spawn(x, y, count)
+            reference.spawn(x, y, count)
+        
+        pool.update()
+        reference.update()
+        
+        live = reference.live()
+        assert len(pool) == len(live)
+        assert pool_live(pool) == pytest.approx(live)
+        assert pool.recycled_early == reference.recycled_early
+    
+    if capacity == 40:
+        assert pool.recycled_early > 0
+
+
+def test_particles_expire():
+    pool = ParticlePool(capacity=16, rng=np.random.default_rng(0))
+    pool.spawn(100.0, 100.0, 10)
+    
+    for _ in range(config.PARTICLE_LIFETIME - 1):
+        pool.update()
+    assert len(pool) == 10
+    
+    pool.update()
+    assert len(pool) == 0
+
+
+class RecordingSurface:
+    """Stands in for a pygame surface and keeps what was blitted."""
+    
+    def blits(self, blit_list):
+        self.blit_list = blit_list
+        return []
+
+
+@pytest.mark.parametrize("lifetime", range(1, config.PARTICLE_LIFETIME + 1))
+def test_atlas_sprite_for_lifetime(lifetime):
+    atlas, rects = get_particle_atlas()
+    colors = config.PARTICLE_COLORS
+    steps = config.PARTICLE_ALPHA_STEPS
+    
+    pool = ParticlePool(capacity=4, rng=np.random.default_rng(0))
+    pool.spawn(50.0, 50.0, 1)
+    pool.lifetime[pool.lifetime > 0] = lifetime
+    surface = RecordingSurface()
+    pool.draw(surface)
+    
+    # Lowest pre-rendered alpha level at or above the particle's remaining life
+    fraction = lifetime / config.PARTICLE_LIFETIME
+    step = next(s for s in range(steps) if (s + 1) / steps >= fraction - 1e-12)
+    size = int(pool.size[0])
+    key = ((size - 2) * len(colors) + int(pool.color_index[0])) * steps + step
+    
+    (_, _, rect), = surface.blit_list
+    assert rect == rects[key]
+    assert rect.size == (2 * size, 2 * size)
+    assert tuple(atlas.get_at(rect.center)) == (*colors[pool.color_index[0]],
+                                                int(255 * (step + 1) / steps))
@@ -0,0 +1,55 @@
+"""
+Tests for batch updates in spatial_grid.py.
+"""
+import numpy as np
+from spatial_grid import SpatialHashGrid
+
+
+def test_move_batch_matches_move():
+    rng = np.random.default_rng(3)
+    count = 200
+    ids = np.arange(count)
+    x = rng.uniform(-50, 1330, count)
+    y = rng.uniform(-50, 770, count)
+    radius = rng.uniform(5, 90, count)
+    
+    batched = SpatialHashGrid(cell_size=64)
+    single = SpatialHashGrid(cell_size=64)
+    for grid in (batched, single):
+        for item, item_x, item_y, item_radius in zip(ids.tolist(), x.tolist(), y.tolist(),
+                                                     radius.tolist()):
+            grid.insert(item, item_x, item_y, item_radius)
+    
+    for _ in range(100):
+        prev_x = x
+        prev_y = y
+        x = x + rng.normal(0, 8, count)
+        y = y + rng.uniform(0, 12, count)
+        
+        batched.move_batch(ids, x, y, radius, prev_x, prev_y)
+        for item, item_x, item_y, item_radius in zip(ids.tolist(), x.tolist(), y.tolist(),
+                                                     radius.tolist()):
+            single.move(item, item_x, item_y, item_radius)
+        
+        assert batched.item_ranges == single.item_ranges
+        assert batched.cells == single.cells
+    
+    # Same as building the grid from scratch at the final positions
+    fresh = SpatialHashGrid(cell_size=64)
+    for item, item_x, item_y, item_radius in zip(ids.tolist(), x.tolist(), y.tolist(),
+                                                 radius.tolist()):
+        fresh.insert(item, item_x, item_y, item_radius)
+    assert batched.cells == fresh.cells
+
+
+def test_move_batch_subset():
+    grid = SpatialHashGrid(cell_size=10)
+    for item in range(3):
+        grid.insert(item, 5.0, 5.0, 1.0)
+    
+    ids = np.array([0, 2])
+    grid.move_batch(ids, np.array([5.0, 25.0]), np.array([5.0, 5.0]), np.array([1.0, 1.0]),
+                    np.array([5.0, 5.0]), np.array([5.0, 5.0]))
+    
+    assert grid.query(5.0, 5.0, 1.0) == {0, 1}
+    assert grid.query(25.0, 5.0, 1.0) == {2}
@@ -0,0 +1,59 @@
+"""
+Tests for the swept collision test in utils.py.
+"""
+import numpy as np
+import pytest
+from utils import segment_circle_impact
+
+STEPS = 20000
+
+
+def first_touch_sampled(start, end, center, radius):
+    """First sampled time the moving point is within the circle, or inf."""
+    t = np.linspace(0.0, 1.0, STEPS + 1)
+    x = start[0] + t * (end[0] - start[0])
+    y = start[1] + t * (end[1] - start[1])
+    inside = np.flatnonzero(np.hypot(x - center[0], y - center[1]) <= radius)
+    return t[inside[0]] if len(inside) else np.inf
+
+
+def test_segment_circle_impact_matches_sampling():
+    rng = np.random.default_rng(12)
+    for _ in range(50):
+        start = tuple(rng.uniform(0, 400, 2))
+        end = tuple(rng.uniform(0, 400, 2))
+        centers = rng.uniform(0, 400, size=(40, 2))
+        radii = rng.uniform(5, 60, 40)
+        
+        toi = segment_circle_impact(start, end, centers, radii)
+        
+        for time_of_impact, center, radius in zip(toi, centers, radii):
+            expected = first_touch_sampled(start, end, center, radius)
+            if np.isinf(expected):
+                # A graze between two samples can still be a hit, on the circle
+                if not np.isinf(time_of_impact):
+                    x = start[0] + time_of_impact * (end[0] - start[0])
+                    y = start[1] + time_of_impact * (end[1] - start[1])
+                    assert np.hypot(x - center[0], y - center[1]) == pytest.approx(radius)
+            else:
+                assert time_of_impact <= expected
+                assert expected - time_of_impact <= 1.0 / STEPS
+
+
+def test_segment_circle_impact_stationary_point():
+    centers = np.array([(0.0, 0.0), (10.0, 0.0)])
+    radii = np.array([2.0, 2.0])
+    
+    toi = segment_circle_impact((1.0, 0.0), (1.0, 0.0), centers, radii)
+    
+    assert toi.tolist() == [0.0, np.inf]
+
+
+def test_segment_circle_impact_endpoints():
+    centers = np.array([(10.0, 0.0), (20.0, 0.0), (-10.0, 0.0)])
+    radii = np.array([1.0, 1.0, 1.0])
+    
+    toi = segment_circle_impact((0.0, 0.0), (9.0, 0.0), centers, radii)
+    
+    # Touches the first circle exactly at the end; the others are out of reach
+    assert toi.tolist() == [1.0, np.inf, np.inf]
@@ -3,6 +3,7 @@ UI renderer for displaying game information and menus.
 """
 import pygame
 import config
+from calibration import get_marker_positions
 
 
 class UIRenderer:
@@ -21,78 +22,175 @@ class UIRenderer:
         self.font_score = pygame.font.Font(None, config.FONT_SIZE_SCORE)
         self.font_normal = pygame.font.Font(None, config.FONT_SIZE_NORMAL)
         self.font_small = pygame.font.Font(None, config.FONT_SIZE_SMALL)
+        self.font_tip = pygame.font.Font(None, 24)
+        
+        # Rendered text keyed by (font, text, color), and digit glyphs for counters
+        self.text_cache = {}
+        self.digit_atlases = {}
+        
+        # Static screens, composed on first use
+        self.menu_surface = None
+        self.game_over_overlay = None
+    
+    def render_text(self, font, text, color):
+        """Render text, reusing the surface if it was rendered before.
+        
+        Args:
+            font: Pygame font
+            text: String to render
+            color: RGB text color
+        
+        Returns:
+            Pygame surface with the rendered text
+        """
+        key = (font, text, color)
+        surface = self.text_cache.get(key)
+        if surface is None:
+            if len(self.text_cache) >= config.TEXT_CACHE_SIZE:
+                self.text_cache.clear()
+            surface = font.render(text, True, color)
+            self.text_cache[key] = surface
+        return surface
+    
+    def _get_digit_atlas(self, font, color):
+        """Get rendered glyphs for the digits 0-9 and the minus sign.
+        
+        Returns:
+            Dict mapping each character to its surface
+        """
+        key = (font, color)
+        atlas = self.digit_atlases.get(key)
+        if atlas is None:
+            atlas = {digit: font.render(digit, True, color) for digit in "0123456789-"}
+            self.digit_atlases[key] = atlas
+        return atlas
+    
+    def draw_counter(self, font, label, value, color, topleft=None, topright=None):
+        """Draw a cached label followed by a number built from digit glyphs.
+        
+        Args:
+            font: Pygame font
+            label: Static text in front of the number (e.g. "Score: ")
+            value: Integer to show
+            color: RGB text color
+            topleft: Position of the label's top-left corner
+            topright: Position of the number's top-right corner (if no topleft)
+        
+        Returns:
+            Rect covering the drawn text
+        """
+        label_surface = self.render_text(font, label, color)
+        atlas = self._get_digit_atlas(font, color)
+        glyphs = [atlas[digit] for digit in str(int(value))]
+        
+        width = label_surface.get_width() + sum(glyph.get_width() for glyph in glyphs)
+        height = label_surface.get_height()
+        if topleft is None:
+            topleft = (topright[0] - width, topright[1])
+        
+        x, y = topleft
+        blit_list = [(label_surface, (x, y))]
+        x += label_surface.get_width()
+        for glyph in glyphs:
+            blit_list.append((glyph, (x, y)))
+            x += glyph.get_width()
+        self.screen.blits(blit_list, doreturn=False)
+        return pygame.Rect(topleft, (width, height))
     
     def draw_score(self, score):
         """Draw the current score.
         
         Args:
             score: Current score value
+        
+        Returns:
+            Rect covering the drawn text
         """
-        score_text = self.font_score.render(f"Score: {score}", True, config.TEXT_COLOR)
-        self.screen.blit(score_text, (20, 20))
+        return self.draw_counter(self.font_score, "Score: ", score, config.TEXT_COLOR, topleft=(20, 20))
     
     def draw_fps(self, fps):
         """Draw the current FPS.
         
         Args:
             fps: Current FPS value
+        
+        Returns:
+            Rect covering the drawn text
         """
-        fps_text = self.font_small.render(f"FPS: {fps}", True, config.TEXT_COLOR)
-        text_rect = fps_text.get_rect()
-        text_rect.topright = (config.SCREEN_WIDTH - 20, 20)
-        self.screen.blit(fps_text, text_rect)
+        return self.draw_counter(self.font_small, "FPS: ", fps, config.TEXT_COLOR,
+                                 topright=(config.SCREEN_WIDTH - 20, 20))
     
     def draw_lives(self, lives):
         """Draw remaining lives.
         
         Args:
             lives: Number of lives remaining
+        
+        Returns:
+            Rect covering the drawn text, or None if lives are disabled
         """
         if config.ENABLE_LIVES:
-            lives_text = self.font_normal.render(f"Lives: {lives}", True, config.TEXT_COLOR)
-            self.screen.blit(lives_text, (20, 80))
+            return self.draw_counter(self.font_normal, "Lives: ", lives, config.TEXT_COLOR, topleft=(20, 80))
+        return None
     
-    def draw_game_over(self, score):
-        """Draw game over screen.
-        
-        Args:
-            score: Final score
-        """
+    def _compose_game_over_overlay(self):
+        """Build the game over overlay with its static text."""
         # Semi-transparent overlay
-        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
-        self.screen.blit(overlay, (0, 0))
+        overlay = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT), pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 200))
         
         # Game over text
         game_over_text = self.font_score.render("GAME OVER", True, (255, 100, 100))
         game_over_rect = game_over_text.get_rect(center=(config.SCREEN_WIDTH // 2, 
                                                           config.SCREEN_HEIGHT // 2 - 60))
-        self.screen.blit(game_over_text, game_over_rect)
-        
-        # Final score
-        score_text = self.font_normal.render(f"Final Score: {score}", True, config.TEXT_COLOR)
-        score_rect = score_text.get_rect(center=(config.SCREEN_WIDTH // 2, 
-                                                  config.SCREEN_HEIGHT // 2))
-        self.screen.blit(score_text, score_rect)
+        overlay.blit(game_over_text, game_over_rect)
         
         # Restart instruction
         restart_text = self.font_small.render("Press SPACE to restart or ESC to quit", 
                                               True, config.TEXT_COLOR)
         restart_rect = restart_text.get_rect(center=(config.SCREEN_WIDTH // 2, 
                                                      config.SCREEN_HEIGHT // 2 + 60))
-        self.screen.blit(restart_text, restart_rect)
+        overlay.blit(restart_text, restart_rect)
+        return overlay
+    
+    def draw_game_over(self, score):
+        """Draw game over screen.
+        
+        Args:
+            score: Final score
+        """
+        if self.game_over_overlay is None:
+            self.game_over_overlay = self._compose_game_over_overlay()
+        self.screen.blit(self.game_over_overlay, (0, 0))
+        
+        # Final score
+        score_text = self.render_text(self.font_normal, f"Final Score: {score}", config.TEXT_COLOR)
+        score_rect = score_text.get_rect(center=(config.SCREEN_WIDTH // 2, 
+                                                  config.SCREEN_HEIGHT // 2))
+        self.screen.blit(score_text, score_rect)
     
     def draw_menu(self):
         """Draw the start menu."""
+        if self.menu_surface is None:
+            self.menu_surface = self._compose_menu()
+        self.screen.blit(self.menu_surface, (0, 0))
+    
+    def _compose_menu(self):
+        """Build the start menu screen.
+        
+        Returns:
+            Full-screen surface with the menu
+        """
+        menu = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
+        
         # Background
-        self.screen.fill(config.BG_COLOR)
+        menu.fill(config.BG_COLOR)
         
         # Title
         title_text = self.font_score.render("ASTEROID DESTROYER", True, (100, 200, 255))
         title_rect = title_text.get_rect(center=(config.SCREEN_WIDTH // 2, 
                                                  config.SCREEN_HEIGHT // 2 - 120))
-        self.screen.blit(title_text, title_rect)
+        menu.blit(title_text, title_rect)
         
         # Instructions
         instructions = [
@@ -102,6 +200,7 @@ class UIRenderer:
             "Point your index finger at asteroids to destroy them",
             "",
             "Press SPACE to start",
+            "Press C to calibrate the projector",
             "Press F to toggle fullscreen",
             "Press ESC to quit"
         ]
@@ -114,12 +213,37 @@ class UIRenderer:
                 # Empty line
                 text = self.font_small.render(" ", True, config.TEXT_COLOR)
             text_rect = text.get_rect(center=(config.SCREEN_WIDTH // 2, y_offset))
-            self.screen.blit(text, text_rect)
+            menu.blit(text, text_rect)
             y_offset += 35
+        
+        # Add tip about debug mode
+        debug_text = self.font_tip.render("Press 'D' to show Camera View (Debug)", True, (150, 150, 150))
+        menu.blit(debug_text, (10, config.SCREEN_HEIGHT - 30))
+        return menu
     
-    def draw_calibration_guide(self):
-        """Draw calibration guide (future feature)."""
-        guide_text = self.font_small.render("Calibration mode - touch corners in order", 
-                                            True, (255, 255, 0))
-        guide_rect = guide_text.get_rect(center=(config.SCREEN_WIDTH // 2, 50))
+    def draw_calibration_guide(self, progress=0.0):
+        """Draw the calibration screen with the four corner markers.
+        
+        Args:
+            progress: Fraction (0-1) of stable frames collected so far
+        """
+        self.screen.fill((0, 0, 0))
+        
+        # Bright square markers for the camera to find
+        size = config.CALIBRATION_MARKER_SIZE
+        for x, y in get_marker_positions():
+            pygame.draw.rect(self.screen, (255, 255, 255), (x - size // 2, y - size // 2, size, size))
+        
+        guide_text = self.render_text(self.font_small,
+                                      "Calibration mode - keep the camera still and the markers in view",
+                                      (255, 255, 0))
+        guide_rect = guide_text.get_rect(center=(config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2))
         self.screen.blit(guide_text, guide_rect)
+        
+        # Progress bar
+        bar_width = 300
+        bar_rect = pygame.Rect(0, 0, bar_width, 10)
+        bar_rect.center = (config.SCREEN_WIDTH // 2, config.SCREEN_HEIGHT // 2 + 40)
+        pygame.draw.rect(self.screen, (80, 80, 80), bar_rect)
+        pygame.draw.rect(self.screen, (255, 255, 0),
+                         (bar_rect.x, bar_rect.y, int(bar_width * progress), bar_rect.height))
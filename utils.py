@@ -3,6 +3,8 @@ Utility functions for the Asteroid Destroyer game.
 """
 import math
 import time
+from collections import deque
+import numpy as np
 
 
 class FPSCounter:
@@ -10,18 +12,16 @@ class FPSCounter:
     
     def __init__(self, smoothing=10):
         self.smoothing = smoothing
-        self.frame_times = []
-        self.last_time = time.time()
+        self.frame_times = deque(maxlen=smoothing)
+        self.last_time = time.perf_counter()
     
     def update(self):
         """Update FPS calculation."""
-        current_time = time.time()
+        current_time = time.perf_counter()
         frame_time = current_time - self.last_time
         self.last_time = current_time
         
         self.frame_times.append(frame_time)
-        if len(self.frame_times) > self.smoothing:
-            self.frame_times.pop(0)
         
         return self.get_fps()
     
@@ -46,6 +46,46 @@ def distance(p1, p2):
     return math.sqrt((p1[0] - p2[0]) ** 2 + (p1[1] - p2[1]) ** 2)
 
 
+def segment_circle_impact(start, end, centers, radii):
+    """Find where a moving point first touches each of several circles.
+    
+    The point travels in a straight line from start to end; this is the
+    capsule sweep of a zero-radius ball.
+    
+    Args:
+        start: Tuple (x, y) at t = 0
+        end: Tuple (x, y) at t = 1
+        centers: Array of shape (N, 2) with circle centers
+        radii: Array of shape (N,) with circle radii
+    
+    Returns:
+        Array of shape (N,) with the time of impact in [0, 1] for each
+        circle, or np.inf where the segment misses it
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    radii = np.asarray(radii, dtype=np.float64)
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    
+    # Solve |start + t * d - center|^2 = r^2 for the smaller root
+    fx = start[0] - centers[:, 0]
+    fy = start[1] - centers[:, 1]
+    a = dx * dx + dy * dy
+    b = 2.0 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radii * radii
+    
+    toi = np.full(len(radii), np.inf)
+    toi[c <= 0] = 0.0  # Already inside at the start
+    
+    if a > 0:
+        disc = b * b - 4.0 * a * c
+        crossing = (c > 0) & (disc >= 0)
+        t = (-b[crossing] - np.sqrt(disc[crossing])) / (2.0 * a)
+        toi[np.flatnonzero(crossing)[(t >= 0) & (t <= 1)]] = t[(t >= 0) & (t <= 1)]
+    
+    return toi
+
+
 def clamp(value, min_value, max_value):
     """Clamp a value between min and max.
     